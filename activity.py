@@ -0,0 +1,38 @@
+class ActivityScheduler:
+    """Decides which entities to update this frame from their distance to a focus point.
+
+    Entities come from a SpatialGrid, so anything outside the reduced-rate
+    radius is never even looked at:
+      * full rate: within ``near`` tiles, updated every frame
+      * reduced rate: within ``far`` tiles, updated every ``reduced_every``
+        frames with a time step that makes up for the skipped ones
+      * dormant: further away, not updated at all
+    Entities need tile ``x``/``y`` attributes and a pixel ``rect``.
+    """
+
+    def __init__(self, grid, tile_size, near=10, far=24, reduced_every=4):
+        self.grid = grid
+        self.tile_size = tile_size
+        self.near = near
+        self.far = far
+        self.reduced_every = reduced_every
+        self.frame = 0
+
+    def within(self, x, y, radius):
+        """Entities whose tile position is less than radius tiles from (x, y)"""
+        size = self.tile_size
+        area = self.grid.query_area((x - radius) * size, (y - radius) * size,
+                                    (x + radius) * size, (y + radius) * size)
+        return [e for e in area if (e.x - x) ** 2 + (e.y - y) ** 2 < radius * radius]
+
+    def due(self, x, y):
+        """(entity, dt) for every entity due an update this frame around (x, y)"""
+        self.frame += 1
+        scheduled = []
+        for entity in self.within(x, y, self.far):
+            if (entity.x - x) ** 2 + (entity.y - y) ** 2 < self.near * self.near:
+                scheduled.append((entity, 1))
+            elif (self.frame + (id(entity) >> 4)) % self.reduced_every == 0:
+                # Staggered by identity so the reduced tier is spread over frames
+                scheduled.append((entity, self.reduced_every))
+        return scheduled
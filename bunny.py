@@ -1,7 +1,9 @@
 import pygame
-import math,random,csv
+import math,random,csv,heapq
 from config import *
-from collections import defaultdict
+from projectiles import Projectiles
+from spritecache import bunny_frames
+from telemetry import telemetry
 
 
 class Bunny:
@@ -11,6 +13,8 @@ class Bunny:
         self.health = 100
         self.speed = 0.1
         self.target_x, self.target_y = x, y
+        self.path = []  # Click-to-move tiles still to walk, the next one last
+        self.path_goal = None
         self.held_item = None  # Name of the held item, e.g., 'seed'
         self.money = 0
 
@@ -51,7 +55,7 @@ class Bunny:
             'max_cooldown': 30,  # This can be removed as well
             'range': 5,  # Maximum range for the carrot weapon
             'speed': 0.3,  # Speed of the projectiles
-            'projectiles': []  # List to store active projectiles
+            'projectiles': Projectiles()  # Active projectiles, stored as arrays
         }
 
     def start_action(self, action_type, target_tile):
@@ -101,23 +105,28 @@ class Bunny:
         self.action_progress = 0
 
     def load_bunny(self):
-        self.sheet = Config.get("bun_sheet")
-        self.frames = {
-            "front": [self.sheet["front_sheet"].get_image(i, Config.get("bun_exact"), Config.get("bun_exact"), 2, (0, 0, 0)) for i in range(5)],
-            "back": [self.sheet["back_sheet"].get_image(i, Config.get("bun_exact"), Config.get("bun_exact"), 2, (0, 0, 0)) for i in range(5)],
-            "left": [self.sheet["left_sheet"].get_image(i, Config.get("bun_exact"), Config.get("bun_exact"), 2, (0, 0, 0)) for i in range(8)],
-            "right": [self.sheet["right_sheet"].get_image(i, Config.get("bun_exact"), Config.get("bun_exact"), 2, (0, 0, 0)) for i in range(8)],
-            "front_damage": [self.sheet["front_damage_sheet"].get_image(i, Config.get("bun_exact"), Config.get("bun_exact"), 2, (0, 0, 0)) for i in range(5)],
-            "back_damage": [self.sheet["back_damage_sheet"].get_image(i, Config.get("bun_exact"), Config.get("bun_exact"), 2, (0, 0, 0)) for i in range(5)],
-            "left_damage": [self.sheet["left_damage_sheet"].get_image(i, Config.get("bun_exact"), Config.get("bun_exact"), 2, (0, 0, 0)) for i in range(8)],
-            "right_damage": [self.sheet["right_damage_sheet"].get_image(i, Config.get("bun_exact"), Config.get("bun_exact"), 2, (0, 0, 0)) for i in range(8)],
-        }
+        # Frames are sliced once per process and shared by every Bunny
+        self.frames = bunny_frames()
 
     def move(self, keys, world):
         moving = False
         new_direction = self.current_direction
 
-        if self.x == self.target_x and self.y == self.target_y:
+        arrow_pressed = keys[pygame.K_LEFT] or keys[pygame.K_RIGHT] or keys[pygame.K_UP] or keys[pygame.K_DOWN]
+        if arrow_pressed:
+            self.path = []  # Steering by hand cancels click-to-move
+        if self.x == self.target_x and self.y == self.target_y and self.path and not arrow_pressed:
+            next_x, next_y = self.path[-1]
+            if not self.can_move_to(next_x, next_y, world):
+                # Something grew in the way since the path was planned
+                self.walk_to(self.path_goal, world)
+            if self.path:
+                next_x, next_y = self.path.pop()
+                new_direction = ('right' if next_x > self.x else 'left' if next_x < self.x
+                                 else 'front' if next_y > self.y else 'back')
+                self.target_x, self.target_y = next_x, next_y
+                moving = True
+        elif self.x == self.target_x and self.y == self.target_y:
             if keys[pygame.K_LEFT]:
                 new_x = self.x - 1
                 if self.can_move_to(new_x, self.y, world):
@@ -162,24 +171,35 @@ class Bunny:
         )
         return moving
 
+    def walk_to(self, goal, world):
+        """Plan a click-to-move path to a tile; returns False if it cannot be reached.
+
+        Clicking a blocked tile, like a tree or a stone, walks up next to it.
+        """
+        self.path = []
+        nav = getattr(world, 'nav', None)
+        if nav is None:
+            return False
+        start = (int(self.target_x), int(self.target_y))  # Plan from the tile being stepped onto
+        goals = [goal]
+        if nav.region(*goal) is None:
+            x, y = goal
+            goals = sorted([(x, y + 1), (x - 1, y), (x + 1, y), (x, y - 1)],
+                           key=lambda tile: abs(tile[0] - start[0]) + abs(tile[1] - start[1]))
+        for tile in goals:
+            path = nav.find_path(start, tile)
+            if path is not None:
+                self.path = path[::-1]
+                self.path_goal = goal
+                return True
+        return False
+
     def can_move_to(self, x, y, world):
         """Check if the bunny can move to the specified (x, y) position."""
-        if self.mode == 'maze':
-            return (0 <= x < Config.get('grid') and 
-                    0 <= y < Config.get('grid') and 
-                    world.grid[y][x] == 0)
-        elif self.mode == 'dungeon':
-            # Check for walkability in the dungeon
-            return world.is_tile_walkable(int(x), int(y))
-        elif self.mode == 'farm':
-            # For farm, check the type of tile at (x, y)
-            if 0 <= x < world.width and 0 <= y < world.height:
-                tile = world.tiles[y][x]  # Get the tile at (x, y)
-                # Check if the tile is walkable (empty or dirt type)
-                return tile.type in ['empty', 'dirt']
-            return False
-        else:
-            return True  # Assume walkable for other modes
+        walkmap = getattr(world, 'walkmap', None)
+        if walkmap is None:
+            return True  # Assume walkable for worlds without a walkability map
+        return walkmap.is_walkable(int(x), int(y))
 
     def update_animation(self, moving):
         current_time = pygame.time.get_ticks()
@@ -278,9 +298,8 @@ class Bunny:
         return math.hypot(dx, dy) <= self.interact_range
 
     def add_to_inventory(self, item_name, amount=1):
-        for _ in range(amount):
-            if item_name in Config.RESOURCE_ITEMS:
-                self.inventory.add_item(Config.RESOURCE_ITEMS[item_name])
+        """Add amount of one item; returns how many did not fit"""
+        return sum(left for _, left in self.inventory.add_items([(item_name, amount)]))
 
     def harvest_crop(self, farm):
         front_x, front_y = self.get_front_position()
@@ -307,70 +326,32 @@ class Bunny:
         }
         dx, dy = direction_map.get(self.current_direction, (0, 1))  # Default to 'front'
 
-        # Add the new projectile to the projectiles list
-        self.carrot_weapon['projectiles'].append({
-            'x': self.x,
-            'y': self.y,
-            'dx': dx * self.carrot_weapon['speed'],
-            'dy': dy * self.carrot_weapon['speed'],
-            'distance': 0  # Initial distance is 0
-        })
+        # Add the new projectile to the projectiles in flight
+        self.carrot_weapon['projectiles'].add(self.x, self.y,
+                                              dx * self.carrot_weapon['speed'],
+                                              dy * self.carrot_weapon['speed'])
 
         self.attacking = True  # Set attacking state to true
         self.current_frame = 0  # Reset the animation frame for attacking
         
     def log_accuracy(self, success):
-        with open("Data/combat_accuracy.csv", "a", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerow([int(success)])  # 1 = hit, 0 = miss
-
-    def update_projectiles(self, enemies, dungeon):
-        """Update existing projectiles."""
-        projectiles_to_remove = []
-
-        for proj in self.carrot_weapon['projectiles'][:]:
-            proj['x'] += proj['dx']
-            proj['y'] += proj['dy']
-            proj['distance'] += self.carrot_weapon['speed']
-
-            proj_rect = pygame.Rect(
-                proj['x'] * Config.get('bun_size'),
-                proj['y'] * Config.get('bun_size'),
-                Config.get('bun_size') // 2,
-                Config.get('bun_size') // 2
-            )
+        telemetry.write("Data/combat_accuracy.csv", [int(success)], table='attacks')  # 1 = hit, 0 = miss
 
-            # Check for enemy collisions
-            hit = False
-            for enemy in enemies:
-                if proj_rect.colliderect(enemy.rect):
-                    enemy.take_damage(self.carrot_weapon['damage'])
-                    projectiles_to_remove.append(proj)
-                    hit = True
-                    break
-
-            # If no enemy hit, check if projectile is out of bounds or max distance reached
-            if not hit:
-                screen_w, screen_h = Config.get('window')
-                if proj['x'] < 0 or proj['x'] * Config.get('bun_size') > screen_w or proj['y'] < 0 or proj['y'] * Config.get('bun_size') > screen_h:
-                    projectiles_to_remove.append(proj)
-
-                # Check for wall collisions or max range
-                elif proj['distance'] >= self.carrot_weapon['range'] or not dungeon.is_tile_walkable(int(proj['x']), int(proj['y'])):
-                    projectiles_to_remove.append(proj)
-
-        # Remove marked projectiles
-        for proj in projectiles_to_remove:
-            if proj in self.carrot_weapon['projectiles']:
-                self.carrot_weapon['projectiles'].remove(proj)
+    def update_projectiles(self, dungeon):
+        """Move projectiles and resolve their hits against the dungeon's walls and enemies."""
+        enemy_x, enemy_y = dungeon.enemy_positions()
+        hits = self.carrot_weapon['projectiles'].update(dungeon.walkmap.cells, enemy_x, enemy_y,
+                                                        self.carrot_weapon['range'])
+        for index in hits.tolist():
+            dungeon.damage_enemy(index, self.carrot_weapon['damage'])
 
     def draw_projectiles(self, screen, camera_x, camera_y):
         """Draw the projectiles"""
-        for proj in self.carrot_weapon['projectiles']:
+        for x, y in self.carrot_weapon['projectiles'].positions():
             # Draw each projectile as a small circle for simplicity
             pygame.draw.circle(screen, (255, 165, 0), 
-                            (proj['x'] * Config.get('bun_size') - camera_x, 
-                                proj['y'] * Config.get('bun_size') - camera_y), 5)
+                            (x * Config.get('bun_size') - camera_x, 
+                                y * Config.get('bun_size') - camera_y), 5)
 
     def handle_key_press(self, event):
         if event.key == pygame.K_1:
@@ -387,27 +368,46 @@ class Bunny:
             self.select_item_for_swap(5)
 
     def select_item_for_swap(self, index):
-        if 0 <= index < len(self.inventory):
-            self.held_item = self.inventory[index]  # Select the item
+        if self.inventory.item_in_slot(index) is not None:
+            self.held_item = self.inventory.item_in_slot(index)  # Select the item
             print(f"Item selected: {self.held_item}")  # For debugging purposes
 
     def select_hotbar_item(self, slot_index):
         """Select an item from the hotbar to hold"""
-        if 0 <= slot_index < len(self.inventory.hotbar_indices):
-            item_index = self.inventory.hotbar_indices[slot_index]
-            if item_index is not None:
-                items_list = list(self.inventory.items.items())
-                if item_index < len(items_list):
-                    self.held_item = items_list[item_index][0]
-                    print(f"Now holding: {self.held_item}")  # Debug output
+        if 0 <= slot_index < len(self.inventory.hotbar_slots):
+            item_name = self.inventory.hotbar_item(slot_index)
+            if item_name is not None:
+                self.held_item = item_name
+                print(f"Now holding: {self.held_item}")  # Debug output
+
+
+def merge_amounts(items):
+    """Total amount per item name from a dict or (name, amount) pairs, keeping first-seen order"""
+    pairs = items.items() if hasattr(items, 'items') else items
+    merged = {}
+    for name, amount in pairs:
+        if amount > 0:
+            merged[name] = merged.get(name, 0) + amount
+    return merged
 
 
 class Inventory:
+    """Items kept in slots, like the inventory grid on screen.
+
+    Every item type sits in one slot holding its name and count. A dict maps
+    names to slots and a running total tracks the units held, so lookups,
+    adds, removals and swaps never scan the inventory. The hotbar stores
+    slot numbers; a hotbar position is cleared when its slot is emptied,
+    so it never picks up whatever item takes that slot next.
+    ``capacity`` is the number of units the bunny can carry, which is also
+    the number of slots. New items go in the lowest free slot.
+    """
+
     def __init__(self, capacity=20):
         self.capacity = capacity
-        self.items = defaultdict(int)
-        # Initialize hotbar with first 6 items if they exist
-        self.hotbar_indices = [i if i < capacity else None for i in range(6)]
+        self.clear()
+        # The hotbar picks up the first 6 item types added
+        self.hotbar_slots = [None] * 6
         self.swap_selected_index = None
         self.swap_input_text = ""
         self.show_swap_box = False
@@ -416,19 +416,110 @@ class Inventory:
         self.notification = None
         self.notification_time = 0
 
+    def clear(self):
+        """Empty every slot; the hotbar and UI state are left alone"""
+        self.slot_names = [None] * self.capacity  # Item name in each slot, None when empty
+        self.slot_counts = [0] * self.capacity
+        self.slot_of = {}  # Item name -> slot
+        self.free_slots = list(range(self.capacity))  # Min-heap of free slots, may hold stale entries
+        self.free_set = set(self.free_slots)  # The slots that really are free
+        self.total = 0  # Units held over every slot
+
+    def __contains__(self, item_name):
+        return item_name in self.slot_of
+
+    def count(self, item_name):
+        slot = self.slot_of.get(item_name)
+        return 0 if slot is None else self.slot_counts[slot]
+
+    def item_in_slot(self, slot):
+        return self.slot_names[slot] if 0 <= slot < len(self.slot_names) else None
+
+    def hotbar_item(self, index):
+        """Name of the item in a hotbar position, or None"""
+        slot = self.hotbar_slots[index]
+        return None if slot is None else self.slot_names[slot]
+
     def is_full(self):
-        return sum(self.items.values()) >= self.capacity
+        return self.total >= self.capacity
 
-    def update_inventory_ui(self):
-        """Ensure hotbar indices are valid after inventory changes"""
-        # Create a list of available item indices
-        available_indices = list(range(len(self.items)))
-        
-        # Update hotbar indices, keeping None for empty slots
-        self.hotbar_indices = [
-            idx if idx is not None and idx < len(self.items) else None
-            for idx in self.hotbar_indices
-        ]
+    def set_count(self, item_name, count):
+        """Set how many of an item the bunny holds, giving it a slot or freeing its slot.
+
+        Returns False, changing nothing, if that would go over capacity.
+        """
+        slot = self.slot_of.get(item_name)
+        if self.total + max(count, 0) - (0 if slot is None else self.slot_counts[slot]) > self.capacity:
+            return False
+        if slot is None:
+            if count <= 0:
+                return True
+            slot = self.take_free_slot()
+            self.slot_names[slot] = item_name
+            self.slot_of[item_name] = slot
+            if slot not in self.hotbar_slots and None in self.hotbar_slots:
+                self.hotbar_slots[self.hotbar_slots.index(None)] = slot
+        self.total += max(count, 0) - self.slot_counts[slot]
+        if count > 0:
+            self.slot_counts[slot] = count
+        else:
+            # Empty slots go back for the next new item
+            self.slot_names[slot] = None
+            self.slot_counts[slot] = 0
+            del self.slot_of[item_name]
+            self.free_slot(slot)
+        return True
+
+    def free_slot(self, slot):
+        self.hotbar_slots = [None if hotbar == slot else hotbar for hotbar in self.hotbar_slots]
+        if slot not in self.free_set:
+            self.free_set.add(slot)
+            heapq.heappush(self.free_slots, slot)
+            if len(self.free_slots) > 2 * self.capacity:
+                # Too many stale entries from swaps: rebuild from the real free slots
+                self.free_slots = sorted(self.free_set)
+
+    def take_free_slot(self):
+        """The lowest free slot, now taken; there is always one while under capacity"""
+        while True:
+            slot = heapq.heappop(self.free_slots)
+            if slot in self.free_set:
+                self.free_set.remove(slot)
+                return slot
+
+    def swap_slots(self, first, second):
+        """Swap the contents of two slots"""
+        names, counts = self.slot_names, self.slot_counts
+        names[first], names[second] = names[second], names[first]
+        counts[first], counts[second] = counts[second], counts[first]
+        for slot in (first, second):
+            if names[slot] is not None:
+                self.slot_of[names[slot]] = slot
+        # An item moved into an empty slot leaves its old slot free
+        if (names[first] is None) != (names[second] is None):
+            empty, used = (first, second) if names[first] is None else (second, first)
+            self.free_set.discard(used)  # Its heap entry goes stale and is skipped when popped
+            self.free_slot(empty)
+
+    def as_dict(self):
+        """Item name -> count, for saving"""
+        return {name: self.slot_counts[slot] for name, slot in self.slot_of.items()}
+
+    def load_counts(self, counts):
+        """Replace the contents with a name -> count mapping, e.g. from a save file.
+
+        Returns the (name, amount) pairs beyond capacity, which are not loaded.
+        """
+        self.clear()
+        self.hotbar_slots = [None] * 6  # Refilled with the first item types loaded
+        leftover = []
+        for name, count in counts.items():
+            loaded = max(min(count, self.capacity - self.total), 0)
+            if loaded:
+                self.set_count(name, loaded)
+            if count > loaded:
+                leftover.append((name, count - loaded))
+        return leftover
 
     def add_item(self, item):
         """Add item to inventory - accepts either ResourceItem object or string name"""
@@ -439,17 +530,49 @@ class Inventory:
             item = Config.RESOURCE_ITEMS.get(item_name, None)
         
         if not self.is_full():
-            # If this is a new item type, add it to the inventory
-            if item_name not in self.items:
-                # Find the first empty hotbar slot if available
-                for i in range(len(self.hotbar_indices)):
-                    if self.hotbar_indices[i] is None:
-                        self.hotbar_indices[i] = len(self.items)
-                        break
-            
-            self.items[item_name] = self.items.get(item_name, 0) + 1
+            self.set_count(item_name, self.count(item_name) + 1)
             return True
         return False
+
+    def add_items(self, items, all_or_nothing=False):
+        """Add many items in one go; returns the (name, amount) pairs that did not fit.
+
+        ``items`` is a dict or (name, amount) pairs, names being keys of
+        Config.RESOURCE_ITEMS. Free space is worked out once and handed out
+        in order. With ``all_or_nothing`` nothing is added unless everything
+        fits. Unknown item names are never added.
+        """
+        requested = merge_amounts(items)
+        leftover = [(name, amount) for name, amount in requested.items() if name not in Config.RESOURCE_ITEMS]
+        wanted = [(name, amount) for name, amount in requested.items() if name in Config.RESOURCE_ITEMS]
+        room = max(self.capacity - self.total, 0)
+        if all_or_nothing and sum(amount for _, amount in wanted) > room:
+            return leftover + wanted
+        for name, amount in wanted:
+            added = min(amount, room)
+            if added:
+                self.set_count(name, self.count(name) + added)
+                room -= added
+            if added < amount:
+                leftover.append((name, amount - added))
+        return leftover
+
+    def remove_items(self, items, all_or_nothing=True):
+        """Take many items in one go; returns the (name, amount) pairs that could not be taken.
+
+        By default nothing is taken unless every item is there in full, so
+        an empty result means the whole transaction went through.
+        """
+        requested = merge_amounts(items)
+        if all_or_nothing and any(self.count(name) < amount for name, amount in requested.items()):
+            return list(requested.items())
+        missing = []
+        for name, amount in requested.items():
+            taken = min(amount, self.count(name))
+            self.set_count(name, self.count(name) - taken)
+            if taken < amount:
+                missing.append((name, amount - taken))
+        return missing
     
     def show_notification(self, text, color):
         font = pygame.font.SysFont(None, 30)
@@ -475,25 +598,22 @@ class Inventory:
         start_x = (screen.get_width() - (slot_size + padding) * 6) // 2
         y = screen.get_height() - slot_size - 10
 
+        font = pygame.font.SysFont(None, 22)
         for i in range(6):
             rect = pygame.Rect(start_x + i * (slot_size + padding), y, slot_size, slot_size)
             pygame.draw.rect(screen, (200, 200, 200), rect, 2)
 
-            item_index = self.hotbar_indices[i]
-            if item_index is not None and item_index < len(self.items):
-                item_name, count = list(self.items.items())[item_index]
-                if count > 0:
-                    item = Config.RESOURCE_ITEMS[item_name]
-                    img = pygame.transform.scale(item.image, (slot_size - 10, slot_size - 10))
-                    screen.blit(img, (rect.x + 5, rect.y + 5))
-                    font = pygame.font.SysFont(None, 22)
-                    count_surface = font.render(str(count), True, (255, 255, 255))
-                    screen.blit(count_surface, (rect.right - 18, rect.bottom - 22))
+            slot = self.hotbar_slots[i]
+            if slot is not None and self.slot_names[slot] is not None:
+                item = Config.RESOURCE_ITEMS[self.slot_names[slot]]
+                img = pygame.transform.scale(item.image, (slot_size - 10, slot_size - 10))
+                screen.blit(img, (rect.x + 5, rect.y + 5))
+                count_surface = font.render(str(self.slot_counts[slot]), True, (255, 255, 255))
+                screen.blit(count_surface, (rect.right - 18, rect.bottom - 22))
 
     def select_item_for_swap(self, index):
         """Select an item to swap into the hotbar."""
-        item_list = list(self.items.items())
-        if 0 <= index < len(item_list):
+        if self.item_in_slot(index) is not None:
             self.swap_selected_index = index
             self.show_swap_box = True  # Show the input box for slot selection
     
@@ -514,54 +634,40 @@ class Inventory:
         start_x = box.x + 20
         start_y = box.y + 50
 
-        item_list = list(self.items.items())
-        
         # First pass: draw all items except the dragged one
-        for i, (name, count) in enumerate(item_list):
-            if count > 0 and i != self.dragged_item:
-                self.draw_inventory_item(screen, name, count, i, start_x, start_y, slot_size, padding, cols, font)
+        for slot, name in enumerate(self.slot_names):
+            if name is not None and slot != self.dragged_item:
+                self.draw_inventory_item(screen, name, self.slot_counts[slot], slot, start_x, start_y, slot_size, padding, cols, font)
 
         # Handle dragging logic
         mouse_pos = pygame.mouse.get_pos()
         mouse_pressed = pygame.mouse.get_pressed()
+        # The slot under the mouse follows from the grid layout, no need to test every slot
+        col = (mouse_pos[0] - start_x) // (slot_size + padding)
+        row = (mouse_pos[1] - start_y) // (slot_size + padding)
+        hovered = None
+        if 0 <= col < cols and row >= 0 and row * cols + col < len(self.slot_names):
+            rect = pygame.Rect(start_x + col * (slot_size + padding), start_y + row * (slot_size + padding),
+                               slot_size, slot_size)
+            if rect.collidepoint(mouse_pos):
+                hovered = row * cols + col
         
         # Check for new drag
         if mouse_pressed[0] and self.dragged_item is None:
-            for i, (name, count) in enumerate(item_list):
-                if count > 0:
-                    row = i // cols
-                    col = i % cols
-                    x = start_x + col * (slot_size + padding)
-                    y = start_y + row * (slot_size + padding)
-                    rect = pygame.Rect(x, y, slot_size, slot_size)
-                    
-                    if rect.collidepoint(mouse_pos):
-                        self.dragged_item = i
-                        break
+            if hovered is not None and self.slot_names[hovered] is not None:
+                self.dragged_item = hovered
         
         # Draw dragged item last (on top) if it exists
         if self.dragged_item is not None:
             if mouse_pressed[0]:
                 # Draw dragged item at mouse position
-                name, count = item_list[self.dragged_item]
-                item = Config.RESOURCE_ITEMS[name]
+                item = Config.RESOURCE_ITEMS[self.slot_names[self.dragged_item]]
                 img = pygame.transform.scale(item.image, (slot_size - 10, slot_size - 10))
                 screen.blit(img, (mouse_pos[0] - slot_size//2, mouse_pos[1] - slot_size//2))
             else:
-                # Mouse released, check for drop
-                for i, (name, count) in enumerate(item_list):
-                    if count > 0:
-                        row = i // cols
-                        col = i % cols
-                        x = start_x + col * (slot_size + padding)
-                        y = start_y + row * (slot_size + padding)
-                        rect = pygame.Rect(x, y, slot_size, slot_size)
-                        
-                        if rect.collidepoint(mouse_pos) and i != self.dragged_item:
-                            # Swap items
-                            keys = list(self.items.keys())
-                            keys[self.dragged_item], keys[i] = keys[i], keys[self.dragged_item]
-                            self.items = defaultdict(int, {k: self.items[k] for k in keys})
+                # Mouse released: drop onto the slot below, swapping if it holds something
+                if hovered is not None and hovered != self.dragged_item:
+                    self.swap_slots(self.dragged_item, hovered)
                 self.dragged_item = None
 
     def draw_inventory_item(self, screen, name, count, index, start_x, start_y, slot_size, padding, cols, font):
@@ -590,17 +696,15 @@ class Inventory:
         self.show_swap_box = False  # Reset swap box when toggling
     
     def use_item(self, item_name):
-        if self.items.get(item_name, 0) > 0:
+        if self.count(item_name) > 0:
             if item_name != 'carrot_weapon':
-                self.items[item_name] -= 1
+                self.set_count(item_name, self.count(item_name) - 1)
             self.log_item_use(item_name)
             return True
         return False
 
     def log_item_use(self, item_name):
-        with open("Data/inventory_usage.csv", "a", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerow([item_name])
+        telemetry.write("Data/inventory_usage.csv", [item_name], table='item_uses')
     
     def handle_key_press(self, event):
         if event.key == pygame.K_1:
@@ -639,7 +743,7 @@ class Stone:
         if self.health <= 0:
             print("Stone is destroyed! You got stone.")
             game.inventory.add_item("stone")
-            game.farm.interactables.remove(self)
+            game.farm.entities.remove(self)
 
     def draw(self, screen):
         screen.blit(self.image, self.rect)
@@ -667,7 +771,7 @@ class Tree:
         if self.health <= 0:
             print("Tree is gone! You got wood.")
             game.inventory.add_item("wood")
-            game.farm.interactables.remove(self)
+            game.farm.entities.remove(self)
 
     def draw(self, screen):
         screen.blit(self.image, self.rect)
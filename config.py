@@ -55,6 +55,17 @@ class Config:
         'brown': (60,5,25),
         'maze': 50 * 64,  # Maze size (50x50 grid)
         'grid': 50,
+        'endless_maze': False,  # Stream an endless maze instead of a fixed grid x grid one
+        'maze_difficulty': None,  # 'easy', 'normal' or 'hard' to load mazes from the catalogue
+        'dungeon_size': 30,  # Dungeons are dungeon_size x dungeon_size tiles
+        'horde_backend': False,  # Simulate normal and rare dungeon enemies as NumPy arrays
+        'fog_of_war': False,  # Hide dungeon tiles and enemies the bunny cannot see
+        'click_to_move': False,  # Left click a tile to walk there along a planned path
+        'log_rotate_kb': 256,  # Seal a telemetry CSV log into a gzipped segment past this size...
+        'log_rotate_days': 7,  # ...or once its live file is this old
+        'log_keep_segments': 4,  # Sealed segments kept as rows; older ones are compacted into counts
+        'trace_epsilon': 0.0,  # Above 0, drop traced tiles within this many tiles of a straight route
+        'telemetry_db': None,  # e.g. 'Data/telemetry.db' to also record telemetry per player and session in SQLite
         'yellow': (200, 200, 0),
         'font':"assets/fonts/pixel.ttf",
         'FPS': 60,
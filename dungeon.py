@@ -1,91 +1,122 @@
 import pygame
 import math
 import random
+import numpy as np
 from config import *
 from farm import Tile
 from bunny import *
+from walkmap import WalkMap, CellIndex, STEPS, flow_field
+from navgrid import NavGrid
+from spatialgrid import SpatialGrid
+from horde import Horde
+from activity import ActivityScheduler
+from registry import EntityRegistry
+from dungeongen import WALL, FLOOR, generate_layout, assign_roles, portal_tiles
+from fov import field_of_view
 
 class Dungeon:
-    def __init__(self, width, height, bunny):
+    CHASE_RADIUS = 24  # Awake enemies farther than this many steps from the bunny wander instead
+    WAKE_RADIUS = 5  # Sleeping enemies this close to the bunny wake up, if it can see them
+    VIEW_RADIUS = 12  # How far the bunny can see down a corridor
+
+    def __init__(self, width, height, bunny, seed=None):
         self.width = width
         self.height = height
         self.bunny = bunny  # Store reference to bunny object
-        self.layout = [['#' for _ in range(width)] for _ in range(height)]
-        self.exit_x = self.width - 2
-        self.exit_y = self.height - 2
+        self.mailbox = None  # Where loot the bunny has no room for is sent
+        self.touching = set()  # Loot boxes the bunny touched last frame
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.layout = np.full((height, width), WALL, dtype=np.uint8)
+        self.rooms = []
         self.portal_positions = set()
-        self.enemies = []
-        self.loot_boxes = []
-        self.interactables = []
+        self.entities = EntityRegistry()  # Enemies, loot boxes and portals
+        self.return_portal = None  # Portal left behind by the last teleport
+        # Buckets of enemies and loot boxes so collision checks only look nearby
+        self.enemy_grid = SpatialGrid(Config.get('bun_size') * 2)
+        self.loot_grid = SpatialGrid(Config.get('bun_size') * 2)
+        # Enemies near the bunny update every frame, further ones less often, far ones not at all
+        self.activity = ActivityScheduler(self.enemy_grid, Config.get('bun_size'), far=self.CHASE_RADIUS)
+        self.fallen = []  # Enemies killed since the last update, waiting to be removed
+        # Normal and rare enemies live in NumPy arrays instead of Enemy objects if enabled
+        self.horde = Horde(self.rng) if Config.get('horde_backend') else None
+        # One flow field towards the bunny, shared by every chasing enemy
+        self.flow_origin = None
+        self.flow = None
+        # What the bunny can see, recomputed only when it steps onto another tile
+        self.fov_origin = None
+        self.visible = np.zeros((height, width), dtype=bool)
+        self.seen = np.zeros((height, width), dtype=bool)  # Every tile ever visible, for fog of war
         
         # Generate dungeon content immediately
         self.generate_dungeon()
+        self.walkmap = WalkMap.from_array(self.layout == FLOOR)  # Kept in sync with layout by set_tile
+        # Walkable cells nothing occupies yet, for random placement and teleports
+        self.free_cells = CellIndex.from_walkmap(self.walkmap)
+        self.walkmap.add_listener(self.on_tile_changed)
+        self.nav = NavGrid(self.walkmap)
         self.create_rooms_and_enemies()
         
         # Add portals
-        self.add_portal(1, 1, 'farm', (1, 1))  # Entrance portal
+        self.add_portal(*self.entrance, 'farm', (1, 1))  # Entrance portal
         self.add_portal(self.exit_x, self.exit_y, 'farm', (13, 14))  # Exit portal
 
-    def create_room(self, layout, room):
-        """Mark room area in the dungeon layout"""
-        x, y, w, h = room
-        for i in range(y, y + h):
-            for j in range(x, x + w):
-                if 0 <= i < self.height and 0 <= j < self.width:
-                    layout[i][j] = '.'
-
-    def create_corridor(self, layout, start, end):
-        """Create a corridor between two points"""
-        x1, y1 = start
-        x2, y2 = end
-        
-        # Horizontal first
-        step_x = 1 if x2 > x1 else -1
-        for x in range(x1, x2 + step_x, step_x):
-            if 0 <= x < self.width:
-                layout[y1][x] = '.'
-        
-        # Then vertical
-        step_y = 1 if y2 > y1 else -1
-        for y in range(y1, y2 + step_y, step_y):
-            if 0 <= y < self.height:
-                layout[y][x2] = '.'
+    @property
+    def enemies(self):
+        return self.entities.of_kind('enemy')
+
+    @property
+    def loot_boxes(self):
+        return self.entities.of_kind('loot')
+
+    @property
+    def interactables(self):
+        return self.entities.of_kind('portal')
+
+    def add_enemy(self, enemy):
+        self.entities.add(enemy, 'enemy')
+        self.enemy_grid.insert(enemy)
+
+    def remove_enemy(self, enemy):
+        self.entities.remove(enemy)
+        self.enemy_grid.remove(enemy)
+
+    def add_loot_box(self, loot_box):
+        self.entities.add(loot_box, 'loot')
+        self.loot_grid.insert(loot_box)
+        self.occupy_cell(int(loot_box.x), int(loot_box.y))
+
+    def remove_loot_box(self, loot_box):
+        self.entities.remove(loot_box)
+        self.loot_grid.remove(loot_box)
+        self.release_cell(int(loot_box.x), int(loot_box.y))
+
+    def set_tile(self, x, y, tile):
+        """Change a layout cell (WALL or FLOOR) and keep the walkability map in step"""
+        self.layout[y, x] = tile
+        self.walkmap.set_walkable(x, y, tile == FLOOR)
+
+    def on_tile_changed(self, x, y, walkable):
+        """Walkmap listener: keep the free cell index in step with the layout"""
+        if walkable and (x, y) not in self.portal_positions:
+            self.free_cells.add((x, y))
+        else:
+            self.free_cells.discard((x, y))
+
+    def occupy_cell(self, x, y):
+        """Take a cell out of random placement while something sits on it"""
+        self.free_cells.discard((x, y))
+
+    def release_cell(self, x, y):
+        """Offer a cell for random placement again once it is free"""
+        if self.walkmap.is_walkable(x, y) and (x, y) not in self.portal_positions:
+            self.free_cells.add((x, y))
 
     def generate_dungeon(self):
-        """Generate the dungeon layout with rooms and corridors"""
-        main_room = (10, 5, 10, 10)  # Central room
-        room_1 = (0, 0, 6, 6)        # Top-left room
-        room_2 = (21, 3, 6, 6)       # Top-right room
-        room_3 = (3, 15, 6, 6)       # Bottom-left room
-        room_4 = (21, 15, 6, 6)      # Bottom-right room
-
-        # Create rooms
-        self.create_room(self.layout, main_room)
-        self.create_room(self.layout, room_1)
-        self.create_room(self.layout, room_2)
-        self.create_room(self.layout, room_3)
-        self.create_room(self.layout, room_4)
-
-        # Calculate room centers
-        main_room_center = (main_room[0] + main_room[2] // 2, main_room[1] + main_room[3] // 2)
-        room_1_center = (room_1[0] + room_1[2] // 2, room_1[1] + room_1[3] // 2)
-        room_2_center = (room_2[0] + room_2[2] // 2, room_2[1] + room_2[3] // 2)
-        room_3_center = (room_3[0] + room_3[2] // 2, room_3[1] + room_3[3] // 2)
-        room_4_center = (room_4[0] + room_4[2] // 2, room_4[1] + room_4[3] // 2)
-
-        # Create corridors connecting the rooms
-        self.create_corridor(self.layout, main_room_center, room_1_center)
-        self.create_corridor(self.layout, main_room_center, room_2_center)
-        self.create_corridor(self.layout, main_room_center, room_3_center)
-        self.create_corridor(self.layout, main_room_center, room_4_center)
-
-        # Optionally, create more corridors to connect rooms in the dungeon
-        self.create_corridor(self.layout, room_1_center, room_2_center)
-        self.create_corridor(self.layout, room_3_center, room_4_center)
-
-        # Set exit position (adjust this as needed)
-        self.exit_x = self.width - 2
-        self.exit_y = self.height - 2
+        """Generate the dungeon layout with rooms and corridors (see dungeongen)"""
+        self.rooms = generate_layout(self.layout, self.rng)
+        entrance_room, exit_room = assign_roles(self.rooms, self.rng)
+        self.entrance, (self.exit_x, self.exit_y) = portal_tiles(entrance_room, exit_room)
 
     def create_tiles(self):
         """Create a grid of tiles with types based on dungeon layout"""
@@ -93,7 +124,7 @@ class Dungeon:
         for y in range(self.height):
             row = []
             for x in range(self.width):
-                if self.layout[y][x] == '#':
+                if self.layout[y, x] == WALL:
                     row.append(Tile(x, y, 'stone'))  # Wall
                 else:
                     row.append(Tile(x, y, 'empty'))  # Floor
@@ -102,24 +133,113 @@ class Dungeon:
 
     def update(self, bunny):
         """Update dungeon state including enemies"""
-        for enemy in self.enemies[:]:  # Use [:] to make a copy for safe removal
-            enemy.update(bunny, self)
+        self.update_enemies(bunny)
+        self.resolve_collisions(bunny)
+
+    def update_enemies(self, bunny):
+        """Move the enemies near the bunny and clear away the fallen ones"""
+        bunny_tile = (int(bunny.x), int(bunny.y))
+        if bunny_tile != self.flow_origin:
+            self.update_flow_field(bunny_tile)
+        if bunny_tile != self.fov_origin:
+            self.update_visibility(bunny_tile)
+
+        # Wake-ups are proximity events from the enemy grid, not a check per enemy;
+        # walls between the bunny and an enemy keep it asleep
+        for enemy in self.activity.within(bunny.x, bunny.y, self.WAKE_RADIUS):
+            if self.can_see(enemy.x, enemy.y):
+                enemy.is_awake = True
+
+        for enemy, dt in self.activity.due(bunny.x, bunny.y):
+            enemy.update(bunny, self, dt)
+            self.enemy_grid.move(enemy)
             if enemy.health <= 0:
+                self.fallen.append(enemy)
+
+        # Enemies can also die outside the active tiers, e.g. to a long shot
+        for enemy in self.fallen:
+            if self.entities.contains(enemy):
                 if not enemy.has_dropped_loot:
                     self.handle_enemy_death(enemy, bunny)  # Pass bunny reference
-                self.enemies.remove(enemy)
-                
-        for loot_box in self.loot_boxes:
-            loot_box.update(bunny)
+                self.remove_enemy(enemy)
+        self.fallen.clear()
+
+        if self.horde is not None:
+            for x, y in self.horde.update(bunny, self):
+                self.drop_loot(x, y, bunny)
+
+    def resolve_collisions(self, bunny):
+        """Contact damage from enemies and opening loot boxes the bunny walks into"""
+        # Only enemies and loot boxes bucketed near the bunny can touch it
+        for enemy in self.enemy_grid.colliding(bunny.rect):
+            bunny.take_damage(enemy.attack_power)
+
+        touching = set()
+        for loot_box in self.loot_grid.query(bunny.rect):
+            # A box that cannot open yet warns once each time the bunny walks onto it, not every frame
+            if loot_box.update(bunny, self.mailbox, warn=loot_box not in self.touching):
+                touching.add(loot_box)
+            if loot_box.opened:
+                # Opened boxes have nothing left to do, so retire them for good
+                self.remove_loot_box(loot_box)
+        self.touching = touching
+
+    def update_visibility(self, origin):
+        """Recompute the tiles visible from origin and add them to the explored ones"""
+        self.fov_origin = origin
+        self.visible = field_of_view(self.layout == WALL, origin[0], origin[1], self.VIEW_RADIUS)
+        self.seen |= self.visible
+
+    def can_see(self, x, y):
+        """Whether the bunny currently has line of sight to the tile at (x, y)"""
+        x, y = int(x), int(y)
+        return 0 <= x < self.width and 0 <= y < self.height and bool(self.visible[y, x])
+
+    def update_flow_field(self, target):
+        """Recompute the paths every enemy follows towards the target tile"""
+        self.flow_origin = target
+        distance = self.walkmap.distance_field([target], max_steps=self.CHASE_RADIUS)
+        self.flow = flow_field(distance)
+
+    def flow_step(self, x, y):
+        """Tile step (dx, dy) towards the flow target, (0, 0) on it, None if out of reach"""
+        if (x, y) == self.flow_origin:
+            return 0, 0
+        if self.flow is None or not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        step = self.flow[y, x]
+        return STEPS[step] if step >= 0 else None
+
+    def enemy_positions(self):
+        """Top-left tiles of every enemy box: Enemy objects first, then the horde"""
+        xs = [enemy.x for enemy in self.enemies]
+        ys = [enemy.y for enemy in self.enemies]
+        if self.horde is not None:
+            return np.concatenate([xs, self.horde.x]), np.concatenate([ys, self.horde.y])
+        return np.array(xs, dtype=float), np.array(ys, dtype=float)
+
+    def damage_enemy(self, index, amount):
+        """Damage an enemy by its index in enemy_positions"""
+        if index < len(self.enemies):
+            enemy = self.enemies[index]
+            enemy.take_damage(amount)
+            if enemy.health <= 0:
+                self.fallen.append(enemy)
+        else:
+            self.horde.take_damage(index - len(self.enemies), amount)
 
     def handle_enemy_death(self, enemy, bunny):
         """Handle loot dropping when enemy dies"""
         enemy.has_dropped_loot = True
-        if isinstance(enemy, Boss):
-            self.loot_boxes.append(LootBox(enemy.x, enemy.y, "boss", bunny))
+        self.drop_loot(enemy.x, enemy.y, bunny, boss=isinstance(enemy, Boss))
+
+    def drop_loot(self, x, y, bunny, boss=False):
+        """Leave a loot box where an enemy fell"""
+        if boss:
+            loot_type = "boss"
         else:
             loot_type = "health_potion" if random.random() > 0.5 else "coins"
-            self.loot_boxes.append(LootBox(enemy.x, enemy.y, loot_type, bunny))
+        self.add_loot_box(LootBox(x, y, loot_type, bunny))
 
     def render(self, screen, camera_x, camera_y):
         """Render the dungeon with optimized drawing"""
@@ -127,35 +247,47 @@ class Dungeon:
         floor_color = (200, 200, 200)  # Light gray floors
         tile_size = Config.get('bun_size')
         
-        # Draw dungeon tiles (walls and floors)
-        for y in range(self.height):
-            for x in range(self.width):
+        # Draw dungeon tiles (walls and floors) inside the camera view only
+        first_x, first_y = max(0, int(camera_x // tile_size)), max(0, int(camera_y // tile_size))
+        last_x = min(self.width, int((camera_x + screen.get_width()) // tile_size) + 1)
+        last_y = min(self.height, int((camera_y + screen.get_height()) // tile_size) + 1)
+        fog = Config.get('fog_of_war')
+        for y in range(first_y, last_y):
+            row = self.layout[y]
+            for x in range(first_x, last_x):
                 pos_x = x * tile_size - camera_x
                 pos_y = y * tile_size - camera_y
                 
-                if self.layout[y][x] == '#':
-                    pygame.draw.rect(screen, wall_color, 
-                                (pos_x, pos_y, tile_size, tile_size))
-                else:
-                    pygame.draw.rect(screen, floor_color,
-                                (pos_x, pos_y, tile_size, tile_size))
+                color = wall_color if row[x] == WALL else floor_color
+                if fog and not self.visible[y, x]:
+                    if not self.seen[y, x]:
+                        continue  # Never explored: leave it black
+                    color = tuple(c // 3 for c in color)  # Explored but out of sight
+                pygame.draw.rect(screen, color, (pos_x, pos_y, tile_size, tile_size))
         
         # Render projectiles
-        for proj in self.bunny.carrot_weapon['projectiles']:
-            carrot_img = pygame.image.load('assets/items/carrot_weapon.png').convert_alpha()
+        projectiles = self.bunny.carrot_weapon['projectiles']
+        if len(projectiles):
+            carrot_img = Config.get('projectile_images')['carrot']
             scaled_img = pygame.transform.scale(carrot_img, 
                                                 (Config.get('bun_size') // 2, 
                                                 Config.get('bun_size') // 2))
-            screen.blit(scaled_img, 
-                        (proj['x'] * Config.get('bun_size') - camera_x,
-                        proj['y'] * Config.get('bun_size') - camera_y))
+            for x, y in projectiles.positions():
+                screen.blit(scaled_img, 
+                            (x * Config.get('bun_size') - camera_x,
+                            y * Config.get('bun_size') - camera_y))
         
         # Render enemies and loot boxes
+        # Under fog of war only what the bunny can see right now is drawn
         for enemy in self.enemies:
-            enemy.render(screen, camera_x, camera_y)
+            if not fog or self.can_see(enemy.x, enemy.y):
+                enemy.render(screen, camera_x, camera_y)
+        if self.horde is not None:
+            self.horde.render(screen, camera_x, camera_y, self.visible if fog else None)
             
         for loot_box in self.loot_boxes:
-            loot_box.render(screen, camera_x, camera_y)
+            if not fog or self.can_see(loot_box.x, loot_box.y):
+                loot_box.render(screen, camera_x, camera_y)
         
         # Render interactables (like portals)
         for obj in self.interactables:
@@ -163,59 +295,67 @@ class Dungeon:
                 obj.draw(screen, camera_x, camera_y)
 
     def create_rooms_and_enemies(self):
-        """Place enemies in rooms"""
-        # Boss in center
-        self.enemies.append(Boss(15, 10))
-
-        # Normal enemies
-        enemy_positions = [
-            (5, 5), (7, 7), (24, 5), (22, 7),
-            (5, 18), (7, 16), (24, 18), (22, 16)
-        ]
-        for x, y in enemy_positions:
-            if self.layout[y][x] == '.':  # Only place in walkable areas
-                self.enemies.append(Enemy(x, y, "normal"))
-
-        # Rare enemies
-        rare_positions = [(5, 7), (24, 16)]
-        for x, y in rare_positions:
-            if self.layout[y][x] == '.':
-                self.enemies.append(Enemy(x, y, "rare"))
+        """Place enemies and loot according to each room's role and depth"""
+        deepest = max(room.depth for room in self.rooms) or 1
+        spawns = []  # ((x, y), enemy_type) for the normal and rare enemies
+        for room in self.rooms:
+            if room.role == 'entrance':
+                continue  # Give the bunny a safe place to arrive
+            # Free tiles in the room, keeping the centre clear for portals and loot
+            tiles = [(x, y) for y in range(room.y, room.y + room.h)
+                     for x in range(room.x, room.x + room.w) if (x, y) != room.center]
+            order = self.rng.permutation(len(tiles))
+            spots = (tiles[i] for i in order)
+
+            if room.role == 'boss':
+                self.add_enemy(Boss(*next(spots)))
+            elif room.role == 'treasure':
+                loot_type = "health_potion" if self.rng.random() < 0.5 else "coins"
+                self.add_loot_box(LootBox(*room.center, loot_type))
+
+            # Bigger rooms hold more enemies, and deeper ones more rare enemies
+            rare_chance = 0.4 * room.depth / deepest
+            for _ in range(max(1, room.area // 24)):
+                enemy_type = "rare" if self.rng.random() < rare_chance else "normal"
+                spawns.append((next(spots), enemy_type))
+
+        if self.horde is not None:
+            self.horde.spawn([spot for spot, _ in spawns], [enemy_type for _, enemy_type in spawns])
+        else:
+            for spot, enemy_type in spawns:
+                self.add_enemy(Enemy(*spot, enemy_type))
 
     def add_portal(self, x, y, target_world='farm', target_pos=(1, 1)):
         """Add a portal at the specified position if it's walkable"""
         if self.is_tile_walkable(x, y):
             portal = Portal(x, y, target_world, target_pos)
-            self.interactables.append(portal)
+            self.entities.add(portal, 'portal')
             self.portal_positions.add((x, y))
+            self.occupy_cell(x, y)
             return portal
         return None
+
+    def remove_portal(self, portal):
+        if self.entities.remove(portal):
+            self.portal_positions.discard((portal.x, portal.y))
+            self.release_cell(portal.x, portal.y)
     
     def is_tile_walkable(self, x, y):
         """Check if the tile at (x, y) is walkable."""
-        if 0 <= x < self.width and 0 <= y < self.height:
-            tile = self.layout[y][x]  # Get the tile at (x, y)
-            return tile == '.'
-        return False
+        return self.walkmap.is_walkable(x, y)
 
     def get_random_walkable_position(self):
         """Find a random walkable position not occupied by a portal"""
-        walkable_positions = []
-        for y in range(self.height):
-            for x in range(self.width):
-                if self.layout[y][x] == '.' and (x, y) not in self.portal_positions:
-                    walkable_positions.append((x, y))
-        
-        if walkable_positions:
-            return random.choice(walkable_positions)
-        return None
+        return self.free_cells.sample(self.rng)
 
     def teleport_player(self, bunny, target_world='farm'):
         """Teleport the player to a random position in the dungeon"""
         target_pos = self.get_random_walkable_position()
         if target_pos:
-            # Add a return portal at the teleport location
-            self.add_portal(target_pos[0], target_pos[1], target_world, (bunny.x, bunny.y))
+            # Add a return portal at the teleport location, replacing the previous one
+            if self.return_portal is not None:
+                self.remove_portal(self.return_portal)
+            self.return_portal = self.add_portal(target_pos[0], target_pos[1], target_world, (bunny.x, bunny.y))
             
             # Teleport the player
             bunny.x, bunny.y = target_pos
@@ -295,44 +435,53 @@ class Enemy:
         print(f"{self.enemy_type} enemy defeated!")
         # Optionally, handle loot drops or other effects here
 
-    def update(self, bunny, dungeon):
-        """Update enemy state and movement"""
-        if not self.is_awake:
-            # Wake up if player is nearby
-            dist = math.sqrt((self.x - bunny.x)**2 + (self.y - bunny.y)**2)
-            if dist < 5:
-                self.is_awake = True
-                return
-        
-        # Handle movement
-        self.direction_timer -= 1
+    def update(self, bunny, dungeon, dt=1):
+        """Update enemy state and movement over dt frames (the dungeon wakes enemies up)"""
+        # Chase the bunny along the dungeon's shared flow field while in reach
+        step = dungeon.flow_step(int(self.x), int(self.y)) if self.is_awake else None
+        if step is not None:
+            self.chase(step, dt)
+        else:
+            self.wander(dungeon, dt)
+
+        # Update collision rect (contact damage is dealt by Dungeon.update)
+        self.rect.x = self.x * Config.get('bun_size')
+        self.rect.y = self.y * Config.get('bun_size')
+
+    def chase(self, step, dt=1):
+        """Move towards the next tile of the flow field"""
+        target_x, target_y = int(self.x) + step[0], int(self.y) + step[1]
+        dx, dy = target_x - self.x, target_y - self.y
+        dist = math.hypot(dx, dy)
+        if dist <= self.speed * dt:
+            self.x, self.y = target_x, target_y
+        else:
+            self.x += dx / dist * self.speed * dt
+            self.y += dy / dist * self.speed * dt
+
+    def wander(self, dungeon, dt=1):
+        """Walk in a random direction, turning at walls"""
+        self.direction_timer -= dt
         if self.direction_timer <= 0:
             self.direction = random.choice(["left", "right", "up", "down"])
             self.direction_timer = random.randint(30, 120)
         
         # Calculate new position
+        distance = self.speed * dt
         new_x, new_y = self.x, self.y
         if self.direction == "left":
-            new_x -= self.speed
+            new_x -= distance
         elif self.direction == "right":
-            new_x += self.speed
+            new_x += distance
         elif self.direction == "up":
-            new_y -= self.speed
+            new_y -= distance
         elif self.direction == "down":
-            new_y += self.speed
+            new_y += distance
         
         if dungeon.is_tile_walkable(int(new_x), int(new_y)):
             self.x, self.y = new_x, new_y
         else:
             self.direction_timer = 0  # Change direction next frame
-        
-        # Update collision rect
-        self.rect.x = self.x * Config.get('bun_size')
-        self.rect.y = self.y * Config.get('bun_size')
-        
-        # Check for attack
-        if self.rect.colliderect(bunny.rect):
-            bunny.take_damage(self.attack_power)
 
     def take_damage(self, amount):
         """Handle taking damage"""
@@ -383,20 +532,20 @@ class Boss(Enemy):
         self.speed = 0.02  # Boss moves slower
         self.special_attack_timer = 180
 
-    def update(self, bunny, dungeon):
+    def update(self, bunny, dungeon, dt=1):
         """Boss-specific update with special attacks"""
-        super().update(bunny, dungeon)
+        super().update(bunny, dungeon, dt)
         
         if self.is_awake:
-            self.special_attack_timer -= 1
+            self.special_attack_timer -= dt
             if self.special_attack_timer <= 0:
-                self.special_attack(bunny)
+                self.special_attack(bunny, dungeon)
                 self.special_attack_timer = 180
 
-    def special_attack(self, bunny):
-        """Shockwave attack that damages player"""
+    def special_attack(self, bunny, dungeon):
+        """Shockwave attack that damages player, unless a wall is in the way"""
         dist = math.sqrt((self.x - bunny.x)**2 + (self.y - bunny.y)**2)
-        if dist < 3:  # Attack range
+        if dist < 3 and dungeon.can_see(self.x, self.y):  # Attack range
             bunny.take_damage(self.attack_power * 1.5)
 
 
@@ -413,13 +562,20 @@ class LootBox:
         self.opened = False
         self.bunny = bunny
 
-    def update(self, bunny):
-        """Check for interaction with bunny"""
-        if not self.opened and self.rect.colliderect(bunny.rect):
-            self.open(bunny)
-
-    def open(self, bunny):
-        """Give loot to bunny"""
+    def update(self, bunny, mailbox=None, warn=True):
+        """Check for interaction with bunny; returns whether the bunny is touching the box"""
+        touching = self.rect.colliderect(bunny.rect)
+        if not self.opened and touching:
+            self.open(bunny, mailbox, warn)
+        return touching
+
+    def open(self, bunny, mailbox=None, warn=True):
+        """Give loot to bunny; items that do not fit go to the mailbox, if there is one"""
+        if self.loot_type == "boss" and not bunny.inventory.set_count("boss_key", 1):
+            # Leave the box shut until the bunny has room for the key
+            if warn:
+                bunny.inventory.show_notification("Inventory full! Make room for the BOSS KEY", (255, 0, 0))
+            return
         self.opened = True
         if self.loot_type == "health_potion":
             bunny.heal(50)
@@ -429,10 +585,13 @@ class LootBox:
             bunny.money += coins
             bunny.inventory.show_notification(f"Found {coins} coins!", (255, 255, 0))
         elif self.loot_type == "boss":
-            bunny.inventory.items["boss_key"] = 1
-            bunny.inventory.items["diamond"] = random.randint(1, 3)
+            leftover = bunny.inventory.add_items([("diamond", random.randint(1, 3))])
             bunny.money += 100
-            bunny.inventory.show_notification("You got the BOSS KEY!", (255, 215, 0))
+            if leftover and mailbox is not None:
+                mailbox.add_mail(leftover)
+                bunny.inventory.show_notification("You got the BOSS KEY! Diamonds sent to the mailbox", (255, 215, 0))
+            else:
+                bunny.inventory.show_notification("You got the BOSS KEY!", (255, 215, 0))
 
     def render(self, screen, camera_x, camera_y):
         """Draw the loot box"""
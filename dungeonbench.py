@@ -0,0 +1,147 @@
+"""Headless dungeon combat stress test.
+
+Fills a dungeon with a chosen number of enemies and loot boxes, keeps a
+stream of carrots flying from the bunny and times each phase of a frame
+for a fixed number of ticks. Every scenario is seeded, so runs can be
+compared over time:
+
+    python dungeonbench.py --size 120 --enemies 100 500 2000 --csv Data/dungeon_benchmark.csv
+"""
+import argparse
+import csv
+import os
+import time
+import tracemalloc
+from datetime import datetime
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+import numpy as np
+import pygame
+
+# Config loads its images on import, which needs a display mode
+pygame.init()
+pygame.display.set_mode((1, 1))
+from config import Config
+from bunny import Bunny
+from dungeon import Dungeon, Enemy, LootBox
+from horde import Horde
+
+PHASES = ('enemies', 'projectiles', 'collisions', 'render')
+DIRECTIONS = ('front', 'right', 'back', 'left')
+
+
+def build_scenario(size, enemies, loot_boxes, seed=0, horde=False):
+    """A size x size dungeon holding the given numbers of enemies and loot boxes, or as many as fit"""
+    bunny = Bunny(0, 0, mode='dungeon')
+    dungeon = Dungeon(size, size, bunny, seed=seed)
+    bunny.x, bunny.y = dungeon.entrance
+    bunny.rect.topleft = (bunny.x * Config.get('bun_size'), bunny.y * Config.get('bun_size'))
+
+    # Replace the generated content with the requested amounts
+    for enemy in list(dungeon.enemies):
+        dungeon.remove_enemy(enemy)
+    for loot_box in list(dungeon.loot_boxes):
+        dungeon.remove_loot_box(loot_box)
+    dungeon.horde = Horde(dungeon.rng) if horde else None
+
+    spots = []
+    for _ in range(enemies):
+        spot = dungeon.get_random_walkable_position()
+        if spot is None:  # Every free cell is taken
+            break
+        spots.append(spot)
+    kinds = ['rare' if dungeon.rng.random() < 0.2 else 'normal' for _ in spots]
+    if horde:
+        dungeon.horde.spawn(spots, kinds)
+    else:
+        for spot, kind in zip(spots, kinds):
+            dungeon.add_enemy(Enemy(*spot, kind))
+    for _ in range(loot_boxes):
+        spot = dungeon.get_random_walkable_position()
+        if spot is None:
+            break
+        loot_type = "health_potion" if dungeon.rng.random() < 0.5 else "coins"
+        dungeon.add_loot_box(LootBox(*spot, loot_type))
+    return dungeon, bunny
+
+
+def run_scenario(size, enemies, loot_boxes, ticks, volley=4, seed=0, horde=False):
+    """Run the scenario for ticks frames; returns total seconds spent per phase"""
+    dungeon, bunny = build_scenario(size, enemies, loot_boxes, seed, horde)
+    screen = pygame.Surface(Config.get('window'))
+    camera_x = bunny.x * Config.get('bun_size') - screen.get_width() // 2
+    camera_y = bunny.y * Config.get('bun_size') - screen.get_height() // 2
+    totals = dict.fromkeys(PHASES, 0.0)
+    clock = time.perf_counter
+    for tick in range(ticks):
+        # A sustained stream: a volley of carrots every frame, turning as it goes
+        for shot in range(volley):
+            bunny.current_direction = DIRECTIONS[(tick + shot) % 4]
+            bunny.throw_carrot()
+        bunny.health = 100  # Keep the bunny standing so every tick does the same work
+
+        start = clock()
+        dungeon.update_enemies(bunny)
+        after_enemies = clock()
+        bunny.update_projectiles(dungeon)
+        after_projectiles = clock()
+        dungeon.resolve_collisions(bunny)
+        after_collisions = clock()
+        dungeon.render(screen, camera_x, camera_y)
+        end = clock()
+
+        totals['enemies'] += after_enemies - start
+        totals['projectiles'] += after_projectiles - after_enemies
+        totals['collisions'] += after_collisions - after_projectiles
+        totals['render'] += end - after_collisions
+    return totals
+
+
+def peak_memory(size, enemies, loot_boxes, ticks, volley=4, seed=0, horde=False):
+    """Peak traced allocation in bytes over a separate run of the same scenario.
+
+    Tracing slows everything down, so this run is kept apart from the timed one.
+    """
+    tracemalloc.start()
+    try:
+        run_scenario(size, enemies, loot_boxes, ticks, volley, seed, horde)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time the dungeon combat path under load")
+    parser.add_argument('--size', type=int, default=60, help="dungeon width and height in tiles")
+    parser.add_argument('--enemies', type=int, nargs='+', default=[100, 500, 2000])
+    parser.add_argument('--loot', type=int, default=100, help="loot boxes to place")
+    parser.add_argument('--ticks', type=int, default=300)
+    parser.add_argument('--volley', type=int, default=4, help="carrots thrown per tick")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--horde', action='store_true', help="simulate enemies with the NumPy horde backend")
+    parser.add_argument('--no-memory', action='store_true', help="skip the traced peak memory run")
+    parser.add_argument('--csv', help="append the results to this CSV file")
+    args = parser.parse_args()
+
+    rows = []
+    print(f"{'enemies':>8} " + " ".join(f"{phase + ' ms':>15}" for phase in PHASES) + f" {'peak KiB':>10}")
+    for count in args.enemies:
+        scenario = (args.size, count, args.loot, args.ticks, args.volley, args.seed, args.horde)
+        totals = run_scenario(*scenario)
+        peak = None if args.no_memory else peak_memory(*scenario)
+        per_tick = {phase: totals[phase] * 1000 / args.ticks for phase in PHASES}
+        print(f"{count:>8} " + " ".join(f"{per_tick[phase]:>15.3f}" for phase in PHASES)
+              + f" {'-' if peak is None else peak // 1024:>10}")
+        rows.append([datetime.now().isoformat(timespec='seconds'), args.size, count, args.loot, args.ticks,
+                     args.volley, args.seed, int(args.horde)]
+                    + [round(per_tick[phase], 4) for phase in PHASES]
+                    + ['' if peak is None else peak])
+
+    if args.csv:
+        new_file = not os.path.exists(args.csv)
+        with open(args.csv, 'a', newline='') as f:
+            writer = csv.writer(f)
+            if new_file:
+                writer.writerow(['time', 'size', 'enemies', 'loot_boxes', 'ticks', 'volley', 'seed', 'horde']
+                                + [f'{phase}_ms' for phase in PHASES] + ['peak_bytes'])
+            writer.writerows(rows)
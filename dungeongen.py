@@ -0,0 +1,160 @@
+from collections import deque
+
+import numpy as np
+
+# Dungeon generation only needs NumPy, like mazegen, so it can run on the
+# world pool thread or in offline tools without touching pygame.
+
+WALL = 1
+FLOOR = 0
+
+
+class Room:
+    """A rectangular room and what the generator learned about it"""
+
+    def __init__(self, x, y, w, h):
+        self.x, self.y, self.w, self.h = x, y, w, h
+        self.neighbours = []  # Indices of the rooms a corridor leads to
+        self.depth = 0  # Rooms passed through on the way from the entrance
+        self.role = 'normal'  # 'entrance', 'exit', 'boss', 'treasure' or 'normal'
+
+    @property
+    def center(self):
+        return self.x + self.w // 2, self.y + self.h // 2
+
+    @property
+    def area(self):
+        return self.w * self.h
+
+
+def generate_layout(layout, rng, min_room=4, max_room=12):
+    """Carve rooms and corridors into a layout of walls and return the rooms.
+
+    The map is cut up by binary space partitioning, one room is placed in
+    each leaf, and every split is bridged by a corridor between the closest
+    pair of rooms on either side of it, so the dungeon is always connected.
+    Rooms are carved as array slices, which keeps a 200x200 dungeon with a
+    few hundred rooms in the millisecond range. A map too small to split
+    holds a single room filling it inside the outer wall.
+    """
+    height, width = layout.shape
+    if width < 4 or height < 4:
+        raise ValueError(f"A dungeon needs at least 4x4 tiles, not {width}x{height}")
+    min_leaf = min_room + 2  # Room plus a wall on either side
+    # nodes[i] = (x, y, w, h); children[i] = (left, right, axis) for split nodes,
+    # where axis is 0 for a vertical cut and 1 for a horizontal one
+    nodes = [(0, 0, width, height)]
+    children = {}
+    stack = [0]
+    while stack:
+        i = stack.pop()
+        x, y, w, h = nodes[i]
+        if w > h * 1.25:
+            vertical = True
+        elif h > w * 1.25:
+            vertical = False
+        else:
+            vertical = rng.random() < 0.5
+        size = w if vertical else h
+        if size < 2 * min_leaf:
+            continue
+        cut = int(rng.integers(min_leaf, size - min_leaf + 1))
+        if vertical:
+            halves = [(x, y, cut, h), (x + cut, y, w - cut, h)]
+        else:
+            halves = [(x, y, w, cut), (x, y + cut, w, h - cut)]
+        children[i] = (len(nodes), len(nodes) + 1, 0 if vertical else 1)
+        nodes.extend(halves)
+        stack.extend(children[i][:2])
+
+    if len(nodes) == 1:
+        # The root could not be split, and may be too small for a room of min_room
+        room = Room(1, 1, width - 2, height - 2)
+        layout[1:-1, 1:-1] = FLOOR
+        return [room]
+
+    rooms = []
+    members = {}  # Room indices under each node
+    # Children always come after their parent, so walking backwards visits
+    # both halves of a split before the split itself
+    for i in range(len(nodes) - 1, -1, -1):
+        if i not in children:
+            x, y, w, h = nodes[i]
+            room_w = int(rng.integers(min_room, min(max_room, w - 2) + 1))
+            room_h = int(rng.integers(min_room, min(max_room, h - 2) + 1))
+            room = Room(x + 1 + int(rng.integers(w - room_w - 1)),
+                        y + 1 + int(rng.integers(h - room_h - 1)), room_w, room_h)
+            layout[room.y:room.y + room.h, room.x:room.x + room.w] = FLOOR
+            members[i] = [len(rooms)]
+            rooms.append(room)
+            continue
+
+        left, right, axis = children.pop(i)
+        left, right = members.pop(left), members.pop(right)
+        a, b = closest_pair(rooms, left, right, axis)
+        carve_corridor(layout, rooms[a].center, rooms[b].center, rng.random() < 0.5)
+        rooms[a].neighbours.append(b)
+        rooms[b].neighbours.append(a)
+        members[i] = left + right
+    return rooms
+
+
+def closest_pair(rooms, left, right, axis, candidates=6):
+    """A short bridge across a split: the nearest pair of rooms facing the cut.
+
+    Only the few rooms on each side closest to the cut are compared, which
+    keeps the big splits near the root from costing len(left) * len(right).
+    """
+    left = sorted(left, key=lambda i: rooms[i].center[axis])[-candidates:]
+    right = sorted(right, key=lambda i: rooms[i].center[axis])[:candidates]
+
+    def gap(pair):
+        (x1, y1), (x2, y2) = rooms[pair[0]].center, rooms[pair[1]].center
+        return abs(x1 - x2) + abs(y1 - y2)
+    return min(((a, b) for a in left for b in right), key=gap)
+
+
+def carve_corridor(layout, start, end, horizontal_first):
+    """Carve an L-shaped corridor between two points"""
+    (x1, y1), (x2, y2) = start, end
+    row, column = (y1, x2) if horizontal_first else (y2, x1)
+    layout[row, min(x1, x2):max(x1, x2) + 1] = FLOOR
+    layout[min(y1, y2):max(y1, y2) + 1, column] = FLOOR
+
+
+def assign_roles(rooms, rng):
+    """Pick the entrance, exit, boss and treasure rooms and record room depths.
+
+    The exit is the room farthest from the entrance through the corridor
+    graph, the boss guards the next deepest room and dead-end rooms hold
+    treasure. A dungeon of one room returns it as both entrance and exit;
+    portal_tiles then puts the two portals in opposite corners.
+    """
+    entrance = rooms[int(rng.integers(len(rooms)))]
+    seen = {id(entrance)}
+    queue = deque([entrance])
+    while queue:
+        room = queue.popleft()
+        for i in room.neighbours:
+            if id(rooms[i]) not in seen:
+                seen.add(id(rooms[i]))
+                rooms[i].depth = room.depth + 1
+                queue.append(rooms[i])
+    by_depth = sorted(rooms, key=lambda room: room.depth, reverse=True)
+    entrance.role = 'entrance'
+    exit_room = by_depth[0]
+    if exit_room is not entrance:
+        exit_room.role = 'exit'
+    if len(by_depth) > 2:
+        by_depth[1].role = 'boss'
+    for room in rooms:
+        if room.role == 'normal' and len(room.neighbours) == 1:
+            room.role = 'treasure'
+    return entrance, exit_room
+
+
+def portal_tiles(entrance, exit_room):
+    """(entrance, exit) portal tiles: the two rooms' centres, or opposite corners of a lone room"""
+    if exit_room is not entrance:
+        return entrance.center, exit_room.center
+    return (entrance.x, entrance.y), (entrance.x + entrance.w - 1, entrance.y + entrance.h - 1)
@@ -2,14 +2,20 @@ import pygame
 import random
 from config import Config
 from bunny import *
+from walkmap import WalkMap
+from navgrid import NavGrid
+from registry import EntityRegistry
 
 
 class Tile:
-    def __init__(self,tile_type='dirt', x=0, y=0):
-        self.type = tile_type
-        self.dug = False
+    WALKABLE_TYPES = ('empty', 'dirt')
+
+    def __init__(self,tile_type='dirt', x=0, y=0, walkmap=None):
+        self.walkmap = walkmap  # Farm walkability map kept in sync with this tile's type
         self.tile_x = x
         self.tile_y = y
+        self.type = tile_type
+        self.dug = False
         self.health = 10 if tile_type in ('tree', 'stone') else 0
         self.max_health = 10 if tile_type in ('tree', 'stone') else 0
         self.interactables = []
@@ -24,6 +30,16 @@ class Tile:
         self.y = y
         self.harvestable = False
 
+    @property
+    def type(self):
+        return self._type
+
+    @type.setter
+    def type(self, value):
+        self._type = value
+        if self.walkmap is not None:
+            self.walkmap.set_walkable(self.tile_x, self.tile_y, value in self.WALKABLE_TYPES)
+
     @property
     def x(self):
         return self._x  # Get the value of x
@@ -140,14 +156,21 @@ class Farm:
     def __init__(self, width=50, height=30):
         self.width = width
         self.height = height
-        self.tiles = [[Tile('dirt', x, y) for x in range(width)] for y in range(height)]
-        self.interactables = []
+        self.walkmap = WalkMap(width, height, walkable=True)
+        self.nav = NavGrid(self.walkmap)  # Click-to-move paths, updated as trees and stones come and go
+        self.tiles = [[Tile('dirt', x, y, self.walkmap) for x in range(width)] for y in range(height)]
+        self.entities = EntityRegistry()  # Portals, the mailbox and other interactables
         self.calendar = Calendar()  # Add calendar
         # In the Tile class's __init__ method, modify these lines:
 
         self._generate_terrain()
 
 
+    @property
+    def interactables(self):
+        """Snapshot of every entity on the farm"""
+        return list(self.entities)
+
     def update(self):
         current_time = pygame.time.get_ticks()
         
@@ -173,7 +196,7 @@ class Farm:
         for _ in range(40):
             x, y = random.randint(3, self.width-4), random.randint(3, self.height-4)
             # Create a NEW Tile instance with type 'tree' - this will apply the scaling factors
-            self.tiles[y][x] = Tile('tree', x, y)
+            self.tiles[y][x] = Tile('tree', x, y, self.walkmap)
             self.tiles[y][x].health = 10
             self.tiles[y][x].max_health = 10
         
@@ -181,23 +204,23 @@ class Farm:
         for _ in range(25): 
             x, y = random.randint(3, self.width-4), random.randint(3, self.height-4)
             # Create a NEW Tile instance with type 'stone' - this will apply the scaling factors
-            self.tiles[y][x] = Tile('stone', x, y)
+            self.tiles[y][x] = Tile('stone', x, y, self.walkmap)
             self.tiles[y][x].health = 10
             self.tiles[y][x].max_health = 10
 
         # Example manually placed house from (10, 16) to (10, 14)
         for x in range(10, 16):  # 6 tiles wide
             for y in range(10, 14):  # 4 tiles tall
-                self.tiles[y][x] = Tile('house', x, y)
+                self.tiles[y][x] = Tile('house', x, y, self.walkmap)
 
         # Place mailbox at a clear position near house
         mailbox_x, mailbox_y = 15, 14
-        self.tiles[mailbox_y][mailbox_x] = Tile('dirt', mailbox_x, mailbox_y)  # Ensure it's on dirt
+        self.tiles[mailbox_y][mailbox_x] = Tile('dirt', mailbox_x, mailbox_y, self.walkmap)  # Ensure it's on dirt
         self.mailbox = Mailbox(mailbox_x, mailbox_y)
-        self.interactables.append(self.mailbox)
+        self.entities.add(self.mailbox, 'interactable')
 
         wall_x, wall_y = 48, 28
-        self.tiles[wall_y][wall_x] = Tile('wall', wall_x, wall_y)  # Note y comes first in the indexing
+        self.tiles[wall_y][wall_x] = Tile('wall', wall_x, wall_y, self.walkmap)  # Note y comes first in the indexing
 
 
     def handle_events(self, event):
@@ -240,19 +263,7 @@ class Farm:
     
     def is_tile_walkable(self, x, y):
         """Check if a tile can be walked on"""
-        if not (0 <= x < self.width and 0 <= y < self.height):
-            return False
-            
-        # Check tile type
-        if self.tiles[y][x].type in ('tree', 'stone', 'house', 'wall'):
-            return False
-            
-        # Check interactables
-        for obj in self.interactables:
-            if int(x) == getattr(obj, 'tile_x', -1) and int(y) == getattr(obj, 'tile_y', -1):
-                return False
-                
-        return True
+        return self.walkmap.is_walkable(x, y)
 
 
 class Plant:
@@ -413,20 +424,23 @@ class Mailbox:
         self.notification_timer = pygame.time.get_ticks()
 
     def check_mail(self, bunny):
+        """Move as much mail as fits into the inventory; returns True if anything was collected"""
         if self.has_mail:
-            for item, amount in self.mail_items:
-                bunny.add_to_inventory(item, amount)
-            self.mail_items = []
-            self.has_mail = False
-            return True
+            waiting = sum(amount for _, amount in self.mail_items)
+            # Whatever does not fit stays in the mailbox for next time
+            self.mail_items = bunny.inventory.add_items(self.mail_items)
+            self.has_mail = bool(self.mail_items)
+            return sum(amount for _, amount in self.mail_items) < waiting
         return False
 
     def interact(self, game):
         """Handle mailbox interaction"""
         if not self.show_sell_menu:
             if self.has_mail:
-                if self.check_mail(game.bunny):
+                if self.check_mail(game.bunny) and not self.has_mail:
                     game.bunny.inventory.show_notification("Mail collected!", (0, 255, 0))
+                else:
+                    game.bunny.inventory.show_notification("Inventory full, some mail is still waiting!", (255, 100, 0))
             else:
                 self.show_sell_menu = True
                 game.bunny.current_interactable = self
@@ -0,0 +1,59 @@
+import numpy as np
+
+# Transforms mapping octant-local (dx, dy) onto the grid, one per octant
+OCTANTS = ((1, 0, 0, 1), (0, 1, 1, 0), (0, -1, 1, 0), (-1, 0, 0, 1),
+           (-1, 0, 0, -1), (0, -1, -1, 0), (0, 1, -1, 0), (1, 0, 0, -1))
+
+
+def field_of_view(opaque, x, y, radius):
+    """Tiles visible from (x, y) within radius, by recursive shadowcasting.
+
+    ``opaque`` is a 2D bool array (True blocks sight); anything outside it
+    blocks sight too. Each octant is scanned row by row outwards, narrowing
+    the lit slope range as walls cast shadows. The recursion is kept on an
+    explicit stack, which is fine because every branch is independent.
+    Returns a bool array the shape of ``opaque``; wall tiles that are seen
+    are marked visible as well.
+    """
+    height, width = opaque.shape
+    visible = np.zeros(opaque.shape, dtype=bool)
+    if not (0 <= x < width and 0 <= y < height):
+        return visible
+    visible[y, x] = True
+    radius_sq = radius * radius
+    for xx, xy, yx, yy in OCTANTS:
+        stack = [(1, 1.0, 0.0)]
+        while stack:
+            row, start, end = stack.pop()
+            if start < end:
+                continue
+            for j in range(row, radius + 1):
+                dx, dy = -j - 1, -j
+                blocked = False
+                new_start = start
+                while dx <= 0:
+                    dx += 1
+                    map_x, map_y = x + dx * xx + dy * xy, y + dx * yx + dy * yy
+                    left_slope, right_slope = (dx - 0.5) / (dy + 0.5), (dx + 0.5) / (dy - 0.5)
+                    if start < right_slope:
+                        continue
+                    if end > left_slope:
+                        break
+                    inside = 0 <= map_x < width and 0 <= map_y < height
+                    if inside and dx * dx + dy * dy < radius_sq:
+                        visible[map_y, map_x] = True
+                    wall = not inside or opaque[map_y, map_x]
+                    if blocked:
+                        if wall:
+                            new_start = right_slope
+                        else:
+                            blocked = False
+                            start = new_start
+                    elif wall and j < radius:
+                        # This wall starts a shadow; scan the lit part beyond it later
+                        blocked = True
+                        stack.append((j + 1, start, left_slope))
+                        new_start = right_slope
+                if blocked:
+                    break
+    return visible
@@ -1,13 +1,19 @@
 import pygame
 import csv,json,os,sys,subprocess,time
 from config import *
-from maze import Maze
+from maze import Maze, EndlessMaze
+from mazegen import new_seed
 from bunny import *
 from farm import *
 from dungeon import Dungeon 
+from worldpool import WorldPool
+from mazecatalog import MazeCatalog
+from telemetry import telemetry
+from logsegments import LogRotator
+from positiontrace import PositionTrace, TRACE_HEADER
+from savestore import read_save, save_exists, write_save
 from stattk import *
 import tkinter as tk
-from collections import defaultdict
 
 class Game:
     def __init__(self, username='Unknown'):
@@ -25,20 +31,35 @@ class Game:
         self.clock = pygame.time.Clock()
         self.interact_font = pygame.font.Font(Config.get('font'), 24)
         self.farm = Farm(50, 30)
-        self.maze = Maze(Config.get('grid'), Config.get('grid'))
+        # Mazes and dungeons are pre-generated in the background so portals open instantly.
+        # Every maze gets a concrete seed, so a logged run can be replayed on the same maze.
+        self.world_pool = WorldPool({
+            'maze': lambda: Maze(Config.get('grid'), Config.get('grid'), seed=new_seed()),
+            'dungeon': lambda: Dungeon(Config.get('dungeon_size'), Config.get('dungeon_size'), None),
+        })
+        self.maze = self.world_pool.pop('maze')
+        self.maze_catalog = MazeCatalog()
         self.mailbox = Mailbox(15, 14)  # Position near house
         self.warp_portal = Portal(self.farm.width - 3, self.farm.height - 2, 'random')
-        self.farm.interactables.append(self.warp_portal)
+        self.farm.entities.add(self.warp_portal, 'portal')
         # Position it in a walkable area
-        self.farm.tiles[self.farm.height - 2][self.farm.width - 3] = Tile('dirt', self.farm.width - 3, self.farm.height - 2)
-        self.farm.interactables.append(self.mailbox)
+        self.farm.tiles[self.farm.height - 2][self.farm.width - 3] = Tile('dirt', self.farm.width - 3, self.farm.height - 2, self.farm.walkmap)
+        self.farm.entities.add(self.mailbox, 'interactable')
         
         # Store username
         self.username = username
+        telemetry.db_path = Config.get('telemetry_db')
+        telemetry.rotation = LogRotator(Config.get('log_rotate_kb') * 1024, Config.get('log_rotate_days') * 24 * 3600,
+                                        Config.get('log_keep_segments'))
+        telemetry.start_session(username)
         
         self.bunny = Bunny(15, 15, mode='farm', username=username)  # Pass username to Bunny
-        self.dungeon = Dungeon(30, 30,self.bunny)
+        self.dungeon = self.world_pool.pop('dungeon')
+        self.dungeon.bunny = self.bunny
+        self.dungeon.mailbox = self.mailbox
+        self.world_pool.start()
         
+        self.trace = PositionTrace(epsilon=Config.get('trace_epsilon'))
         self.last_log_time = pygame.time.get_ticks()
         if not self.is_player_exists():
             self.handle_new_player()
@@ -47,9 +68,7 @@ class Game:
     
     def give_starter_kit(self):
         """Give new players essential starting items"""
-        self.bunny.add_to_inventory("carrot_weapon")
-        self.bunny.add_to_inventory("carrot_seed",5)
-        self.bunny.add_to_inventory("potato_seed",5)
+        self.bunny.inventory.add_items([("carrot_weapon", 1), ("carrot_seed", 5), ("potato_seed", 5)])
         # Give money separately
         self.bunny.money += 200  # Starting money
 
@@ -58,18 +77,25 @@ class Game:
     def init_portals(self):
         # Farm portal (goes to random location)
         self.farm_portal = Portal(self.farm.width - 2, self.farm.height - 2)
-        self.farm.interactables.append(self.farm_portal)
+        self.farm.entities.add(self.farm_portal, 'portal')
         
         # Only create maze exit portal (no entrance portal)
         self.exit = self.maze.get_random_exit()
         self.maze_exitportal = Portal(self.exit[0], self.exit[1], 'farm', (13, 14))  # Goes back to farm at position (13,14)
-        self.maze.interactables.append(self.maze_exitportal)
-        
-        # Dungeon portals (unchanged)
-        self.dungeon_enterportal = Portal(1, 1, 'farm', (self.farm.width - 3, self.farm.height - 2))
-        self.dungeon_exitportal = Portal(self.dungeon.exit_x, self.dungeon.exit_y, 'farm', (1, 1))
-        self.dungeon.interactables.append(self.dungeon_enterportal)
-        self.dungeon.interactables.append(self.dungeon_exitportal)
+        self.maze.entities.add(self.maze_exitportal, 'portal')
+        # Dungeons add their own entrance and exit portals when generated
+
+    def place_maze_exit(self):
+        """Pick a new maze exit and move the exit portal onto it"""
+        if self.maze.difficulty is None:
+            self.maze.get_random_exit()
+        # Catalogue mazes keep their own exit, which their difficulty tier was measured from
+        self.follow_maze_exit()
+
+    def follow_maze_exit(self):
+        """Move the exit portal onto the maze's current exit"""
+        self.exit = self.maze.exit
+        self.maze_exitportal.tile_x, self.maze_exitportal.tile_y = self.exit
 
     def warp_to_random(self):
         """Randomly warp to either maze or dungeon"""
@@ -82,12 +108,15 @@ class Game:
         self.fade_transition()
         self.bunny.mode = 'dungeon'
         
-        # Reinitialize dungeon to ensure it's properly generated
-        self.dungeon = Dungeon(30, 30,self.bunny)
+        # Take a freshly generated dungeon from the pool
+        self.dungeon = self.world_pool.pop('dungeon')
+        self.dungeon.bunny = self.bunny
+        self.dungeon.mailbox = self.mailbox
         
-        # Set position to a known walkable spot (near entrance portal)
-        self.bunny.x, self.bunny.y = 1, 1
+        # Arrive on the entrance portal in the generated entrance room
+        self.bunny.x, self.bunny.y = self.dungeon.entrance
         self.bunny.target_x, self.bunny.target_y = self.bunny.x, self.bunny.y
+        self.bunny.path = []
         
         # Force camera update
         self.update_camera(instant=True)
@@ -97,11 +126,32 @@ class Game:
         print(f"Dungeon spawned at ({self.bunny.x}, {self.bunny.y})")
         print(f"Camera position: ({self.camera_x}, {self.camera_y})")
 
-    def warp_to_maze(self):
+    def warp_to_maze(self, difficulty=None):
         self.fade_transition()
         self.bunny.mode = 'maze'
         self.bunny.x, self.bunny.y = 1, 1  # Maze entrance position
         self.bunny.target_x, self.bunny.target_y = self.bunny.x, self.bunny.y
+        self.bunny.path = []
+        difficulty = difficulty or Config.get('maze_difficulty')
+        if Config.get('endless_maze'):
+            # Every visit streams a fresh endless maze from the entrance
+            self.maze = EndlessMaze(Config.get('grid'), self.bunny, seed=new_seed())
+        elif difficulty and self.maze_catalog.has_tier(difficulty):
+            # Catalogue mazes have known metrics, so their times can be compared
+            entry = self.maze_catalog.pick(difficulty)
+            grid, exit_pos = self.maze_catalog.load(entry)
+            self.maze = Maze(grid.shape[0], grid.shape[1], seed=int(entry['seed']), grid=grid)
+            self.maze.difficulty = difficulty
+            self.maze.set_exit(*exit_pos)
+        else:
+            if difficulty:
+                print(f"No {difficulty} mazes in the catalogue, generating a fresh one")
+            self.maze = self.world_pool.pop('maze')
+        self.maze.entities.add(self.maze_exitportal, 'portal')
+        if self.maze.exit is None:
+            self.place_maze_exit()
+        else:
+            self.follow_maze_exit()
         self.update_camera(instant=True)
         self.start_time = pygame.time.get_ticks()  # Reset timer when entering maze
         self.game_over = False  # Reset game over state
@@ -109,12 +159,7 @@ class Game:
 
     def is_player_exists(self):
         """Check if the player's save exists"""
-        try:
-            with open('Data/save_game.json', 'r') as f:
-                all_saves = json.load(f)
-            return self.username in all_saves
-        except FileNotFoundError:
-            return False   
+        return save_exists(self.username)
 
     def handle_new_player(self):
         """Handle new player setup - shown once before starting the game"""
@@ -139,6 +184,7 @@ class Game:
         self.bunny.mode = 'farm'
         self.bunny.x, self.bunny.y = 13, 14
         self.bunny.target_x, self.bunny.target_y = self.bunny.x, self.bunny.y
+        self.bunny.path = []
         self.update_camera(instant=True)
         self.has_warped = True
         self.game_over = False
@@ -146,6 +192,9 @@ class Game:
 
     def render_maze(self):
         """Render maze mode"""
+        if self.maze.exit != self.exit:
+            # An endless maze moves its exit when the old path scrolls out of its window
+            self.follow_maze_exit()
         self.maze.draw(self.screen, self.camera_x, self.camera_y)
         self.maze_exitportal.draw(self.screen, self.camera_x, self.camera_y)
 
@@ -155,7 +204,7 @@ class Game:
             print("Time limit exceeded!")
             self.game_over = True
             self.success = False
-            self.log_to_csv(current_time, False)
+            self.log_to_csv(current_time, False, self.maze)
             self.warp_to_farm()
             return
 
@@ -166,9 +215,9 @@ class Game:
             self.success = True
             end_time = pygame.time.get_ticks()
             time_taken = (end_time - self.start_time) / 1000  # Convert to seconds
-            self.log_to_csv(time_taken, self.success)
+            self.log_to_csv(time_taken, self.success, self.maze)
             self.previous_exit = (self.exit[0], self.exit[1])
-            self.exit = self.maze.get_random_exit()
+            self.place_maze_exit()
             self.handle_bunny_faint()
     
     def reset_game(self, load_save=False):
@@ -178,7 +227,7 @@ class Game:
         self.camera_x, self.camera_y = 0, 0
         self.game_over = False
         self.portal_cooldown = 0
-        self.dungeon = Dungeon(30, 30,self.bunny)
+        self.dungeon.bunny = self.bunny
     
         if load_save:
             loaded = self.load_game()
@@ -194,7 +243,7 @@ class Game:
                 return
         
         # Then check portal interaction
-        for obj in self.farm.interactables:
+        for obj in self.farm.entities.of_kind('portal'):
             if isinstance(obj, Portal):
                 bunny_tile_x, bunny_tile_y = int(self.bunny.x), int(self.bunny.y)
                 if bunny_tile_x == obj.x and bunny_tile_y == obj.y:
@@ -281,7 +330,7 @@ class Game:
                 text = "Interact (SPACE)"
             self.draw_text(text, 24, Config.get('white'), (10, 80))
         
-        for portal in self.farm.interactables:
+        for portal in self.farm.entities.of_kind('portal'):
             if isinstance(portal, Portal) and portal.check_collision(self.bunny):
                 text = "Enter Portal (SPACE)"
                 font = pygame.font.Font(Config.get('font'), 24)
@@ -350,6 +399,8 @@ class Game:
             elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 if self.mailbox.show_sell_menu:
                     self.handle_mailbox_click(event.pos)
+                elif Config.get('click_to_move') and not self.bunny.inventory.full_view:
+                    self.handle_move_click(event.pos)
                     
             # Handle inventory management when in full view
             if self.bunny.inventory.full_view and event.type == pygame.KEYDOWN:
@@ -357,9 +408,9 @@ class Game:
                     num = event.key - pygame.K_1  # hotbar slot index
                     selected = self.bunny.inventory.swap_selected_index
                     if selected is not None:
-                        if num < len(self.bunny.inventory.hotbar_indices):
-                            self.bunny.inventory.hotbar_indices[num] = selected
-                            self.bunny.held_item = self.bunny.inventory[num]
+                        if num < len(self.bunny.inventory.hotbar_slots):
+                            self.bunny.inventory.hotbar_slots[num] = selected
+                            self.bunny.held_item = self.bunny.inventory.hotbar_item(num)
                             self.bunny.inventory.swap_selected_index = None
 
                 if self.bunny.inventory.show_swap_box:
@@ -369,7 +420,7 @@ class Game:
                         try:
                             slot_index = int(self.bunny.inventory.swap_input_text) - 1
                             if 0 <= slot_index < 6 and self.bunny.inventory.swap_selected_index is not None:
-                                self.bunny.inventory.hotbar_indices[slot_index] = self.bunny.inventory.swap_selected_index
+                                self.bunny.inventory.hotbar_slots[slot_index] = self.bunny.inventory.swap_selected_index
                         except:
                             pass
                         self.bunny.inventory.swap_input_text = ""
@@ -389,7 +440,7 @@ class Game:
                 
             # Check if standing on a portal (but don't interact automatically)
             on_portal = False
-            for obj in self.farm.interactables:
+            for obj in self.farm.entities.of_kind('portal'):
                 if isinstance(obj, Portal) and (int(front_x), int(front_y)) == (obj.x, obj.y):
                     on_portal = True
                     break
@@ -417,7 +468,7 @@ class Game:
         elif self.bunny.mode == 'maze':
             # Only interact with non-portal objects in maze
             front_x, front_y = self.bunny.get_front_position()
-            for obj in self.maze.interactables:
+            for obj in self.maze.entities.of_kind('interactable'):
                 if not isinstance(obj, Portal) and (int(front_x), int(front_y)) == (obj.x, obj.y):
                     obj.interact(self)
                     
@@ -428,7 +479,7 @@ class Game:
         """Explicitly handle portal interaction when a specific key is pressed (like 'P')"""
         if self.bunny.mode == 'farm':
             front_x, front_y = self.bunny.get_front_position()
-            for obj in self.farm.interactables:
+            for obj in self.farm.entities.of_kind('portal'):
                 if isinstance(obj, Portal) and (int(front_x), int(front_y)) == (obj.x, obj.y):
                     self.handle_teleport(obj)
                     return
@@ -436,11 +487,13 @@ class Game:
     def ensure_data_files(self):
         """Ensure all data files exist with proper headers"""
         data_files = [
-    ('Data/maze_log.csv', ["time_taken(s)", "Success_status"]),
+    ('Data/maze_log.csv', ["time_taken(s)", "Success_status", "Maze_seed", "Difficulty"]),
+    ('Data/dungeon_log.csv', ["time_taken(s)", "Success_status"]),
     ('Data/bunny_positions.csv', ["x", "y"]),
     ('Data/combat_accuracy.csv', ["Hit"]),
     ('Data/inventory_usage.csv', ["item_name"]),
     ('Data/Crop.csv', ["Week", "Season", "Crop", "Amount"]),
+    ('Data/sales.csv', ["Crop", "Quantity", "Total"]),
     ('Data/enemy_difficulty.csv', ["Enemy Type", "Kills/Deaths"])  # New entry for enemy difficulty
 ]
         for file_path, headers in data_files:
@@ -450,9 +503,24 @@ class Game:
                     with open(file_path, 'w', newline='') as f:
                         writer = csv.writer(f)
                         writer.writerow(headers)
+                else:
+                    self.upgrade_header(file_path, headers)
             except Exception as e:
                 print(f"Error creating data file {file_path}: {e}")
 
+    def upgrade_header(self, file_path, headers):
+        """Widen an existing log's header when a newer version of the game appends columns to its rows"""
+        with open(file_path, newline='') as f:
+            lines = f.readlines()
+        current = next(csv.reader(lines[:1]), [])
+        if not lines or len(current) >= len(headers) or headers[:len(current)] != current:
+            return
+        ending = lines[0][len(lines[0].rstrip('\r\n')):] or '\r\n'  # Keep the file's line endings
+        lines[0] = ','.join(headers) + ending
+        with open(file_path + '.tmp', 'w', newline='') as f:
+            f.writelines(lines)
+        os.replace(file_path + '.tmp', file_path)
+
     def draw_text(self, text, font_size, color, position):
         """Helper method to draw text"""
         font = pygame.font.Font(Config.get('font'), font_size)
@@ -465,50 +533,33 @@ class Game:
         self.farm_portal.draw(self.screen, self.camera_x, self.camera_y)
         self.mailbox.draw(self.screen, self.camera_x, self.camera_y)
 
-    def log_to_csv(self, time_taken, success):
-        """Log game results to maze_log.csv"""
+    def log_to_csv(self, time_taken, success, maze=None):
+        """Log a maze run to maze_log.csv with its seed and difficulty, or a dungeon run (no maze) to dungeon_log.csv"""
+        result = "win" if success else "lose"
         try:
-            os.makedirs('Data', exist_ok=True)
-            file_path = 'Data/maze_log.csv'
-
-            write_header = not os.path.exists(file_path)
-
-            with open(file_path, mode='a', newline='') as file:
-                writer = csv.writer(file)
-                if write_header:
-                    writer.writerow(["timestamp", "username", "time_taken", "result"])
-
-                timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-                result = "win" if success else "lose"
-                if result == 'win':
-                    result == True
-                elif result == 'lose':
-                    result == False
-                writer.writerow([ time_taken, result])
-
+            if maze is None:
+                telemetry.write('Data/dungeon_log.csv', [time_taken, result],
+                                header=["time_taken(s)", "Success_status"], table='dungeon_runs')
+            else:
+                telemetry.write('Data/maze_log.csv', [time_taken, result, maze.seed, maze.difficulty],
+                                header=["time_taken(s)", "Success_status", "Maze_seed", "Difficulty"],
+                                table='maze_runs')
             print(f"Logged {result} for {self.username}.")
         except Exception as e:
             print(f"Error logging maze data: {e}")
 
-            if success:
+            if success and self.bunny.mode == 'maze':
                 # Add rewards to mailbox
-                rewards = []
-                if self.bunny.mode == 'maze':
-                    rewards.append(('diamond', 5))
-                    rewards.append(('carrot', 3))
-                    rewards.append(('stone', 5))
-    
-                self.mailbox.add_mail(rewards)
+                self.mailbox.add_mail([('diamond', 5), ('carrot', 3), ('stone', 5)])
                 self.bunny.inventory.show_notification("Rewards waiting at mailbox!", (200, 200, 0))
 
     def send_seeds(self):
         """Send seeds every Saturday"""
-        self.bunny.add_to_inventory("carrot_seed", 5)
-        self.bunny.add_to_inventory("potato_seed", 5)
-        self.bunny.add_to_inventory("radish_seed", 5)
-        self.bunny.add_to_inventory("spinach_seed", 5)
-        self.bunny.add_to_inventory("turnip_seed", 5)
-        self.bunny.inventory.show_notification("Seeds sent!", (0, 255, 0))
+        seeds = [(seed, 5) for seed in ("carrot_seed", "potato_seed", "radish_seed", "spinach_seed", "turnip_seed")]
+        if self.bunny.inventory.add_items(seeds):
+            self.bunny.inventory.show_notification("Inventory full, some seeds were lost!", (255, 100, 0))
+        else:
+            self.bunny.inventory.show_notification("Seeds sent!", (0, 255, 0))
         
     def teleport_bunny(self, world, target_pos):
         tx, ty = target_pos
@@ -516,6 +567,7 @@ class Game:
         if self.bunny.can_move_to(tx, ty, world):
             self.bunny.x = self.bunny.target_x = tx
             self.bunny.y = self.bunny.target_y = ty
+            self.bunny.path = []
             self.update_camera(instant=True)
             return True
         return False
@@ -528,6 +580,13 @@ class Game:
                 self.mailbox.show_sell_menu = True
                 self.bunny.current_interactable = self.mailbox
 
+    def handle_move_click(self, pos):
+        """Walk the bunny to the clicked tile along a planned path"""
+        tile_size = Config.get('bun_size')
+        tile = (int((pos[0] + self.camera_x) // tile_size), int((pos[1] + self.camera_y) // tile_size))
+        if not self.bunny.walk_to(tile, self.current_world()):
+            self.bunny.inventory.show_notification("Can't get there!", (255, 100, 0))
+
     def handle_mailbox_click(self, pos):
         if not self.mailbox.show_sell_menu:
             return False
@@ -572,11 +631,11 @@ class Game:
         return False
 
     def sell_crop(self):
-        if self.mailbox.selected_crop in self.bunny.inventory.items and self.bunny.inventory.items[self.mailbox.selected_crop] > 0:
-            quantity = self.bunny.inventory.items[self.mailbox.selected_crop]
+        if self.bunny.inventory.count(self.mailbox.selected_crop) > 0:
+            quantity = self.bunny.inventory.count(self.mailbox.selected_crop)
             total = quantity * self.mailbox.crop_prices[self.mailbox.selected_crop]
             self.bunny.money += total
-            self.bunny.inventory.items[self.mailbox.selected_crop] = 0
+            self.bunny.inventory.remove_items([(self.mailbox.selected_crop, quantity)])
             self.bunny.inventory.show_notification(f"Sold {quantity} {self.mailbox.selected_crop} for ${total}!", (0, 255, 0))
             
             # Log the sale
@@ -652,8 +711,17 @@ class Game:
                                 Config.get('bun_size') // 2, Config.get('bun_size') // 2)
         return proj_rect.colliderect(enemy.rect)
     
+    def current_world(self):
+        """The world the bunny is in, based on its mode"""
+        if self.bunny.mode == 'maze':
+            return self.maze
+        elif self.bunny.mode == 'farm':
+            return self.farm
+        return self.dungeon
+
     def update(self):
         """Update the game state based on current mode"""
+        telemetry.mode = self.bunny.mode  # Events are tagged with the world they happened in
         keys = pygame.key.get_pressed()
                 # Check if 10 seconds have passed since the last log
             # Check if it's Saturday
@@ -661,21 +729,16 @@ class Game:
             self.send_seeds()
 
         current_time = pygame.time.get_ticks()
-        if current_time - self.last_log_time >= 5000:  # 1 seconds = 5000 ms
+        if current_time - self.last_log_time >= 5000:  # Flush the position trace every 5 seconds
             self.log_bunny_position()
             self.last_log_time = current_time  # Update the time of the last log
 
         
-        # Determine current world based on mode
-        if self.bunny.mode == 'maze':
-            world = self.maze
-        elif self.bunny.mode == 'farm':
-            world = self.farm
-        else:  # dungeon mode
-            world = self.dungeon
+        world = self.current_world()
 
         # Handle movement
         moving = self.bunny.move(keys, world)
+        self.trace.record(self.bunny.x, self.bunny.y, self.bunny.mode, time.time())
         self.bunny.update_animation(moving)
         self.bunny.update_action()
         self.check_sleep_trigger()
@@ -688,7 +751,7 @@ class Game:
                 world.update()
         
         # Update portals
-        for portal in self.farm.interactables:
+        for portal in self.farm.entities.of_kind('portal'):
             if isinstance(portal, Portal):
                 portal.update()
     
@@ -700,24 +763,8 @@ class Game:
             self.bunny.throw_carrot()
         
         if self.bunny.mode == 'dungeon':
-            # Update projectiles
-            self.bunny.update_projectiles(self.dungeon.enemies, self.dungeon)
-            
-            # Check for collisions between projectiles and enemies
-            for proj in self.bunny.carrot_weapon['projectiles'][:]:
-                proj_rect = pygame.Rect(
-                    proj['x'] * Config.get('bun_size'),
-                    proj['y'] * Config.get('bun_size'),
-                    Config.get('bun_size') // 2,
-                    Config.get('bun_size') // 2
-                )
-                
-                for enemy in self.dungeon.enemies[:]:
-                    if proj_rect.colliderect(enemy.rect):
-                        enemy.take_damage(self.bunny.carrot_weapon['damage'])
-                        if proj in self.bunny.carrot_weapon['projectiles']:
-                            self.bunny.carrot_weapon['projectiles'].remove(proj)
-                        break
+            # Move projectiles and resolve hits in a single pass
+            self.bunny.update_projectiles(self.dungeon)
         # Update camera
         self.update_camera()
 
@@ -777,14 +824,7 @@ class Game:
         self.farm.regenerate_resources()
 
     def save_game(self):
-        """Save current user's game state into a shared JSON file for all users."""
-        try:
-            with open('Data/save_game.json', 'r') as f:
-                all_saves = json.load(f)
-        except FileNotFoundError:
-            all_saves = {}
-
-
+        """Save current user's game state into their own save file."""
         username = self.bunny.name
 
         user_save = {
@@ -809,89 +849,94 @@ class Game:
                 for x, tile in enumerate(row)
                 if tile.type == 'dirt' and (tile.dug or tile.plant)
             ],
-            "Inventory": self.bunny.inventory.items,
+            "Inventory": self.bunny.inventory.as_dict(),
+            "Mail": self.mailbox.mail_items,
             "Money": getattr(self.bunny, "money", 0),
             "Relationship": getattr(self.bunny, "relationships", {})
         }
 
-        all_saves[username] = user_save
-
-        with open('Data/save_game.json', 'w') as f:
-            json.dump(all_saves, f, indent=4)
+        try:
+            write_save(username, user_save)
+        except TimeoutError as e:  # Another copy of the game is holding the saves
+            print(f"Error saving game: {e}")
+            return
 
         print(f"Game saved for {username}")
     
     def load_game(self):
         """Load the user's saved game state."""
         try:
-            with open('Data/save_game.json', 'r') as f:
-                all_saves = json.load(f)
+            save_data = read_save(self.username)
+            if save_data is not None:
+                self.farm.calendar.current_date = save_data.get("Day", 1)
+
+                # Restore current_day from name
+                day_name = save_data.get("Date", "Mon")
+                if day_name in self.farm.calendar.days_of_week:
+                    self.farm.calendar.current_day = self.farm.calendar.days_of_week.index(day_name)
+
+                #  Restore current_season_index using saved name
+                season_name = save_data.get("Season", "Spring")
+                if season_name in self.farm.calendar.seasons:
+                    self.farm.calendar.current_season_index = self.farm.calendar.seasons.index(season_name)
+
+                # ✅ This one is safe
+                self.farm.calendar.current_year = save_data.get("Year", 1)
+
+                # Load bunny stats
+                self.bunny.health = 100
+
+                # Load inventory and mail; items the inventory has no room for wait in the mailbox
+                self.mailbox.mail_items = [tuple(mail) for mail in save_data.get("Mail", [])]
+                self.mailbox.has_mail = bool(self.mailbox.mail_items)
+                overflow = self.bunny.inventory.load_counts(save_data.get("Inventory", {}))
+                if overflow:
+                    self.mailbox.add_mail(overflow)
+                    self.bunny.inventory.show_notification("Inventory full, some items are waiting at the mailbox!", (255, 100, 0))
                 
-                if self.username in all_saves:
-                    save_data = all_saves[self.username]
-                    
-                    self.farm.calendar.current_date = save_data.get("Day", 1)
-
-                    # Restore current_day from name
-                    day_name = save_data.get("Date", "Mon")
-                    if day_name in self.farm.calendar.days_of_week:
-                        self.farm.calendar.current_day = self.farm.calendar.days_of_week.index(day_name)
-
-                    #  Restore current_season_index using saved name
-                    season_name = save_data.get("Season", "Spring")
-                    if season_name in self.farm.calendar.seasons:
-                        self.farm.calendar.current_season_index = self.farm.calendar.seasons.index(season_name)
-
-                    # ✅ This one is safe
-                    self.farm.calendar.current_year = save_data.get("Year", 1)
-
-                    # Load bunny stats
-                    self.bunny.health = 100
-    
-                    # Load inventory
-                    self.bunny.inventory.items = defaultdict(int, save_data.get("Inventory", {}))
-                    
-                    # Load crops
-                    for crop_data in save_data.get("CropStatus", []):
-                        x, y = crop_data["x"], crop_data["y"]
-                        if 0 <= x < self.farm.width and 0 <= y < self.farm.height:
-                            tile = self.farm.tiles[y][x]
-                            if crop_data["type"]:
-                                stages = []
-                                for i in range(1, Config.PLANT_CONFIG[crop_data["type"]]["stages"] + 1):
-                                    stage_img = Config.get('environ')[f'{crop_data["type"]}_stage{i}']
-                                    if stage_img:
-                                        stages.append(stage_img)
-                                
-                                if stages:
-                                    tile.plant = Plant(crop_data["type"], stages)
-                                    tile.plant.harvestable = crop_data.get("harvestable", False)
-                                    tile.watered = crop_data.get("watered", False)
-                            tile.dug = True
-                    
-                    print(f"Game loaded for {self.username}")
-                else:
-                    print(f"No save found for {self.username}, starting new game")
-                    
-        except FileNotFoundError:
-            print("No save file found, starting new game")
+                # Load crops
+                for crop_data in save_data.get("CropStatus", []):
+                    x, y = crop_data["x"], crop_data["y"]
+                    if 0 <= x < self.farm.width and 0 <= y < self.farm.height:
+                        tile = self.farm.tiles[y][x]
+                        if crop_data["type"]:
+                            stages = []
+                            for i in range(1, Config.PLANT_CONFIG[crop_data["type"]]["stages"] + 1):
+                                stage_img = Config.get('environ')[f'{crop_data["type"]}_stage{i}']
+                                if stage_img:
+                                    stages.append(stage_img)
+                            
+                            if stages:
+                                tile.plant = Plant(crop_data["type"], stages)
+                                tile.plant.harvestable = crop_data.get("harvestable", False)
+                                tile.watered = crop_data.get("watered", False)
+                        tile.dug = True
+                
+                print(f"Game loaded for {self.username}")
+            else:
+                print(f"No save found for {self.username}, starting new game")
         except Exception as e:
             print(f"Error loading game: {e}")
 
-    def log_bunny_position(self):
-        """Log bunny's (x, y) position to a CSV file."""
-        with open('Data/bunny_positions.csv', mode='a', newline='') as file:
-            writer = csv.writer(file)
-            writer.writerow([round(self.bunny.x), round(self.bunny.y)])
+    def log_bunny_position(self, final=False):
+        """Log the tiles the bunny has stayed on since the last call, from its per-tick trace"""
+        for row in self.trace.flush(final):
+            telemetry.write('Data/bunny_trace.csv', row, header=TRACE_HEADER, table='traces')
 
     def end_game(self):
         """End the game and show statistics"""
         print("Game ended. Opening StatsApp...")
+        self.world_pool.stop()
+        self.log_bunny_position(final=True)
+        telemetry.close()  # The stats app reads the logs, so write everything out first
         pygame.quit()
         
         # Launch stats app as separate process
         stats_script = os.path.join(os.path.dirname(__file__), 'stattk.py')
-        subprocess.Popen([sys.executable, stats_script])
+        command = [sys.executable, stats_script]
+        if telemetry.db_path:
+            command += ['--db', telemetry.db_path, '--user', self.username]
+        subprocess.Popen(command)
         sys.exit(0)
 
     def start_stats_app(self):
@@ -915,7 +960,7 @@ class Game:
         if self.bunny.mode == 'maze':
             end_time = pygame.time.get_ticks()
             time_taken = (end_time - self.start_time) / 1000
-            self.log_to_csv(time_taken, False)  # Log as failure
+            self.log_to_csv(time_taken, False, self.maze)  # Log as failure
         
         # Create faint overlay
         faint_overlay = pygame.Surface(Config.get('window'), pygame.SRCALPHA)
@@ -944,6 +989,7 @@ class Game:
         self.bunny.mode = 'farm'
         self.bunny.x, self.bunny.y = 13, 14
         self.bunny.target_x, self.bunny.target_y = 13, 14
+        self.bunny.path = []
         self.bunny.health = 100
 
         # Advance to next day
@@ -953,35 +999,21 @@ class Game:
 
     def log_harvest(self, crop_type, amount):
         """Log harvested crops with week and season info"""
-        try:
-            file_path = 'Data/Crop.csv'
-            with open(file_path, mode='a', newline='') as f:
-                writer = csv.writer(f)
-                if f.tell() == 0:  # Write header if file is empty
-                    writer.writerow(["timestamp", "week", "season", "crop_type", "amount"])
-            
-                writer.writerow([
-                    self.farm.calendar.current_week,
-                    self.farm.calendar.current_season,
-                    crop_type, 
-                    amount
-                ])
-        except Exception as e:
-            print(f"Error logging harvest: {e}")
+        telemetry.write('Data/Crop.csv', [
+            self.farm.calendar.current_week,
+            self.farm.calendar.current_season,
+            crop_type,
+            amount
+        ], header=["Week", "Season", "Crop", "Amount"], table='harvests')
 
     def log_attack(self, success):
         """Log combat accuracy"""
-        try:
-            file_path = 'Data/combat_accuracy.csv'
-            with open(file_path, mode='a', newline='') as f:
-                writer = csv.writer(f)
-                if f.tell() == 0:  # Write header if file is empty
-                    writer.writerow(["timestamp", "success"])
-                
-                timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-                writer.writerow([int(success)])
-        except Exception as e:
-            print(f"Error logging attack: {e}")
+        telemetry.write('Data/combat_accuracy.csv', [int(success)], header=["Hit"], table='attacks')
+
+    def log_sale(self, crop, quantity, total):
+        """Log a crop sold at the mailbox"""
+        telemetry.write('Data/sales.csv', [crop, quantity, total], header=["Crop", "Quantity", "Total"],
+                        table='sales')
 
     def handle_teleport(self, portal):
         """Handle portal teleportation based on portal type"""
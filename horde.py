@@ -0,0 +1,155 @@
+import numpy as np
+import pygame
+
+from config import Config
+from walkmap import STEPS
+
+# Per-type stats, indexed by the type codes below (same numbers as Enemy)
+TYPES = ('normal', 'rare')
+SPEED = np.array([0.05, 0.03])
+HEALTH = np.array([100.0, 200.0])
+ATTACK_POWER = np.array([15, 25])
+SHIELD = np.array([0.0, 50.0])
+COLORS = ((150, 150, 150), (0, 0, 200))
+STEP_ARRAY = np.array(STEPS + ((0, 0),))  # Index -1 picks (0, 0): stay put
+
+
+class Horde:
+    """Normal and rare dungeon enemies stored as NumPy arrays instead of Enemy objects.
+
+    Behaves like a crowd of Enemy instances (waking near the bunny, chasing
+    along the dungeon flow field, wandering and turning at walls, contact
+    damage, shields) but every rule runs as a handful of whole-array
+    operations per tick, which keeps thousands of enemies affordable.
+    """
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.x = np.empty(0)
+        self.y = np.empty(0)
+        self.type = np.empty(0, dtype=np.int8)
+        self.health = np.empty(0)
+        self.shield = np.empty(0)
+        self.awake = np.empty(0, dtype=bool)
+        self.direction = np.empty(0, dtype=np.int8)  # Index into STEPS while wandering
+        self.timer = np.empty(0, dtype=np.int32)  # Frames until the next random turn
+
+    def __len__(self):
+        return len(self.x)
+
+    def spawn(self, positions, types):
+        """Add enemies at (x, y) tiles with the given type names"""
+        count = len(positions)
+        if count == 0:
+            return
+        codes = np.array([TYPES.index(t) for t in types], dtype=np.int8)
+        xs, ys = np.array(positions, dtype=float).T
+        self.x = np.concatenate([self.x, xs])
+        self.y = np.concatenate([self.y, ys])
+        self.type = np.concatenate([self.type, codes])
+        self.health = np.concatenate([self.health, HEALTH[codes]])
+        self.shield = np.concatenate([self.shield, SHIELD[codes]])
+        self.awake = np.concatenate([self.awake, np.zeros(count, dtype=bool)])
+        self.direction = np.concatenate([self.direction, self.rng.integers(4, size=count).astype(np.int8)])
+        self.timer = np.concatenate([self.timer, self.rng.integers(30, 121, size=count).astype(np.int32)])
+
+    def update(self, bunny, dungeon):
+        """Advance every enemy one frame; returns (x, y) of the enemies that died"""
+        if len(self) == 0:
+            return []
+        cells = dungeon.walkmap.cells
+        speed = SPEED[self.type]
+
+        # Wake up near the bunny if it can see them; enemies beyond the
+        # dungeon's activity range stay dormant
+        tile_x, tile_y = self.x.astype(np.intp), self.y.astype(np.intp)
+        distance_sq = (self.x - bunny.x) ** 2 + (self.y - bunny.y) ** 2
+        self.awake |= (distance_sq < dungeon.WAKE_RADIUS ** 2) & dungeon.visible[tile_y, tile_x]
+        active = distance_sq < dungeon.activity.far ** 2
+
+        # Chase along the flow field wherever it reaches
+        steps = np.full(len(self), -1, dtype=np.int8)
+        at_target = np.zeros(len(self), dtype=bool)
+        if dungeon.flow is not None:
+            steps = dungeon.flow[tile_y, tile_x]
+            target_x, target_y = dungeon.flow_origin
+            at_target = (tile_x == target_x) & (tile_y == target_y)
+        chasing = active & self.awake & ((steps >= 0) | at_target)
+        step = STEP_ARRAY[np.where(at_target, -1, steps)]
+        dx = tile_x + step[:, 0] - self.x
+        dy = tile_y + step[:, 1] - self.y
+        dist = np.hypot(dx, dy)
+        scale = np.where(dist > speed, speed / np.maximum(dist, 1e-9), 1.0)
+        self.x = np.where(chasing, self.x + dx * scale, self.x)
+        self.y = np.where(chasing, self.y + dy * scale, self.y)
+
+        # Everyone else wanders, picking a new direction when their timer runs out
+        wandering = active & ~chasing
+        self.timer[wandering] -= 1
+        turning = wandering & (self.timer <= 0)
+        count = int(turning.sum())
+        self.direction[turning] = self.rng.integers(4, size=count)
+        self.timer[turning] = self.rng.integers(30, 121, size=count)
+        heading = STEP_ARRAY[self.direction]
+        new_x = self.x + heading[:, 0] * speed
+        new_y = self.y + heading[:, 1] * speed
+        height, width = cells.shape
+        open_tile = cells[np.clip(new_y.astype(np.intp), 0, height - 1), np.clip(new_x.astype(np.intp), 0, width - 1)]
+        moving = wandering & open_tile
+        self.x = np.where(moving, new_x, self.x)
+        self.y = np.where(moving, new_y, self.y)
+        self.timer[wandering & ~open_tile] = 0  # Turn next frame
+
+        # Contact damage from every enemy overlapping the bunny
+        touching = self.overlapping(bunny.rect)
+        if touching.any():
+            bunny.take_damage(int(ATTACK_POWER[self.type[touching]].sum()))
+
+        return self.remove_dead()
+
+    def overlapping(self, rect):
+        """Bool mask of enemies whose tile-sized rect overlaps a pygame Rect"""
+        size = Config.get('bun_size')
+        left, top = self.x * size, self.y * size
+        return (left < rect.right) & (left + size > rect.left) & (top < rect.bottom) & (top + size > rect.top)
+
+    def hit_by(self, rect):
+        """Index of the first enemy overlapping rect, or None"""
+        hits = np.flatnonzero(self.overlapping(rect))
+        return int(hits[0]) if len(hits) else None
+
+    def take_damage(self, index, amount):
+        """Damage one enemy, shields soaking up hits first as with Enemy"""
+        if self.shield[index] > 0:
+            self.shield[index] -= amount
+        else:
+            self.health[index] -= amount
+
+    def remove_dead(self):
+        dead = self.health <= 0
+        if not dead.any():
+            return []
+        fallen = list(zip(self.x[dead].tolist(), self.y[dead].tolist()))
+        alive = ~dead
+        for name in ('x', 'y', 'type', 'health', 'shield', 'awake', 'direction', 'timer'):
+            setattr(self, name, getattr(self, name)[alive])
+        return fallen
+
+    def render(self, screen, camera_x, camera_y, visible_tiles=None):
+        """Draw the enemies inside the camera view, only on visible_tiles if given"""
+        size = Config.get('bun_size')
+        screen_x, screen_y = self.x * size - camera_x, self.y * size - camera_y
+        shown = ((screen_x > -size) & (screen_x < screen.get_width())
+                 & (screen_y > -size - 10) & (screen_y < screen.get_height()))
+        if visible_tiles is not None:
+            shown &= visible_tiles[self.y.astype(np.intp), self.x.astype(np.intp)]
+        visible = np.flatnonzero(shown)
+        for i in visible.tolist():
+            pos_x, pos_y = screen_x[i], screen_y[i]
+            enemy_type = self.type[i]
+            pygame.draw.rect(screen, COLORS[enemy_type], (pos_x, pos_y, size, size))
+            if self.shield[i] > 0:
+                pygame.draw.rect(screen, (0, 100, 255), (pos_x - 5, pos_y - 5, size + 10, size + 10), 2)
+            health_width = size * (self.health[i] / HEALTH[enemy_type])
+            pygame.draw.rect(screen, (255, 0, 0), (pos_x, pos_y - 10, size, 5))
+            pygame.draw.rect(screen, (0, 255, 0), (pos_x, pos_y - 10, health_width, 5))
@@ -0,0 +1,244 @@
+"""Rotation, compression and compaction for the append-only CSV logs.
+
+A live log such as Data/bunny_positions.csv is sealed once it grows past
+a size or age limit: it is gzipped into Data/segments/ and a fresh live
+file is started with the same header. Data/segments/manifest.json
+records each sealed segment with the range of rows it holds, numbered
+from the first row the log ever had.
+
+Old segments are compacted into a pre-aggregated summary (positions
+become a count per tile, hits a count per outcome, ...), so disk use and
+load time stay bounded however long the game has been installed. The
+telemetry writer rotates and compacts as it goes; with the game closed
+it can also be done by hand:
+
+    python logsegments.py --rotate --compact
+"""
+import argparse
+import csv
+import gzip
+import json
+import os
+import shutil
+import time
+
+SEGMENT_FOLDER = 'segments'
+MANIFEST_NAME = 'manifest.json'
+# Log -> (columns rows are grouped by, columns summed) when compacting.
+# Every group also keeps a count of the rows folded into it.
+COMPACTION = {
+    'bunny_positions.csv': (['x', 'y'], []),
+    'bunny_trace.csv': (['mode', 'x', 'y'], ['seconds']),
+    'combat_accuracy.csv': (['Hit'], []),
+    'inventory_usage.csv': (['item_name'], []),
+    'maze_log.csv': (['Success_status', 'Difficulty'], ['time_taken(s)']),
+    'dungeon_log.csv': (['Success_status'], ['time_taken(s)']),
+}
+
+
+def segment_folder(path):
+    return os.path.join(os.path.dirname(path), SEGMENT_FOLDER)
+
+
+def load_manifest(folder):
+    try:
+        with open(os.path.join(folder, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_manifest(folder, manifest):
+    """Replace the manifest in one step, so a crash never leaves half of it"""
+    os.makedirs(folder, exist_ok=True)
+    temp = os.path.join(folder, MANIFEST_NAME + '.tmp')
+    with open(temp, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(temp, os.path.join(folder, MANIFEST_NAME))
+
+
+def log_entry(manifest, path):
+    return manifest.setdefault(os.path.basename(path), {
+        'started': time.time(),  # When the live file began, for the age limit
+        'rows': 0,  # Rows sealed so far, i.e. the number of the live file's first row
+        'next': 1,  # Number of the next segment file
+        'segments': [],
+        'summary': None,
+    })
+
+
+def seal(path, manifest):
+    """Gzip the live log into a new segment and start it afresh; returns the segment entry or None"""
+    folder = segment_folder(path)
+    entry = log_entry(manifest, path)
+    with open(path, newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        rows = sum(1 for row in reader if row)
+    if not rows:
+        entry['started'] = time.time()
+        return None
+
+    os.makedirs(folder, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    name = f"{stem}.{entry['next']:04d}.csv.gz"
+    sealing = os.path.join(folder, name[:-3])
+    os.replace(path, sealing)
+    with open(path, 'w', newline='') as f:
+        csv.writer(f).writerow(header)
+    with open(sealing, 'rb') as source, gzip.open(os.path.join(folder, name), 'wb') as target:
+        shutil.copyfileobj(source, target)
+    os.remove(sealing)
+
+    segment = {
+        'file': name,
+        'first_row': entry['rows'],
+        'last_row': entry['rows'] + rows - 1,
+        'bytes': os.path.getsize(os.path.join(folder, name)),
+        'sealed': time.time(),
+    }
+    entry['segments'].append(segment)
+    entry['rows'] += rows
+    entry['next'] += 1
+    entry['started'] = time.time()
+    save_manifest(folder, manifest)
+    return segment
+
+
+def compact(path, manifest, keep=0):
+    """Fold all but the newest ``keep`` sealed segments into the log's summary.
+
+    Returns the number of rows folded in. The new summary is written under
+    a new name and the manifest switched to it before anything is deleted,
+    so an interrupted compaction never counts a row twice.
+    """
+    name = os.path.basename(path)
+    if name not in COMPACTION:
+        return 0
+    entry = log_entry(manifest, path)
+    old = entry['segments'][:max(len(entry['segments']) - keep, 0)]
+    if not old:
+        return 0
+    folder = segment_folder(path)
+    keys, sums = COMPACTION[name]
+    groups = {}  # Key values -> [count, sum, ...]
+    if entry['summary']:
+        with open(os.path.join(folder, entry['summary']['file']), newline='') as f:
+            reader = csv.reader(f)
+            next(reader, None)
+            for row in reader:
+                groups[tuple(row[:len(keys)])] = [int(row[len(keys)])] + [float(v) for v in row[len(keys) + 1:]]
+
+    folded = 0
+    for segment in old:
+        with gzip.open(os.path.join(folder, segment['file']), 'rt', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            key_at = [header.index(k) if k in header else None for k in keys]
+            sum_at = [header.index(s) if s in header else None for s in sums]
+            for row in reader:
+                if not row:
+                    continue
+                key = tuple(row[i] if i is not None and i < len(row) else '' for i in key_at)
+                totals = groups.setdefault(key, [0] + [0.0] * len(sums))
+                totals[0] += 1
+                for n, i in enumerate(sum_at, 1):
+                    try:
+                        totals[n] += float(row[i])
+                    except (TypeError, ValueError, IndexError):
+                        pass  # Old rows with a missing or malformed value add nothing
+                folded += 1
+
+    stem = os.path.splitext(name)[0]
+    last_row = old[-1]['last_row']
+    summary_name = f"{stem}.summary.{last_row}.csv"
+    with open(os.path.join(folder, summary_name), 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(keys + ['count'] + sums)
+        for key, totals in groups.items():
+            writer.writerow(list(key) + [totals[0]] + [round(v, 4) for v in totals[1:]])
+
+    previous = entry['summary']
+    entry['summary'] = {'file': summary_name, 'last_row': last_row,
+                        'rows': (previous['rows'] if previous else 0) + folded}
+    entry['segments'] = entry['segments'][len(old):]
+    save_manifest(folder, manifest)
+    for stale in [s['file'] for s in old] + ([previous['file']] if previous else []):
+        try:
+            os.remove(os.path.join(folder, stale))
+        except FileNotFoundError:
+            pass
+    return folded
+
+
+class LogRotator:
+    """Seals live logs past ``max_bytes`` or ``max_age`` seconds, compacting beyond ``keep_segments``.
+
+    Meant to be called by the telemetry writer right after it appends to a
+    log, from its own thread, so no rows are added while a file is sealed.
+    The manifest is kept in memory between calls.
+    """
+
+    def __init__(self, max_bytes=256 * 1024, max_age=7 * 24 * 3600, keep_segments=4):
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.keep_segments = keep_segments
+        self.manifests = {}  # Segment folder -> its manifest
+
+    def manifest(self, path):
+        folder = segment_folder(path)
+        if folder not in self.manifests:
+            self.manifests[folder] = load_manifest(folder)
+        return self.manifests[folder]
+
+    def check(self, path):
+        """Rotate the log if it is due; returns the sealed segment entry or None"""
+        if os.path.basename(path) not in COMPACTION or not os.path.exists(path):
+            return None
+        manifest = self.manifest(path)
+        new = os.path.basename(path) not in manifest
+        entry = log_entry(manifest, path)
+        if new:
+            save_manifest(segment_folder(path), manifest)  # Remember when this log's age began
+        if os.path.getsize(path) < self.max_bytes and time.time() - entry['started'] < self.max_age:
+            return None
+        segment = seal(path, manifest)
+        if segment and len(entry['segments']) > self.keep_segments:
+            compact(path, manifest, keep=self.keep_segments)
+        return segment
+
+
+def segment_paths(path):
+    """Sealed, not yet compacted segments of a log, oldest first"""
+    folder = segment_folder(path)
+    entry = load_manifest(folder).get(os.path.basename(path))
+    return [os.path.join(folder, s['file']) for s in entry['segments']] if entry else []
+
+
+def summary_path(path):
+    """The log's compacted summary file, or None if nothing has been compacted"""
+    folder = segment_folder(path)
+    entry = load_manifest(folder).get(os.path.basename(path))
+    return os.path.join(folder, entry['summary']['file']) if entry and entry['summary'] else None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rotate and compact the telemetry logs")
+    parser.add_argument('--folder', default='Data', help="folder holding the CSV logs")
+    parser.add_argument('--rotate', action='store_true', help="seal every live log now")
+    parser.add_argument('--compact', action='store_true', help="fold sealed segments into the summaries")
+    parser.add_argument('--keep', type=int, default=0, help="newest segments to leave uncompacted")
+    args = parser.parse_args()
+
+    manifest = load_manifest(os.path.join(args.folder, SEGMENT_FOLDER))
+    for name in COMPACTION:
+        path = os.path.join(args.folder, name)
+        if args.rotate and os.path.exists(path):
+            segment = seal(path, manifest)
+            if segment:
+                print(f"{name}: sealed rows {segment['first_row']}-{segment['last_row']} into {segment['file']}")
+        if args.compact:
+            folded = compact(path, manifest, keep=args.keep)
+            if folded:
+                print(f"{name}: compacted {folded} rows")
+    save_manifest(os.path.join(args.folder, SEGMENT_FOLDER), manifest)
@@ -1,70 +1,124 @@
 import pygame
 import random
 import math
+import numpy as np
 import time  # For time tracking
 import csv  # For CSV logging
 from config import Config
 from bunny import Bunny
+from walkmap import WalkMap, distance_field
+from navgrid import NavGrid
+from registry import EntityRegistry
+from mazegen import carve_maze, add_loops
 
 
 class Maze:
     DIRECTIONS = [(0, -1), (1, 0), (0, 1), (-1, 0)]
+    tile_images = None  # (bush, dirt) tiles shared by every maze
 
-    def __init__(self, rows, cols):
+    def __init__(self, rows, cols, seed=None, grid=None):
         self.rows = rows
         self.cols = cols
-        self.grid = [[1 for _ in range(cols)] for _ in range(rows)]
-        self.generate_maze(1, 1)
-        self.add_loops(10)
-        self.interactables = []
-
-        # Load and scale images with convert_alpha()
-        self.bush_tile = pygame.image.load("assets/picture/bush_dun1.png").convert_alpha()
-        self.dirt_tile = pygame.image.load("assets/picture/dirt_dun.png").convert_alpha()
-        tile_size = Config.get('bun_size')
-        self.bush_tile = pygame.transform.scale(self.bush_tile, (tile_size, tile_size))
-        self.dirt_tile = pygame.transform.scale(self.dirt_tile, (tile_size, tile_size))
+        self.seed = seed
+        self.difficulty = None  # Catalogue tier, for mazes loaded from the catalogue
+        self.rng = np.random.default_rng(seed)
+        if grid is None:
+            self.grid = np.ones((rows, cols), dtype=np.uint8)  # 1 = wall, 0 = path
+            self.generate_maze()
+            self.add_loops(10)
+        else:
+            self.grid = grid
+        self.walkmap = WalkMap.from_array(self.grid == 0)
+        self.nav = NavGrid(self.walkmap)
+        self.entities = EntityRegistry()
+        # Path distances from the entrance, and to the exit once one is placed
+        self.entrance = (1, 1)
+        self.entrance_distance = self.walkmap.distance_field([self.entrance])
+        self.exit = None
+        self.exit_distance = None
+        self.load_tiles()
+
+    @property
+    def interactables(self):
+        """Snapshot of every entity in the maze"""
+        return list(self.entities)
+
+    def load_tiles(self):
+        # Load and scale images with convert_alpha() once; every maze shares them
+        if Maze.tile_images is None:
+            bush_tile = pygame.image.load("assets/picture/bush_dun1.png").convert_alpha()
+            dirt_tile = pygame.image.load("assets/picture/dirt_dun.png").convert_alpha()
+            tile_size = Config.get('bun_size')
+            Maze.tile_images = (pygame.transform.scale(bush_tile, (tile_size, tile_size)),
+                                pygame.transform.scale(dirt_tile, (tile_size, tile_size)))
+        self.bush_tile, self.dirt_tile = Maze.tile_images
 
     def get_tile_type(self, x, y):
-        if self.grid[y][x] == 1:
+        if self.grid[y, x] == 1:
             return "stone"  # wall (optional, if you want)
         else:
             return "dirt"  # change this based on your tiles
 
-    def generate_maze(self, x, y):
-        self.grid[y][x] = 0
-        directions = self.DIRECTIONS.copy()
-        random.shuffle(directions)
-        for dx, dy in directions:
-            nx, ny = x + dx * 2, y + dy * 2
-            if 0 <= nx < self.cols and 0 <= ny < self.rows and self.grid[ny][nx] == 1:
-                self.grid[y + dy][x + dx] = 0
-                self.generate_maze(nx, ny)
+    def generate_maze(self):
+        """Carve a perfect maze into the grid (see mazegen.carve_maze)"""
+        carve_maze(self.grid, self.rng)
 
     def add_loops(self, num_loops):
-        for _ in range(num_loops):
-            x, y = random.randint(1, self.cols - 2), random.randint(1, self.rows - 2)
-            if self.grid[y][x] == 1:
-                self.grid[y][x] = 0
+        add_loops(self.grid, self.rng, num_loops)
 
     def get_random_exit(self, min_distance=20):
-        """Generate a random exit position on a walkable tile."""
-        while True:
-            x, y = random.randint(1, self.cols - 2), random.randint(1, self.rows - 2)
-            if self.grid[y][x] == 0:  # Ensure the exit is on a walkable tile
-                return x, y
+        """Pick a random exit at least min_distance steps from the entrance along the paths."""
+        candidates = np.argwhere(self.entrance_distance >= min_distance)
+        if len(candidates) == 0:  # Small maze: settle for the farthest tiles
+            candidates = np.argwhere(self.entrance_distance == self.entrance_distance.max())
+        y, x = candidates[self.rng.integers(len(candidates))]
+        self.set_exit(int(x), int(y))
+        return self.exit
+
+    def set_exit(self, x, y):
+        """Move the exit and precompute every tile's path distance to it"""
+        self.exit = (x, y)
+        self.exit_distance = self.walkmap.distance_field([self.exit])
+
+    def steps_to_exit(self, x, y):
+        """Path distance from (x, y) to the exit, or -1 if unknown or unreachable"""
+        if self.exit_distance is None or not (0 <= x < self.cols and 0 <= y < self.rows):
+            return -1
+        return int(self.exit_distance[y, x])
+
+    def next_step_to_exit(self, x, y):
+        """Direction (dx, dy) of the first step on a shortest path to the exit, or None"""
+        steps = self.steps_to_exit(x, y)
+        if steps <= 0:
+            return None
+        for dx, dy in self.DIRECTIONS:
+            if self.steps_to_exit(x + dx, y + dy) == steps - 1:
+                return dx, dy
+        return None
 
     def draw(self, screen, camera_x, camera_y):
-        for y in range(self.rows):
-            for x in range(self.cols):
-                tile_image = self.bush_tile if self.grid[y][x] == 1 else self.dirt_tile
-                screen.blit(tile_image, (x * Config.get('bun_size') - camera_x, y * Config.get('bun_size') - camera_y))
+        # Only blit the tiles inside the camera view so large mazes stay cheap to draw
+        tile_size = Config.get('bun_size')
+        first_x, first_y = max(0, int(camera_x // tile_size)), max(0, int(camera_y // tile_size))
+        last_x = min(self.cols, int((camera_x + screen.get_width()) // tile_size) + 1)
+        last_y = min(self.rows, int((camera_y + screen.get_height()) // tile_size) + 1)
+        for y in range(first_y, last_y):
+            row = self.grid[y]
+            for x in range(first_x, last_x):
+                tile_image = self.bush_tile if row[x] == 1 else self.dirt_tile
+                screen.blit(tile_image, (x * tile_size - camera_x, y * tile_size - camera_y))
 
     def is_walkable(self, x, y):
-        return 0 <= x < len(self.grid[0]) and 0 <= y < len(self.grid) and self.grid[y][x] == 0
+        return self.walkmap.is_walkable(x, y)
 
     def draw_compass(self,screen,bunny,exit):
-        dx, dy = exit[0] - int(bunny.x), exit[1] - int(bunny.y)
+        # Follow the precomputed distance field when it leads to this exit,
+        # otherwise fall back to pointing straight at it
+        step = self.next_step_to_exit(int(bunny.x), int(bunny.y)) if exit == self.exit else None
+        if step:
+            dx, dy = step
+        else:
+            dx, dy = exit[0] - int(bunny.x), exit[1] - int(bunny.y)
         if dx == 0 and dy == 0:
             angle = 0
         else:
@@ -79,3 +133,181 @@ class Maze:
         for obj in self.interactables:
             if hasattr(obj, "update"):
                 obj.update()
+
+
+class WindowWalkMap(WalkMap):
+    """WalkMap over the rows an EndlessMaze currently holds, addressed in maze coordinates."""
+
+    def __init__(self, width, height):
+        super().__init__(width, height)
+        self.top = 0  # Maze row stored in the first map row
+
+    def is_walkable(self, x, y):
+        return super().is_walkable(x, y - self.top)
+
+
+class EndlessMaze(Maze):
+    """A maze that never ends, streamed downward one row of cells at a time.
+
+    Rows come from Eller's algorithm, which only needs the set labels of the
+    current row of cells to carry on, so the maze keeps O(width) generation
+    state plus a fixed window of rows around the bunny: rows are generated
+    ``ahead`` rows below it and dropped once they are ``behind`` rows above it.
+    """
+
+    def __init__(self, cols, bunny, seed=None, ahead=24, behind=16):
+        self.cols = cols
+        self.bunny = bunny  # Rows are streamed around this bunny
+        self.ahead = ahead
+        self.behind = behind
+        self.seed = seed
+        self.difficulty = None
+        self.rng = np.random.default_rng(seed)
+        self.entities = EntityRegistry()
+        self.exit = None
+        self.exit_row = None  # Bunny row the current exit was found from
+        self.exit_distance = None
+        self.exit_top = 0  # Maze row of the first exit_distance row
+
+        # Window of maze rows [top, bottom); anything outside it counts as wall
+        self.capacity = ahead + behind + 4
+        self.grid = np.ones((self.capacity, cols), dtype=np.uint8)
+        self.walkmap = WindowWalkMap(cols, self.capacity)
+        self.nav = NavGrid(self.walkmap)
+        self.top = 0
+        self.bottom = 1  # Maze row 0 is the solid top wall
+
+        # Eller's algorithm state: one set label per cell of the newest row of cells
+        self.cell_cols = cols // 2
+        self.sets = list(range(self.cell_cols))
+        self.next_set = self.cell_cols
+
+        self.stream_rows()
+        self.load_tiles()
+
+    @property
+    def rows(self):
+        return self.bottom
+
+    def get_tile_type(self, x, y):
+        if self.top <= y < self.bottom and self.grid[y - self.top, x] == 0:
+            return "dirt"
+        return "stone"
+
+    def generate_row(self):
+        """Run one step of Eller's algorithm, appending a row of cells and the wall row below it."""
+        cells = self.grid[self.bottom - self.top]
+        below = self.grid[self.bottom - self.top + 1]
+        cells[:] = 1
+        below[:] = 1
+        cells[1:2 * self.cell_cols:2] = 0
+
+        # Randomly join neighbouring cells that are not connected yet
+        sets = self.sets
+        joined = [False] * self.cell_cols
+        for i in range(self.cell_cols - 1):
+            if sets[i] != sets[i + 1] and self.rng.random() < 0.5:
+                cells[2 * i + 2] = 0
+                joined[i] = True
+                old = sets[i + 1]
+                sets[:] = [sets[i] if label == old else label for label in sets]
+
+        # Every horizontal run gets at least one passage down. That is stricter
+        # than Eller's one-per-set rule and means any cell can always reach the
+        # newest row without going back up through rows that were dropped.
+        next_sets = []
+        start = 0
+        for i in range(self.cell_cols):
+            if i < self.cell_cols - 1 and joined[i]:
+                continue
+            run = range(start, i + 1)
+            forced = run[int(self.rng.integers(len(run)))]
+            for j in run:
+                if j == forced or self.rng.random() < 0.3:
+                    below[2 * j + 1] = 0
+                    next_sets.append(sets[j])
+                else:
+                    next_sets.append(self.next_set)
+                    self.next_set += 1
+            start = i + 1
+        self.sets = next_sets
+        self.bottom += 2
+
+    def stream_rows(self):
+        """Generate rows ahead of the bunny and drop the ones far behind it."""
+        bunny_row = int(self.bunny.y)
+        bottom = self.bottom
+        dropped = False
+        while self.bottom < bunny_row + self.ahead:
+            if self.bottom + 2 - self.top > self.capacity:
+                # Drop as many rows as the bunny has left behind
+                count = min(bunny_row - self.behind, self.bottom) - self.top
+                if count <= 0:
+                    break
+                self.grid[:-count] = self.grid[count:]
+                self.grid[-count:] = 1
+                self.top += count
+                dropped = True
+            self.generate_row()
+        if self.bottom == bottom:
+            return  # Nothing generated or dropped this frame
+        # The window is rewritten without telling the listeners, so mark the nav grid by hand
+        if dropped:  # Every row moved up in the window
+            self.walkmap.cells[:] = self.grid == 0
+            self.walkmap.top = self.top
+            self.nav.invalidate()
+        else:  # Only the new rows changed
+            first, last = bottom - self.top, self.bottom - self.top
+            self.walkmap.cells[first:last] = self.grid[first:last] == 0
+            self.nav.invalidate_rows(first, last)
+        if dropped and self.exit is not None and self.exit_row < self.top:
+            # The path to the exit may have run through dropped rows
+            self.get_random_exit()
+        elif self.exit is not None and self.bottom != bottom:
+            self.set_exit(*self.exit)  # Cover the new rows in the distance field
+
+    def get_random_exit(self, min_distance=20):
+        """Place the exit on a cell the bunny can reach without leaving the window.
+
+        The search never climbs above the bunny's row, so the path to the exit
+        survives until the bunny moves ``behind`` rows further down.
+        """
+        start_x, start_y = int(self.bunny.x), int(self.bunny.y)
+        ahead = self.walkmap.cells.copy()
+        ahead[:max(0, start_y - self.top)] = False
+        distance = distance_field(ahead, [(start_x, start_y - self.top)])
+
+        candidates = np.argwhere(distance >= min_distance)
+        if len(candidates) == 0:
+            candidates = np.argwhere(distance == distance.max())
+        y, x = candidates[self.rng.integers(len(candidates))]
+        self.exit_row = start_y
+        self.set_exit(int(x), int(y) + self.top)
+        return self.exit
+
+    def set_exit(self, x, y):
+        self.exit = (x, y)
+        self.exit_distance = self.walkmap.distance_field([(x, y - self.top)])
+        self.exit_top = self.top
+
+    def steps_to_exit(self, x, y):
+        row = y - self.exit_top
+        if self.exit_distance is None or not (0 <= x < self.cols and 0 <= row < self.capacity):
+            return -1
+        return int(self.exit_distance[row, x])
+
+    def draw(self, screen, camera_x, camera_y):
+        tile_size = Config.get('bun_size')
+        first_x, first_y = max(0, int(camera_x // tile_size)), int(camera_y // tile_size)
+        last_x = min(self.cols, int((camera_x + screen.get_width()) // tile_size) + 1)
+        last_y = int((camera_y + screen.get_height()) // tile_size) + 1
+        for y in range(first_y, last_y):
+            in_window = self.top <= y < self.bottom
+            for x in range(first_x, last_x):
+                wall = not in_window or self.grid[y - self.top, x] == 1
+                tile_image = self.bush_tile if wall else self.dirt_tile
+                screen.blit(tile_image, (x * tile_size - camera_x, y * tile_size - camera_y))
+
+    def update(self):
+        self.stream_rows()
+        super().update()
@@ -0,0 +1,128 @@
+import argparse
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from mazegen import generate_grid
+from walkmap import distance_field
+
+
+def maze_metrics(grid, entrance=(1, 1)):
+    """Measure a maze grid in one sweep: a BFS from the entrance plus neighbour counts.
+
+    The exit is the tile farthest from the entrance, so ``solution_length``
+    is the longest shortest path the maze offers.
+    """
+    walkable = grid == 0
+    distance = distance_field(walkable, [entrance])
+    exit_y, exit_x = np.unravel_index(np.argmax(distance), distance.shape)
+
+    padded = np.pad(walkable, 1)
+    neighbours = (padded[:-2, 1:-1].astype(np.int8) + padded[2:, 1:-1]
+                  + padded[1:-1, :-2] + padded[1:-1, 2:])
+    dead_ends = int(np.count_nonzero(walkable & (neighbours == 1)))
+    junctions = walkable & (neighbours >= 3)
+    # Average number of new ways on offer at each fork
+    branching = float((neighbours[junctions] - 1).mean()) if junctions.any() else 1.0
+
+    solution_length = int(distance.max())
+    return {
+        'exit_x': int(exit_x),
+        'exit_y': int(exit_y),
+        'solution_length': solution_length,
+        'dead_ends': dead_ends,
+        'junctions': int(np.count_nonzero(junctions)),
+        'branching_factor': round(branching, 3),
+        # Long solutions and many dead ends to get lost in both make a maze harder
+        'difficulty': solution_length + dead_ends,
+    }
+
+
+def build_entry(job):
+    """Worker: generate one seeded maze, store it and return its index row"""
+    folder, seed, rows, cols = job
+    grid = generate_grid(rows, cols, seed)
+    entry = {'seed': seed, 'rows': rows, 'cols': cols}
+    entry.update(maze_metrics(grid))
+    MazeCatalog.save_grid(os.path.join(folder, f"maze_{seed}.npz"), grid)
+    return entry
+
+
+class MazeCatalog:
+    """Seeded mazes generated offline, indexed by difficulty and cached on disk.
+
+    Each maze is stored bit-packed in its own compressed ``.npz`` file and
+    described by a row in ``index.csv`` with its metrics and difficulty tier.
+    """
+    TIERS = ('easy', 'normal', 'hard')
+    FIELDS = ['seed', 'rows', 'cols', 'exit_x', 'exit_y', 'solution_length', 'dead_ends',
+              'junctions', 'branching_factor', 'difficulty', 'tier']
+
+    def __init__(self, folder='Data/maze_catalog'):
+        self.folder = folder
+        self.index_path = os.path.join(folder, 'index.csv')
+        self.entries = self.read_index()
+
+    def read_index(self):
+        try:
+            with open(self.index_path, newline='') as f:
+                return list(csv.DictReader(f))
+        except FileNotFoundError:
+            return []
+
+    def has_tier(self, tier):
+        return any(entry['tier'] == tier for entry in self.entries)
+
+    def build(self, count, rows, cols, first_seed=0, workers=None):
+        """Generate ``count`` seeded mazes in parallel and rewrite the index"""
+        os.makedirs(self.folder, exist_ok=True)
+        jobs = [(self.folder, seed, rows, cols) for seed in range(first_seed, first_seed + count)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            entries = list(pool.map(build_entry, jobs, chunksize=max(1, count // 32)))
+
+        # Split the catalogue into equal thirds by difficulty
+        ranked = sorted(entries, key=lambda entry: entry['difficulty'])
+        for rank, entry in enumerate(ranked):
+            entry['tier'] = self.TIERS[rank * len(self.TIERS) // len(ranked)]
+
+        with open(self.index_path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=self.FIELDS)
+            writer.writeheader()
+            writer.writerows(ranked)
+        self.entries = self.read_index()
+
+    def pick(self, tier, rng=None):
+        """Choose a random catalogue entry of the given tier with rng (a np.random.Generator), or None"""
+        matches = [entry for entry in self.entries if entry['tier'] == tier]
+        if not matches:
+            return None
+        rng = rng if rng is not None else np.random.default_rng()
+        return matches[int(rng.integers(len(matches)))]
+
+    def load(self, entry):
+        """Return (grid, exit) for a catalogue entry"""
+        with np.load(os.path.join(self.folder, f"maze_{entry['seed']}.npz")) as data:
+            rows, cols = (int(n) for n in data['shape'])
+            bits = np.unpackbits(data['walls'], count=rows * cols)
+        grid = bits.reshape(rows, cols).astype(np.uint8)
+        return grid, (int(entry['exit_x']), int(entry['exit_y']))
+
+    @staticmethod
+    def save_grid(path, grid):
+        np.savez_compressed(path, walls=np.packbits(grid.astype(bool)), shape=np.array(grid.shape))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-generate the maze catalogue")
+    parser.add_argument('--count', type=int, default=300)
+    parser.add_argument('--size', type=int, default=50)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    catalog = MazeCatalog()
+    catalog.build(args.count, args.size, args.size, workers=args.workers)
+    for tier in MazeCatalog.TIERS:
+        lengths = [int(entry['solution_length']) for entry in catalog.entries if entry['tier'] == tier]
+        print(f"{tier}: {len(lengths)} mazes, solution length {min(lengths)}-{max(lengths)}")
@@ -0,0 +1,98 @@
+import numpy as np
+
+# Maze carving only needs NumPy, so offline tools (and worker processes)
+# can generate grids without importing pygame.
+
+
+def new_seed():
+    """A fresh random seed, drawn from OS entropy, to generate and log a maze with.
+
+    Kept to 32 bits so it fits the telemetry database's INTEGER columns.
+    """
+    return int(np.random.SeedSequence().generate_state(1)[0])
+
+
+def generate_grid(rows, cols, seed=None, loops=10):
+    """Build the same grid Maze(rows, cols, seed) would: 1 = wall, 0 = path"""
+    rng = np.random.default_rng(seed)
+    grid = np.ones((rows, cols), dtype=np.uint8)
+    carve_maze(grid, rng)
+    add_loops(grid, rng, loops)
+    return grid
+
+
+def carve_maze(grid, rng):
+    """Carve a perfect maze into a grid of walls.
+
+    Cells sit on odd coordinates and the walls between them are knocked
+    down along a random spanning tree, built with Boruvka's algorithm so
+    every merge round is a handful of NumPy operations instead of a
+    recursive (and recursion-limited) depth-first walk.
+    """
+    rows, cols = grid.shape
+    cell_rows, cell_cols = rows // 2, cols // 2
+    if cell_rows == 0 or cell_cols == 0:
+        return
+    grid[1:2 * cell_rows:2, 1:2 * cell_cols:2] = 0
+
+    tree = spanning_tree(cell_rows, cell_cols, rng)
+    horizontal = cell_rows * (cell_cols - 1)
+    # Horizontal edges open the wall between (cx, cy) and (cx + 1, cy)
+    cy, cx = np.divmod(tree[tree < horizontal], max(cell_cols - 1, 1))
+    grid[2 * cy + 1, 2 * cx + 2] = 0
+    # Vertical edges open the wall between (cx, cy) and (cx, cy + 1)
+    cy, cx = np.divmod(tree[tree >= horizontal] - horizontal, cell_cols)
+    grid[2 * cy + 2, 2 * cx + 1] = 0
+
+
+def add_loops(grid, rng, num_loops):
+    """Knock out a few random walls so the maze has more than one route"""
+    rows, cols = grid.shape
+    for _ in range(num_loops):
+        x, y = int(rng.integers(1, cols - 1)), int(rng.integers(1, rows - 1))
+        if grid[y, x] == 1:
+            grid[y, x] = 0
+
+
+def spanning_tree(cell_rows, cell_cols, rng):
+    """Return the ids of the edges in a random spanning tree of a cell grid.
+
+    Horizontal edges are numbered first (row-major), then vertical ones.
+    """
+    ids = np.arange(cell_rows * cell_cols).reshape(cell_rows, cell_cols)
+    u = np.concatenate([ids[:, :-1].ravel(), ids[:-1, :].ravel()])
+    v = np.concatenate([ids[:, 1:].ravel(), ids[1:, :].ravel()])
+
+    # Edges are kept sorted by a random weight, so an edge's weight is just its position
+    edges = rng.permutation(len(u))
+    comp_u, comp_v = u[edges], v[edges]
+    components = cell_rows * cell_cols
+    chosen = []
+    while len(edges):
+        # Every component picks its cheapest edge leaving it
+        position = np.arange(len(edges))
+        best = np.full(components, len(edges))
+        np.minimum.at(best, comp_u, position)
+        np.minimum.at(best, comp_v, position)
+        chosen.append(edges[best])
+
+        # Hook each component onto its neighbour, breaking the 2-cycles two
+        # components form when they pick the same edge
+        label = np.arange(components)
+        parent = np.where(comp_u[best] == label, comp_v[best], comp_u[best])
+        mutual = (parent[parent] == label) & (label < parent)
+        parent[mutual] = label[mutual]
+        while True:
+            jumped = parent[parent]
+            if np.array_equal(jumped, parent):
+                break
+            parent = jumped
+
+        roots, label = np.unique(parent, return_inverse=True)
+        components = len(roots)
+        comp_u, comp_v = label[comp_u], label[comp_v]
+        external = comp_u != comp_v
+        edges, comp_u, comp_v = edges[external], comp_u[external], comp_v[external]
+    if not chosen:
+        return np.empty(0, dtype=np.int64)
+    return np.unique(np.concatenate(chosen))
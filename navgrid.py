@@ -0,0 +1,188 @@
+import heapq
+
+
+class NavGrid:
+    """A* pathfinding over a WalkMap, with connectivity kept up to date tile by tile.
+
+    The map is cut into square chunks, and each chunk labels the connected
+    pieces of walkable tiles inside it. Joining pieces that touch across
+    chunk borders gives the connected regions of the whole map, so a goal
+    the bunny cannot reach is rejected at once instead of flooding
+    everything reachable. A tile change (cutting a tree, mining a stone,
+    regrowth) only marks its own chunk dirty. Before the next query just
+    the dirty chunks and their borders are relabelled, and the regions are
+    rejoined from the cached border links. A* itself reads the walkmap's
+    bytes directly.
+
+    Coordinates are world tiles. Window maps with a ``top`` row offset,
+    like the endless maze's, are handled by shifting y.
+    """
+
+    def __init__(self, walkmap, chunk_size=8):
+        self.walkmap = walkmap
+        self.chunk_size = chunk_size
+        self.chunks_x = -(-walkmap.width // chunk_size)
+        self.chunks_y = -(-walkmap.height // chunk_size)
+        self.labels = [-1] * (walkmap.width * walkmap.height)  # Piece of each tile inside its chunk, -1 if blocked
+        self.piece_counts = [0] * (self.chunks_x * self.chunks_y)
+        self.links = {}  # (chunk, chunk right of or below it) -> set of touching (piece, piece) pairs
+        self.regions = None  # Region of each piece, as a list per chunk; None until rebuilt
+        self.dirty = set(range(len(self.piece_counts)))
+        walkmap.add_listener(self.on_tile_changed)
+
+    def on_tile_changed(self, x, y, walkable):
+        self.dirty.add((y // self.chunk_size) * self.chunks_x + x // self.chunk_size)
+
+    def invalidate(self):
+        """Mark the whole map dirty, for owners that rewrite ``walkmap.cells`` wholesale"""
+        self.dirty.update(range(len(self.piece_counts)))
+
+    def invalidate_rows(self, first, last):
+        """Mark the chunks covering walkmap rows [first, last) dirty, for owners that rewrite rows wholesale"""
+        for chunk_y in range(first // self.chunk_size, min(-(-last // self.chunk_size), self.chunks_y)):
+            self.dirty.update(range(chunk_y * self.chunks_x, (chunk_y + 1) * self.chunks_x))
+
+    def refresh(self):
+        """Relabel the dirty chunks and rejoin the regions, if anything changed"""
+        if not self.dirty:
+            return
+        for chunk in self.dirty:
+            self.label_chunk(chunk)
+        borders = set()
+        for chunk in self.dirty:
+            cx, cy = chunk % self.chunks_x, chunk // self.chunks_x
+            if cx > 0:
+                borders.add((chunk - 1, chunk, True))
+            if cx + 1 < self.chunks_x:
+                borders.add((chunk, chunk + 1, True))
+            if cy > 0:
+                borders.add((chunk - self.chunks_x, chunk, False))
+            if cy + 1 < self.chunks_y:
+                borders.add((chunk, chunk + self.chunks_x, False))
+        for first, second, side_by_side in borders:
+            self.link_border(first, second, side_by_side)
+        self.dirty.clear()
+        self.join_regions()
+
+    def label_chunk(self, chunk):
+        width, data, labels = self.walkmap.width, self.walkmap.data, self.labels
+        size = self.chunk_size
+        left, top = (chunk % self.chunks_x) * size, (chunk // self.chunks_x) * size
+        right, bottom = min(left + size, width), min(top + size, self.walkmap.height)
+        for y in range(top, bottom):
+            for x in range(left, right):
+                labels[y * width + x] = -1
+        pieces = 0
+        for y in range(top, bottom):
+            for x in range(left, right):
+                index = y * width + x
+                if not data[index] or labels[index] >= 0:
+                    continue
+                # Flood fill this piece without leaving the chunk
+                labels[index] = pieces
+                stack = [(x, y)]
+                while stack:
+                    cx, cy = stack.pop()
+                    for nx, ny in ((cx + 1, cy), (cx - 1, cy), (cx, cy + 1), (cx, cy - 1)):
+                        if left <= nx < right and top <= ny < bottom:
+                            neighbour = ny * width + nx
+                            if data[neighbour] and labels[neighbour] < 0:
+                                labels[neighbour] = pieces
+                                stack.append((nx, ny))
+                pieces += 1
+        self.piece_counts[chunk] = pieces
+
+    def link_border(self, first, second, side_by_side):
+        """Record which pieces of two neighbouring chunks touch across their shared border"""
+        width, height, labels = self.walkmap.width, self.walkmap.height, self.labels
+        size = self.chunk_size
+        left, top = (second % self.chunks_x) * size, (second // self.chunks_x) * size
+        if side_by_side:  # Walk down the column pair at the border
+            pairs = [(y * width + left - 1, y * width + left) for y in range(top, min(top + size, height))]
+        else:  # One above the other: walk along the row pair at the border
+            pairs = [((top - 1) * width + x, top * width + x) for x in range(left, min(left + size, width))]
+        self.links[first, second] = {(labels[a], labels[b]) for a, b in pairs
+                                     if labels[a] >= 0 and labels[b] >= 0}
+
+    def join_regions(self):
+        """Union the pieces of neighbouring chunks along the recorded border links"""
+        first = [0] * len(self.piece_counts)  # Index of each chunk's first piece
+        total = 0
+        for chunk, count in enumerate(self.piece_counts):
+            first[chunk] = total
+            total += count
+        parent = list(range(total))
+
+        def find(piece):
+            while parent[piece] != piece:
+                parent[piece] = parent[parent[piece]]
+                piece = parent[piece]
+            return piece
+
+        for (chunk_a, chunk_b), pairs in self.links.items():
+            for piece_a, piece_b in pairs:
+                root_a, root_b = find(first[chunk_a] + piece_a), find(first[chunk_b] + piece_b)
+                if root_a != root_b:
+                    parent[root_a] = root_b
+        self.regions = [[find(first[chunk] + piece) for piece in range(count)]
+                        for chunk, count in enumerate(self.piece_counts)]
+
+    def chunk_of(self, index):
+        width = self.walkmap.width
+        return (index // width // self.chunk_size) * self.chunks_x + (index % width) // self.chunk_size
+
+    def region(self, x, y):
+        """Connected region of a world tile, or None if it is blocked or off the map"""
+        y -= getattr(self.walkmap, 'top', 0)
+        if not (0 <= x < self.walkmap.width and 0 <= y < self.walkmap.height):
+            return None
+        self.refresh()
+        index = y * self.walkmap.width + x
+        label = self.labels[index]
+        return None if label < 0 else self.regions[self.chunk_of(index)][label]
+
+    def find_path(self, start, goal):
+        """Tiles to step through from start to goal (start excluded), or None if unreachable"""
+        if start == goal:
+            return []
+        goal_region = self.region(*goal)
+        if goal_region is None:
+            return None
+        start_region = self.region(*start)
+        if start_region is not None and start_region != goal_region:
+            return None
+
+        width, data = self.walkmap.width, self.walkmap.data
+        top = getattr(self.walkmap, 'top', 0)
+        start_index = (start[1] - top) * width + start[0]
+        goal_x, goal_y = goal[0], goal[1] - top
+        goal_index = goal_y * width + goal_x
+        cost = {start_index: 0}
+        came_from = {start_index: None}
+        # Ties on f go to the entry closest to the goal, which keeps open ground cheap
+        frontier = [(0, 0, 0, start_index)]
+        while frontier:
+            _, _, steps, index = heapq.heappop(frontier)
+            if index == goal_index:
+                break
+            if steps > cost[index]:
+                continue  # Superseded by a cheaper entry
+            x, y = index % width, index // width
+            next_cost = steps + 1
+            for neighbour, inside in ((index - width, y > 0), (index + 1, x + 1 < width),
+                                      (index + width, index + width < len(data)), (index - 1, x > 0)):
+                if inside and data[neighbour] and next_cost < cost.get(neighbour, next_cost + 1):
+                    cost[neighbour] = next_cost
+                    came_from[neighbour] = index
+                    remaining = abs(neighbour % width - goal_x) + abs(neighbour // width - goal_y)
+                    heapq.heappush(frontier, (next_cost + remaining, remaining, next_cost, neighbour))
+        if goal_index not in came_from:
+            return None
+
+        path = []
+        index = goal_index
+        while index != start_index:
+            path.append((index % width, index // width + top))
+            index = came_from[index]
+        path.reverse()
+        return path
@@ -0,0 +1,144 @@
+"""Per-tick position tracing for the bunny.
+
+Every frame's position and world mode goes into a fixed-size ring
+buffer, which costs a few array stores and never allocates. When the
+game flushes the trace (every few seconds), the raw samples are reduced
+to runs: one row per stay on a tile, with the time the bunny arrived and
+how many seconds it stayed. That keeps the heatmap and route analysis
+exact at tile resolution while writing a handful of rows instead of one
+per frame. An optional Douglas-Peucker pass then drops runs that lie on
+a straight line, for routes where dwell times matter less.
+"""
+import numpy as np
+
+TRACE_HEADER = ["time", "mode", "x", "y", "seconds"]
+
+
+def douglas_peucker(points, epsilon):
+    """Indices of the points to keep so no dropped point is over epsilon from the simplified line"""
+    points = np.asarray(points, dtype=float)
+    if len(points) < 3:
+        return list(range(len(points)))
+    keep = np.zeros(len(points), dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        start, end = points[first], points[last]
+        middle = points[first + 1:last]
+        line = end - start
+        length = np.hypot(*line)
+        if length == 0:  # A loop back to the same tile: measure from the start point
+            distances = np.hypot(*(middle - start).T)
+        else:
+            distances = np.abs(line[0] * (middle[:, 1] - start[1]) - line[1] * (middle[:, 0] - start[0])) / length
+        farthest = int(np.argmax(distances))
+        if distances[farthest] > epsilon:
+            split = first + 1 + farthest
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+    return [int(i) for i in np.flatnonzero(keep)]
+
+
+def simplify_runs(runs, epsilon):
+    """Douglas-Peucker over each same-mode stretch of runs; dropped runs' seconds go to the run kept before them"""
+    simplified = []
+    start = 0
+    while start < len(runs):
+        end = start
+        while end + 1 < len(runs) and runs[end + 1][1] == runs[start][1]:
+            end += 1
+        stretch = runs[start:end + 1]
+        kept = set(douglas_peucker([(run[2], run[3]) for run in stretch], epsilon))
+        for i, run in enumerate(stretch):
+            if i in kept:
+                simplified.append(list(run))
+            else:
+                simplified[-1][4] = round(simplified[-1][4] + run[4], 3)
+        start = end + 1
+    return simplified
+
+
+class PositionTrace:
+    """Ring buffer of per-tick positions, flushed as run-length rows per tile.
+
+    If more than ``capacity`` ticks pass between flushes, the oldest
+    samples are overwritten; ``overwritten`` counts how many were lost.
+    """
+
+    def __init__(self, capacity=4096, epsilon=0.0):
+        self.capacity = capacity
+        self.epsilon = epsilon
+        self.times = np.zeros(capacity, dtype=np.float64)
+        self.xs = np.zeros(capacity, dtype=np.int32)
+        self.ys = np.zeros(capacity, dtype=np.int32)
+        self.modes = np.zeros(capacity, dtype=np.int8)
+        self.mode_names = []  # Mode code -> name
+        self.mode_codes = {}
+        self.head = 0  # Next slot to write
+        self.size = 0  # Samples waiting to be flushed
+        self.overwritten = 0
+        self.open_run = None  # Last run of the previous flush, which may still be growing
+        self.last_time = None  # Time of the newest sample flushed, where the open run ends for now
+
+    def record(self, x, y, mode, when):
+        """Add one tick's position; x and y are rounded to the tile"""
+        code = self.mode_codes.get(mode)
+        if code is None:
+            code = self.mode_codes[mode] = len(self.mode_names)
+            self.mode_names.append(mode)
+        i = self.head
+        self.times[i] = when
+        self.xs[i] = round(x)
+        self.ys[i] = round(y)
+        self.modes[i] = code
+        self.head = (i + 1) % self.capacity
+        if self.size == self.capacity:
+            self.overwritten += 1
+        else:
+            self.size += 1
+
+    def drain(self):
+        """The waiting samples as (times, xs, ys, modes) arrays, oldest first, emptying the buffer"""
+        order = (np.arange(self.size) + self.head - self.size) % self.capacity
+        self.size = 0
+        return self.times[order], self.xs[order], self.ys[order], self.modes[order]
+
+    def flush(self, final=False):
+        """Rows of [time, mode, x, y, seconds] for every run finished since the last flush.
+
+        The latest run is held back, since the bunny may still be on that
+        tile, unless final is set (on quitting).
+        """
+        times, xs, ys, modes = self.drain()
+        runs = []
+        if len(times):
+            changed = np.ones(len(times), dtype=bool)
+            changed[1:] = (xs[1:] != xs[:-1]) | (ys[1:] != ys[:-1]) | (modes[1:] != modes[:-1])
+            starts = np.flatnonzero(changed)
+            runs = [[float(times[i]), self.mode_names[modes[i]], int(xs[i]), int(ys[i])] for i in starts]
+            if self.open_run and self.open_run[1:] == runs[0][1:]:
+                runs[0][0] = self.open_run[0]  # Still on the same tile as at the last flush
+            elif self.open_run:
+                runs.insert(0, self.open_run)
+            self.last_time = float(times[-1])
+        elif self.open_run:
+            runs = [self.open_run]
+        else:
+            return []
+
+        # Each run lasts until the next one starts
+        rows = [run + [round(after[0] - run[0], 3)] for run, after in zip(runs, runs[1:])]
+        self.open_run = None
+        if final:
+            rows.append(runs[-1] + [round(self.last_time - runs[-1][0], 3)])
+        else:
+            self.open_run = runs[-1]
+        for row in rows:
+            row[0] = round(row[0], 3)
+        if self.epsilon > 0:
+            rows = simplify_runs(rows, self.epsilon)
+        return rows
@@ -0,0 +1,182 @@
+import numpy as np
+
+PROJECTILE_SIZE = 0.5  # Projectile box edge, in tiles
+ENEMY_SIZE = 1.0  # Enemy box edge, in tiles (every enemy rect is one tile)
+
+
+class Projectiles:
+    """Every projectile in flight, stored as parallel NumPy arrays.
+
+    Positions are the top-left of each projectile's box in tile units, as
+    the old projectile dicts had them. Each update sweeps every projectile
+    along its whole move, so nothing tunnels through walls or enemies
+    however fast it flies.
+    """
+
+    def __init__(self):
+        self.x = np.empty(0)
+        self.y = np.empty(0)
+        self.dx = np.empty(0)
+        self.dy = np.empty(0)
+        self.distance = np.empty(0)  # Tiles travelled so far
+
+    def __len__(self):
+        return len(self.x)
+
+    def add(self, x, y, dx, dy):
+        self.x = np.append(self.x, float(x))
+        self.y = np.append(self.y, float(y))
+        self.dx = np.append(self.dx, float(dx))
+        self.dy = np.append(self.dy, float(dy))
+        self.distance = np.append(self.distance, 0.0)
+
+    def positions(self):
+        return zip(self.x.tolist(), self.y.tolist())
+
+    def keep(self, mask):
+        for name in ('x', 'y', 'dx', 'dy', 'distance'):
+            setattr(self, name, getattr(self, name)[mask])
+
+    def update(self, walkable, enemy_x, enemy_y, max_range):
+        """Advance every projectile one step.
+
+        ``walkable`` is the world's 2D bool walkability array (anything
+        outside it counts as wall) and ``enemy_x``/``enemy_y`` the top-left
+        tiles of the enemy boxes. Projectiles stop at the first wall or
+        enemy on their path or once they have flown ``max_range`` tiles.
+        Returns the index of the enemy each hit landed on, one per hit.
+        """
+        if len(self) == 0:
+            return np.empty(0, dtype=np.intp)
+        speed = np.hypot(self.dx, self.dy)
+        # Fraction of this step's move left before the range runs out
+        t_end = np.clip((max_range - self.distance) / np.maximum(speed, 1e-9), 0.0, 1.0)
+
+        t_wall = wall_hits(walkable, self.x, self.y, self.dx, self.dy, t_end)
+        t_enemy, target = enemy_hits(self.x, self.y, self.dx, self.dy, t_end,
+                                     np.asarray(enemy_x, dtype=float), np.asarray(enemy_y, dtype=float))
+        hit_enemy = t_enemy <= np.minimum(t_wall, t_end)
+        stopped = hit_enemy | (t_wall <= t_end) | (t_end < 1.0)
+
+        self.x += self.dx * t_end
+        self.y += self.dy * t_end
+        self.distance += speed * t_end
+        hits = target[hit_enemy]
+        self.keep(~stopped)
+        return hits
+
+
+def wall_hits(walkable, x, y, dx, dy, t_end):
+    """Fraction of each move at which the path enters a wall tile (inf if never).
+
+    A vectorized DDA grid walk: each round moves every ray still in flight
+    across its next tile edge, so the number of rounds is the largest
+    number of tiles any single projectile crosses this step.
+    """
+    height, width = walkable.shape
+    count = len(x)
+    tile_x, tile_y = np.floor(x).astype(np.intp), np.floor(y).astype(np.intp)
+    step_x, step_y = np.sign(dx).astype(np.intp), np.sign(dy).astype(np.intp)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        delta_x = np.where(dx != 0, 1.0 / np.abs(dx), np.inf)
+        delta_y = np.where(dy != 0, 1.0 / np.abs(dy), np.inf)
+        next_x = np.where(dx != 0, (tile_x + (step_x > 0) - x) / dx, np.inf)
+        next_y = np.where(dy != 0, (tile_y + (step_y > 0) - y) / dy, np.inf)
+
+    def blocked(tx, ty):
+        inside = (tx >= 0) & (tx < width) & (ty >= 0) & (ty < height)
+        open_tile = np.zeros(len(tx), dtype=bool)
+        open_tile[inside] = walkable[ty[inside], tx[inside]]
+        return ~open_tile
+
+    t_wall = np.full(count, np.inf)
+    t_wall[blocked(tile_x, tile_y)] = 0.0
+    active = np.isinf(t_wall)
+    while active.any():
+        across_x = next_x < next_y
+        t = np.where(across_x, next_x, next_y)
+        active &= t <= t_end
+        move_x, move_y = active & across_x, active & ~across_x
+        tile_x += np.where(move_x, step_x, 0)
+        tile_y += np.where(move_y, step_y, 0)
+        next_x = np.where(move_x, next_x + delta_x, next_x)
+        next_y = np.where(move_y, next_y + delta_y, next_y)
+        hit = active & blocked(tile_x, tile_y)
+        t_wall[hit] = t[hit]
+        active &= ~hit
+    return t_wall
+
+
+def enemy_hits(x, y, dx, dy, t_end, enemy_x, enemy_y):
+    """Earliest fraction of each move at which it touches an enemy box, and which enemy.
+
+    Broad phase: enemies are sorted by tile, and each projectile only looks
+    up the tiles its swept box could reach. Narrow phase: a slab test of the
+    move against each candidate box grown by the projectile's size.
+    """
+    count = len(x)
+    t_first = np.full(count, np.inf)
+    target = np.full(count, -1, dtype=np.intp)
+    if len(enemy_x) == 0:
+        return t_first, target
+
+    enemy_tile_x, enemy_tile_y = np.floor(enemy_x).astype(np.int64), np.floor(enemy_y).astype(np.int64)
+    low_x, low_y = enemy_tile_x.min(), enemy_tile_y.min()
+    stride = int(enemy_tile_x.max() - low_x) + 3
+    keys = (enemy_tile_y - low_y) * stride + (enemy_tile_x - low_x)
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+
+    # Tiles an enemy's top-left can sit in and still meet the swept projectile box
+    end_x, end_y = x + dx * t_end, y + dy * t_end
+    first_x = np.floor(np.minimum(x, end_x) - ENEMY_SIZE).astype(np.int64)
+    first_y = np.floor(np.minimum(y, end_y) - ENEMY_SIZE).astype(np.int64)
+    last_x = np.floor(np.maximum(x, end_x) + PROJECTILE_SIZE).astype(np.int64)
+    last_y = np.floor(np.maximum(y, end_y) + PROJECTILE_SIZE).astype(np.int64)
+
+    pair_proj, pair_enemy = [], []
+    projectile = np.arange(count)
+    for ox in range(int((last_x - first_x).max()) + 1):
+        for oy in range(int((last_y - first_y).max()) + 1):
+            cell_x, cell_y = first_x + ox, first_y + oy
+            valid = (cell_x <= last_x) & (cell_y <= last_y)
+            valid &= (cell_x >= low_x) & (cell_x < low_x + stride) & (cell_y >= low_y)
+            key = (cell_y[valid] - low_y) * stride + (cell_x[valid] - low_x)
+            start = np.searchsorted(sorted_keys, key, 'left')
+            found = np.searchsorted(sorted_keys, key, 'right') - start
+            total = int(found.sum())
+            if total == 0:
+                continue
+            # Expand each projectile's [start, start + found) run of sorted enemies
+            offsets = np.arange(total) - np.repeat(np.cumsum(found) - found, found)
+            pair_proj.append(np.repeat(projectile[valid], found))
+            pair_enemy.append(order[np.repeat(start, found) + offsets])
+    if not pair_proj:
+        return t_first, target
+    p, e = np.concatenate(pair_proj), np.concatenate(pair_enemy)
+
+    # Slab test: the move hits while the projectile's top-left is strictly
+    # inside the enemy box grown by the projectile size up and to the left
+    t_enter = np.zeros(len(p))
+    t_exit = t_end[p].copy()
+    for pos, vel, low in ((x[p], dx[p], enemy_x[e] - PROJECTILE_SIZE),
+                          (y[p], dy[p], enemy_y[e] - PROJECTILE_SIZE)):
+        high = low + PROJECTILE_SIZE + ENEMY_SIZE
+        moving = vel != 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t1, t2 = (low - pos) / vel, (high - pos) / vel
+        t_enter = np.where(moving, np.maximum(t_enter, np.minimum(t1, t2)), t_enter)
+        t_exit = np.where(moving, np.minimum(t_exit, np.maximum(t1, t2)), t_exit)
+        outside = ~moving & ((pos <= low) | (pos >= high))
+        t_exit[outside] = -1.0
+    touching = t_enter < t_exit
+
+    p, e, t_enter = p[touching], e[touching], t_enter[touching]
+    # Earliest hit per projectile: sort by time, keep each projectile's first pair
+    by_time = np.lexsort((t_enter, p))
+    p, e, t_enter = p[by_time], e[by_time], t_enter[by_time]
+    first = np.ones(len(p), dtype=bool)
+    first[1:] = p[1:] != p[:-1]
+    t_first[p[first]] = t_enter[first]
+    target[p[first]] = e[first]
+    return t_first, target
@@ -0,0 +1,76 @@
+from collections import namedtuple
+
+Handle = namedtuple('Handle', 'slot generation')
+
+
+class EntityRegistry:
+    """The entities of one world, stored densely per kind behind generational handles.
+
+    Every entity gets a Handle (also stored on it as ``entity.handle``).
+    Removing an entity swaps the last entity of its kind into the gap and
+    bumps its slot's generation, so add, remove and lookup are all O(1),
+    freed slots are reused, and a stale handle resolves to None instead of
+    to whatever took its slot. An entity belongs to one registry at a time.
+    """
+
+    def __init__(self):
+        self.generations = []  # Current generation of every slot
+        self.entries = []  # slot -> (kind, index in that kind's dense list), None when free
+        self.free_slots = []
+        self.dense = {}  # kind -> list of entities
+        self.dense_slots = {}  # kind -> slots, parallel to the dense list
+
+    def __len__(self):
+        return sum(len(entities) for entities in self.dense.values())
+
+    def __iter__(self):
+        """Every entity, kind by kind"""
+        for entities in list(self.dense.values()):
+            yield from list(entities)
+
+    def add(self, entity, kind):
+        if self.free_slots:
+            slot = self.free_slots.pop()
+        else:
+            slot = len(self.generations)
+            self.generations.append(0)
+            self.entries.append(None)
+        entities = self.dense.setdefault(kind, [])
+        self.entries[slot] = (kind, len(entities))
+        entities.append(entity)
+        self.dense_slots.setdefault(kind, []).append(slot)
+        entity.handle = Handle(slot, self.generations[slot])
+        return entity.handle
+
+    def get(self, handle):
+        """The entity a handle refers to, or None once it has been removed"""
+        slot, generation = handle
+        if slot >= len(self.entries) or self.generations[slot] != generation or self.entries[slot] is None:
+            return None
+        kind, index = self.entries[slot]
+        return self.dense[kind][index]
+
+    def contains(self, entity):
+        handle = getattr(entity, 'handle', None)
+        return handle is not None and self.get(handle) is entity
+
+    def remove(self, entity):
+        """Remove an entity; returns False if it was not registered here"""
+        if not self.contains(entity):
+            return False
+        slot = entity.handle.slot
+        kind, index = self.entries[slot]
+        entities, slots = self.dense[kind], self.dense_slots[kind]
+        last_entity, last_slot = entities.pop(), slots.pop()
+        if index < len(entities):
+            entities[index] = last_entity
+            slots[index] = last_slot
+            self.entries[last_slot] = (kind, index)
+        self.entries[slot] = None
+        self.generations[slot] += 1
+        self.free_slots.append(slot)
+        return True
+
+    def of_kind(self, kind):
+        """Dense list of one kind of entity; copy it before removing while iterating"""
+        return self.dense.get(kind, [])
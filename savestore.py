@@ -0,0 +1,140 @@
+"""One save file per player.
+
+Each player's save lives in Data/saves/<name>.json, so saving and loading
+only ever touch that player's data. Writes go to a temporary file that
+is then renamed over the save, so a crash or a full disk never leaves a
+half-written save behind, and one lock file for the saves folder keeps
+two running copies of the game from interleaving their writes. Saves
+from the old shared Data/save_game.json are copied out the first time
+any save is used; the shared file itself is left as it is.
+"""
+import json
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from urllib.parse import quote
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+SAVE_FOLDER = 'Data/saves'
+LEGACY_PATH = 'Data/save_game.json'
+LOCK_NAME = '.lock'
+MIGRATED_NAME = '.migrated'  # Written once the shared save has been copied out
+LOCK_TIMEOUT = 10.0  # Seconds to wait for another copy of the game to finish with the saves
+
+
+def save_path(username, folder=SAVE_FOLDER):
+    # Quote the name so any username makes a safe file name
+    return os.path.join(folder, quote(username, safe='') + '.json')
+
+
+def acquire(lock, timeout):
+    """Take an exclusive lock on an open file, polling with backoff; TimeoutError after timeout seconds"""
+    deadline = time.monotonic() + timeout
+    delay = 0.01
+    while True:
+        try:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                lock.seek(0)
+                msvcrt.locking(lock.fileno(), msvcrt.LK_NBLCK, 1)
+            return
+        except OSError:
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Timed out after {timeout}s waiting for {lock.name}")
+            time.sleep(delay)
+            delay = min(delay * 2, 0.5)
+
+
+@contextmanager
+def locked(folder=SAVE_FOLDER, timeout=LOCK_TIMEOUT):
+    """Hold the saves folder's exclusive lock for the duration of the block.
+
+    Saves are small and written rarely, so one lock for the whole folder
+    costs nothing and leaves a single lock file rather than one per player.
+    """
+    os.makedirs(folder, exist_ok=True)
+    with open(os.path.join(folder, LOCK_NAME), 'a+') as lock:
+        acquire(lock, timeout)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+            else:
+                lock.seek(0)
+                msvcrt.locking(lock.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def write_json(path, data):
+    """Write data to path through a temporary file renamed into place"""
+    folder = os.path.dirname(path) or '.'
+    descriptor, temp = tempfile.mkstemp(dir=folder, prefix='.save-', suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'w') as f:
+            json.dump(data, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp, path)
+    except BaseException:
+        if os.path.exists(temp):
+            os.remove(temp)
+        raise
+
+
+def migrate_legacy(folder=SAVE_FOLDER, legacy=LEGACY_PATH):
+    """Copy each player's save out of the shared save file, once.
+
+    Players who already have their own save keep it. The shared file is
+    left untouched; a marker in the saves folder records that the copy
+    ran. Returns the number of saves copied, or None if it had already run.
+    """
+    marker = os.path.join(folder, MIGRATED_NAME)
+    if os.path.exists(marker):
+        return None
+    with locked(folder):
+        if os.path.exists(marker):  # Another copy of the game migrated first
+            return None
+        migrated = 0
+        if os.path.exists(legacy):
+            with open(legacy) as f:
+                all_saves = json.load(f)
+            for username, save in all_saves.items():
+                path = save_path(username, folder)
+                if not os.path.exists(path):
+                    write_json(path, save)
+                    migrated += 1
+        write_json(marker, {'from': legacy, 'saves': migrated})
+    return migrated
+
+
+def save_exists(username):
+    migrate_legacy()
+    return os.path.exists(save_path(username))
+
+
+def read_save(username):
+    """The player's saved state, or None if they have no save.
+
+    Writes replace the whole file in one rename, so a read never sees half
+    a save; the lock also keeps it from reading while a save is in progress.
+    """
+    migrate_legacy()
+    path = save_path(username)
+    try:
+        with locked(), open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def write_save(username, data):
+    migrate_legacy()
+    with locked():
+        write_json(save_path(username), data)
@@ -0,0 +1,63 @@
+from collections import defaultdict
+
+
+class SpatialGrid:
+    """Uniform grid of buckets for finding the objects near a rect.
+
+    Objects are bucketed by the top-left corner of their ``rect`` (in pixels).
+    Anything up to ``cell_size`` pixels across can reach at most one bucket
+    up and to the left of the ones a query covers, so queries look one
+    bucket further in that direction and nothing is missed.
+    """
+
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.buckets = defaultdict(list)
+        self.cells = {}  # Object id -> bucket it sits in
+
+    def cell_of(self, x, y):
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def insert(self, obj):
+        cell = self.cell_of(*obj.rect.topleft)
+        self.buckets[cell].append(obj)
+        self.cells[id(obj)] = cell
+
+    def remove(self, obj):
+        cell = self.cells.pop(id(obj), None)
+        if cell is not None:
+            bucket = self.buckets[cell]
+            bucket.remove(obj)
+            if not bucket:
+                del self.buckets[cell]
+
+    def move(self, obj):
+        """Re-bucket an object after its rect moved; cheap when it stayed in its cell"""
+        cell = self.cell_of(*obj.rect.topleft)
+        if self.cells.get(id(obj)) != cell:
+            self.remove(obj)
+            self.insert(obj)
+
+    def clear(self):
+        self.buckets.clear()
+        self.cells.clear()
+
+    def query(self, rect):
+        """Objects whose bucket is near ``rect``; callers still do the exact test"""
+        return self.query_area(rect.left, rect.top, rect.right, rect.bottom)
+
+    def query_area(self, left, top, right, bottom):
+        """Objects whose bucket is near the pixel area between the given edges"""
+        first_x, first_y = self.cell_of(left, top)
+        last_x, last_y = self.cell_of(right, bottom)
+        found = []
+        for cy in range(first_y - 1, last_y + 1):
+            for cx in range(first_x - 1, last_x + 1):
+                bucket = self.buckets.get((cx, cy))
+                if bucket:
+                    found.extend(bucket)
+        return found
+
+    def colliding(self, rect):
+        """Objects whose rect overlaps ``rect``"""
+        return [obj for obj in self.query(rect) if rect.colliderect(obj.rect)]
@@ -0,0 +1,78 @@
+"""Bunny animation frames, sliced from the sprite sheets once per process.
+
+Every Bunny shares the same frame surfaces, so creating one (as each game
+reset does) costs nothing once the first has been made. The frames can
+also be pre-sliced into a single atlas image at asset-build time:
+
+    python spritecache.py
+
+Re-run it after editing the bunny sprite sheets, or delete the atlas to
+go back to slicing the sheets at start-up.
+"""
+import os
+import pygame
+from config import Config
+
+ATLAS_PATH = 'assets/picture/bunny_frames.png'
+SCALE = 2
+# Animation name -> (sprite sheet key in Config's bun_sheet, frame count), one atlas row each
+ANIMATIONS = {
+    "front": ("front_sheet", 5),
+    "back": ("back_sheet", 5),
+    "left": ("left_sheet", 8),
+    "right": ("right_sheet", 8),
+    "front_damage": ("front_damage_sheet", 5),
+    "back_damage": ("back_damage_sheet", 5),
+    "left_damage": ("left_damage_sheet", 8),
+    "right_damage": ("right_damage_sheet", 8),
+}
+
+_frames = {}  # Filled on first use, shared by every caller after that
+
+
+def bunny_frames():
+    """Animation name -> list of frame surfaces, built on first use.
+
+    The lists and surfaces are shared, so callers must not modify them.
+    """
+    if not _frames:
+        if os.path.exists(ATLAS_PATH):
+            _frames.update(load_atlas(ATLAS_PATH))
+        else:
+            _frames.update(slice_sheets())
+    return _frames
+
+
+def slice_sheets():
+    """Cut every animation frame out of the sprite sheets"""
+    sheets = Config.get("bun_sheet")
+    size = Config.get("bun_exact")
+    return {name: [sheets[sheet].get_image(i, size, size, SCALE, (0, 0, 0)) for i in range(count)]
+            for name, (sheet, count) in ANIMATIONS.items()}
+
+
+def load_atlas(path):
+    """Frames from a pre-sliced atlas, as views into the one loaded image"""
+    atlas = pygame.image.load(path).convert_alpha()
+    size = Config.get("bun_exact") * SCALE
+    return {name: [atlas.subsurface((i * size, row * size, size, size)) for i in range(count)]
+            for row, (name, (_, count)) in enumerate(ANIMATIONS.items())}
+
+
+def build_atlas(path=ATLAS_PATH):
+    """Slice the sheets and save the frames as one image, one row per animation"""
+    size = Config.get("bun_exact") * SCALE
+    frames = slice_sheets()
+    columns = max(count for _, count in ANIMATIONS.values())
+    # Blitting the colour-keyed frames onto a transparent surface turns the key into alpha
+    atlas = pygame.Surface((columns * size, len(ANIMATIONS) * size), pygame.SRCALPHA)
+    for row, name in enumerate(ANIMATIONS):
+        for i, frame in enumerate(frames[name]):
+            atlas.blit(frame, (i * size, row * size))
+    pygame.image.save(atlas, path)
+    return atlas
+
+
+if __name__ == "__main__":
+    build_atlas()
+    print(f"Saved {sum(count for _, count in ANIMATIONS.values())} bunny frames to {ATLAS_PATH}")
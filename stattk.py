@@ -1,3 +1,5 @@
+import argparse
+import os
 import tkinter as tk
 from tkinter import ttk
 import numpy as np
@@ -5,12 +7,61 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from logsegments import segment_paths, summary_path
+from positiontrace import TRACE_HEADER
+
+
+def read_events(table, csv_path, columns, db_path=None, username=None, session=None):
+    """Load one kind of telemetry as a DataFrame with the CSV log's column names.
+
+    With a telemetry database, only the given player's (and session's) rows
+    are fetched, through the table's indexes. Without one, the whole CSV
+    log is read across its sealed segments, as it holds every player's
+    rows untagged.
+    """
+    if db_path and os.path.exists(db_path):
+        from telemetrydb import TelemetryStore
+        store = TelemetryStore(db_path)
+        try:
+            _, rows = store.query(table, username=username, session=session)
+        finally:
+            store.close()
+        # Drop the context columns and rename the rest to match the CSV header
+        return pd.DataFrame([row[4:] for row in rows], columns=columns)
+    return read_log(csv_path)
+
+
+def read_log(path):
+    """Every row of a CSV log not yet compacted: its sealed segments, then the live file"""
+    frames = [pd.read_csv(segment) for segment in segment_paths(path)]
+    if os.path.exists(path):
+        frames.append(pd.read_csv(path))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def read_counts(path, keys, value=None):
+    """Row counts (or sums of value) of a CSV log per value of keys, including the rows already compacted"""
+    total = value or 'count'
+    log = read_log(path)
+    if log.empty:
+        counts = pd.DataFrame(columns=keys + [total])
+    elif value:
+        counts = log.groupby(keys)[value].sum().reset_index()
+    else:
+        counts = log.groupby(keys).size().reset_index(name='count')
+    summary = summary_path(path)
+    if summary:
+        counts = pd.concat([pd.read_csv(summary)[keys + [total]], counts], ignore_index=True)
+    return counts.groupby(keys)[total].sum().reset_index()
 
 
 class StatsApp(tk.Tk):
-    def __init__(self):
+    def __init__(self, db_path=None, username=None, session=None):
         super().__init__()  # Initialize the Tkinter window
-        self.title("Bunny is on farm Statistics")
+        self.db_path = db_path
+        self.username = username
+        self.session = session
+        self.title("Bunny is on farm Statistics" + (f" - {username}" if username else ""))
         self.geometry("1000x800")
 
         # Create main frame
@@ -56,10 +107,15 @@ class StatsApp(tk.Tk):
         # Create and display the movement graph
         try:
             # Read data
-            df = pd.read_csv("Data/bunny_positions.csv")
+            df = self.counts(self.traces, "Data/bunny_trace.csv", ['x', 'y'], 'seconds')
+            title = 'Player Movement Heatmap (seconds per tile)'
+            if df.empty:  # Logs from before the per-tick trace: one sample every 5 seconds
+                df = self.counts(self.positions, "Data/bunny_positions.csv", ['x', 'y'])
+                df = df.rename(columns={'count': 'seconds'})
+                title = 'Player Movement Heatmap every 5 seconds'
             
-            # Group by x and y coordinates to count occurrences
-            heatmap_data = df.groupby(['x', 'y']).size().unstack(fill_value=0)
+            # Sum the time spent on each x and y coordinate
+            heatmap_data = df.groupby(['x', 'y'])['seconds'].sum().unstack(fill_value=0)
             
             # Create figure and axis
             fig, ax = plt.subplots(figsize=(6, 4))
@@ -70,7 +126,7 @@ class StatsApp(tk.Tk):
             # Set titles and labels
             ax.set_xlabel('Map Grid (X)', fontsize=8)
             ax.set_ylabel('Map Grid (Y)', fontsize=8)
-            ax.set_title('Player Movement Heatmap every 5 seconds', fontsize=10)
+            ax.set_title(title, fontsize=10)
             
             # Set x and y axis ticks to show only every 5th number
             x_ticks = range(0, heatmap_data.shape[1], 5)  # Adjust this based on the number of columns in the data
@@ -136,7 +192,7 @@ class StatsApp(tk.Tk):
         self.clear_graph_frame()
         try:
             # Load data
-            df = pd.read_csv("Data/Crop.csv")
+            df = self.harvests()
             df["Amount"] = pd.to_numeric(df["Amount"], errors='coerce')
 
             # Group by Week, Season and Crop, then normalize to proportions
@@ -187,23 +243,31 @@ class StatsApp(tk.Tk):
         # Clear the previous graph
         self.clear_graph_frame()
 
-        positions = pd.read_csv("Data/bunny_positions.csv")
+        traces = self.traces()
+        if len(traces):
+            # Distance between consecutive tiles in the same world, over the time taken
+            steps = traces[['x', 'y']].diff()
+            same_world = traces['mode'].eq(traces['mode'].shift())
+            distance = np.hypot(steps['x'], steps['y'])[same_world].sum()
+            average_movement = distance / traces['seconds'].sum() * 5
+        else:
+            positions = self.positions()
 
-        # Ensure 'x' and 'y' columns are numeric
-        positions['x'] = pd.to_numeric(positions['x'], errors='coerce')
-        positions['y'] = pd.to_numeric(positions['y'], errors='coerce')
+            # Ensure 'x' and 'y' columns are numeric
+            positions['x'] = pd.to_numeric(positions['x'], errors='coerce')
+            positions['y'] = pd.to_numeric(positions['y'], errors='coerce')
 
-        # Drop rows with NaN values (in case there were any non-numeric values)
-        positions = positions.dropna()
+            # Drop rows with NaN values (in case there were any non-numeric values)
+            positions = positions.dropna()
 
-        # Get positions as a numpy array
-        positions_array = positions[['x', 'y']].values
+            # Get positions as a numpy array
+            positions_array = positions[['x', 'y']].values
 
-        # Calculate distances between consecutive positions
-        distances = np.linalg.norm(positions_array[1:] - positions_array[:-1], axis=1)
-        
-        # Calculate average movement
-        average_movement = np.mean(distances)
+            # Calculate distances between consecutive positions, sampled every 5 seconds
+            distances = np.linalg.norm(positions_array[1:] - positions_array[:-1], axis=1)
+
+            # Calculate average movement
+            average_movement = np.mean(distances)
 
         # === KDR (by type) ===
         enemy_df = pd.read_csv('Data/Enemy_difficulty.csv')
@@ -218,17 +282,21 @@ class StatsApp(tk.Tk):
         kdr_text = "\n".join([f"{etype}: {row['KDR']:.2f}" for etype, row in kdr_grouped.iterrows()])
 
         # === Crops Harvested (by type) ===
-        crop_summary = pd.read_csv('Data/Crop.csv').assign(Amount=lambda x: pd.to_numeric(x["Amount"], errors='coerce')).groupby("Crop")["Amount"].sum().to_dict()
+        crop_summary = self.harvests().assign(Amount=lambda x: pd.to_numeric(x["Amount"], errors='coerce')).groupby("Crop")["Amount"].sum().to_dict()
         crop_text = ",\n".join([f"{k}: {v}" for k, v in crop_summary.items()])
 
         # === Combat Accuracy ===
-        acc_text = pd.read_csv('Data/combat_accuracy.csv')["Hit"].agg(['mean', 'std']).mul(100).round(2).pipe(lambda x: f"Mean: {x['mean']:.2f}%, SD: {x['std']:.2f}%")
+        hits = self.counts(self.attacks, "Data/combat_accuracy.csv", ['Hit'])
+        shots = hits['count'].sum()
+        hit_mean = (hits['Hit'] * hits['count']).sum() / shots
+        hit_std = np.sqrt((hits['count'] * (hits['Hit'] - hit_mean) ** 2).sum() / (shots - 1))
+        acc_text = f"Mean: {hit_mean * 100:.2f}%, SD: {hit_std * 100:.2f}%"
 
         # === Data for Table ===
         data = {
                 "Feature": ["Player Movement", "Deaths vs Kills", "Crops Harvested", "Combat Accuracy"],
                 "Statistical Value": [
-                    f"Average movement: {average_movement:.2f} pixels",
+                    f"Average movement: {average_movement:.2f} tiles per 5 seconds",
                     f"KDR: {kdr_text}",
                     f"{crop_text}",
                     acc_text
@@ -247,6 +315,30 @@ class StatsApp(tk.Tk):
         plt.title("Game Feature Analysis Summary", fontsize=10, pad=15)
         self.display_plot(fig)
 
+    def positions(self):
+        return read_events('positions', "Data/bunny_positions.csv", ['x', 'y'],
+                           self.db_path, self.username, self.session)
+
+    def traces(self):
+        return read_events('traces', "Data/bunny_trace.csv", TRACE_HEADER,
+                           self.db_path, self.username, self.session)
+
+    def harvests(self):
+        return read_events('harvests', "Data/Crop.csv", ['Week', 'Season', 'Crop', 'Amount'],
+                           self.db_path, self.username, self.session)
+
+    def attacks(self):
+        return read_events('attacks', "Data/combat_accuracy.csv", ['Hit'],
+                           self.db_path, self.username, self.session)
+
+    def counts(self, events, csv_path, keys, value=None):
+        """Event counts (or sums of value) per value of keys, from the database or the segmented CSV log"""
+        if self.db_path and os.path.exists(self.db_path):
+            if value:
+                return events().groupby(keys)[value].sum().reset_index()
+            return events().groupby(keys).size().reset_index(name='count')
+        return read_counts(csv_path, keys, value)
+
     def clear_graph_frame(self):
         # Clear the graph frame before drawing new content
         for widget in self.graph_frame.winfo_children():
@@ -283,5 +375,10 @@ class StatsApp(tk.Tk):
 
 
 if __name__ == "__main__":
-    app = StatsApp()
+    parser = argparse.ArgumentParser(description="Show the game's statistics")
+    parser.add_argument('--db', help="telemetry database to read instead of the CSV logs")
+    parser.add_argument('--user', help="only show this player's events (needs --db)")
+    parser.add_argument('--session', help="only show this session's events (needs --db)")
+    args = parser.parse_args()
+    app = StatsApp(args.db, args.user, args.session)
     app.mainloop()
\ No newline at end of file
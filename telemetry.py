@@ -0,0 +1,151 @@
+import atexit
+import csv
+import os
+import queue
+import threading
+import time
+import uuid
+
+
+class TelemetryWriter:
+    """Appends rows to the CSV logs from a background thread.
+
+    ``write`` only puts the row on an in-memory queue, so the game loop
+    never waits on the disk. The writer thread groups queued rows by file
+    and appends each group with one open, whenever ``batch_size`` rows are
+    waiting or ``flush_interval`` seconds have passed since the first of
+    them. ``flush`` waits for everything queued so far to reach the disk;
+    ``close`` drains the queue and stops the thread, and runs at exit too.
+
+    When ``db_path`` is set, rows given a ``table`` also go to that SQLite
+    store (see telemetrydb), stamped with the player, session, world mode
+    and time they were queued at. Each batch is one transaction there.
+    A ``rotation`` policy (see logsegments) is checked for every file
+    right after rows are appended to it.
+    """
+
+    def __init__(self, batch_size=256, flush_interval=2.0, db_path=None):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.db_path = db_path
+        self.rotation = None
+        self.username = None
+        self.session = None
+        self.mode = None
+        self.queue = queue.SimpleQueue()
+        self.thread = None
+        self.lock = threading.Lock()  # Guards starting and stopping the thread
+
+    def start_session(self, username):
+        """Begin a new session for a player; later events are tagged with it"""
+        self.username = username
+        self.session = uuid.uuid4().hex
+        self.write(None, (), table='sessions')
+
+    def write(self, path, row, header=None, table=None):
+        """Queue a row for a CSV file and/or a database table.
+
+        The header is written first if the CSV file is empty. path may be
+        None for events only kept in the database.
+        """
+        if path is None and (table is None or self.db_path is None):
+            return
+        self.start()
+        event = None
+        if table is not None and self.db_path is not None:
+            event = (self.username, self.session, self.mode, time.time()) + tuple(row)
+        self.queue.put((path, list(row), header, table, event))
+
+    def start(self):
+        if self.thread is None:
+            with self.lock:
+                if self.thread is None:
+                    self.thread = threading.Thread(target=self.run, name='telemetry-writer', daemon=True)
+                    self.thread.start()
+
+    def flush(self, timeout=None):
+        """Block until every row queued before this call has been written"""
+        if self.thread is None:
+            return True
+        done = threading.Event()
+        self.queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout=5.0):
+        """Write out everything still queued and stop the writer thread"""
+        with self.lock:
+            thread, self.thread = self.thread, None
+        if thread is not None:
+            self.queue.put(None)
+            thread.join(timeout)
+
+    def run(self):
+        pending = {}  # path -> (header, rows) waiting to be written
+        events = {}  # table -> rows waiting to be inserted
+        waiting = 0
+        deadline = None
+        store = None
+        while True:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                item = ()  # Time threshold reached
+            if item is None or isinstance(item, threading.Event) or item == ():
+                self.write_pending(pending)
+                store = self.insert_events(store, events)
+                pending, events, waiting, deadline = {}, {}, 0, None
+                if item is None:
+                    if store is not None:
+                        store.close()
+                    return
+                if item:
+                    item.set()
+                continue
+
+            path, row, header, table, event = item
+            if path is not None:
+                pending.setdefault(path, (header, []))[1].append(row)
+            if event is not None:
+                events.setdefault(table, []).append(event)
+            waiting += 1
+            if deadline is None:
+                deadline = time.monotonic() + self.flush_interval
+            if waiting >= self.batch_size:
+                self.write_pending(pending)
+                store = self.insert_events(store, events)
+                pending, events, waiting, deadline = {}, {}, 0, None
+
+    def insert_events(self, store, events):
+        """Insert the queued events in one transaction; returns the store, opened on first use"""
+        if not events:
+            return store
+        try:
+            if store is None:
+                from telemetrydb import TelemetryStore  # Only needed once a database is configured
+                store = TelemetryStore(self.db_path)
+            store.insert(events)
+        except Exception as e:
+            print(f"Error writing telemetry to {self.db_path}: {e}")
+        return store
+
+    def write_pending(self, pending):
+        for path, (header, rows) in pending.items():
+            try:
+                folder = os.path.dirname(path)
+                if folder:
+                    os.makedirs(folder, exist_ok=True)
+                with open(path, mode='a', newline='') as f:
+                    writer = csv.writer(f)
+                    if header and f.tell() == 0:
+                        writer.writerow(header)
+                    writer.writerows(rows)
+                if self.rotation is not None:
+                    self.rotation.check(path)
+            except Exception as e:
+                print(f"Error writing telemetry to {path}: {e}")
+
+
+# One writer for the whole process, drained on exit
+telemetry = TelemetryWriter()
+atexit.register(telemetry.close)
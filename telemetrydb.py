@@ -0,0 +1,227 @@
+"""SQLite store for the game's telemetry, indexed by player, session, world mode and time.
+
+Each event type has its own table. Every row starts with the context
+columns (username, session, mode, time) followed by the event's own
+columns, in the same order as the matching CSV log row. The game writes
+here through the telemetry writer when Config's 'telemetry_db' is set.
+Logs recorded before that, sealed segments and compacted summaries
+included, can be imported with:
+
+    python telemetrydb.py --import-csv
+"""
+import argparse
+import csv
+import gzip
+import os
+import sqlite3
+from logsegments import COMPACTION, SEGMENT_FOLDER, load_manifest
+
+DEFAULT_PATH = 'Data/telemetry.db'
+CONTEXT_COLUMNS = (('username', 'TEXT'), ('session', 'TEXT'), ('mode', 'TEXT'), ('time', 'REAL'))
+# Table -> its own columns, in the order of the matching CSV row
+EVENT_COLUMNS = {
+    'sessions': (),  # One row per game started, nothing beyond the context
+    'positions': (('x', 'INTEGER'), ('y', 'INTEGER')),
+    # Runs of the per-tick trace; world is the run's own mode, which a flush may report after a warp
+    'traces': (('start', 'REAL'), ('world', 'TEXT'), ('x', 'INTEGER'), ('y', 'INTEGER'), ('seconds', 'REAL')),
+    'attacks': (('hit', 'INTEGER'),),
+    'item_uses': (('item', 'TEXT'),),
+    'harvests': (('week', 'INTEGER'), ('season', 'TEXT'), ('crop', 'TEXT'), ('amount', 'INTEGER')),
+    'maze_runs': (('time_taken', 'REAL'), ('result', 'TEXT'), ('seed', 'INTEGER'), ('difficulty', 'TEXT')),
+    'dungeon_runs': (('time_taken', 'REAL'), ('result', 'TEXT')),
+    'sales': (('crop', 'TEXT'), ('quantity', 'INTEGER'), ('total', 'INTEGER')),
+}
+# Table -> CSV log it replaces, for the importer
+CSV_SOURCES = {
+    'positions': 'bunny_positions.csv',
+    'traces': 'bunny_trace.csv',
+    'attacks': 'combat_accuracy.csv',
+    'item_uses': 'inventory_usage.csv',
+    'harvests': 'Crop.csv',
+    'maze_runs': 'maze_log.csv',
+    'dungeon_runs': 'dungeon_log.csv',
+    'sales': 'sales.csv',
+}
+# Full header of each log that can be compacted, for placing summary columns.
+# Older files may have fewer columns, but always in this order.
+CSV_HEADERS = {
+    'positions': ['x', 'y'],
+    'traces': ['time', 'mode', 'x', 'y', 'seconds'],
+    'attacks': ['Hit'],
+    'item_uses': ['item_name'],
+    'maze_runs': ['time_taken(s)', 'Success_status', 'Maze_seed', 'Difficulty'],
+    'dungeon_runs': ['time_taken(s)', 'Success_status'],
+}
+
+
+def expand_summary(path, header, imported):
+    """Rows rebuilt from a compaction summary, minus the ones already imported.
+
+    Each group is repeated count times with its sums averaged. imported
+    maps a group's key values to the [count, sum, ...] of its rows already
+    in the database. Columns the summary dropped are None.
+    """
+    keys, sums = COMPACTION[os.path.basename(path).split('.')[0] + '.csv']
+    with open(path, newline='') as f:
+        for group in csv.DictReader(f):
+            key = tuple(group[k] for k in keys)
+            done = imported.get(key, [0] + [0.0] * len(sums))
+            count = int(group['count']) - done[0]
+            if count <= 0:
+                continue
+            values = dict(zip(keys, key))
+            values.update((name, (float(group[name]) - done[n]) / count) for n, name in enumerate(sums, 1))
+            row = [values.get(column) for column in header]
+            for _ in range(count):
+                yield row
+
+
+def group_value(value):
+    """A stored value as the text the compaction summary keys it by"""
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+class TelemetryStore:
+    def __init__(self, path=DEFAULT_PATH):
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        # WAL lets the stats app read while the game is writing
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.create_tables()
+
+    def create_tables(self):
+        with self.connection:
+            for table, columns in EVENT_COLUMNS.items():
+                definition = ', '.join(f'{name} {kind}' for name, kind in CONTEXT_COLUMNS + columns)
+                self.connection.execute(f'CREATE TABLE IF NOT EXISTS {table} ({definition})')
+                for key in ('username', 'session', 'mode'):
+                    self.connection.execute(
+                        f'CREATE INDEX IF NOT EXISTS {table}_{key} ON {table} ({key}, time)')
+            self.connection.execute('CREATE TABLE IF NOT EXISTS imports (file TEXT PRIMARY KEY, rows INTEGER)')
+
+    def columns(self, table):
+        return [name for name, _ in CONTEXT_COLUMNS + EVENT_COLUMNS[table]]
+
+    def insert(self, batches):
+        """Insert {table: [row, ...]} in a single transaction; rows are context + event values"""
+        with self.connection:
+            for table, rows in batches.items():
+                placeholders = ', '.join('?' * len(self.columns(table)))
+                self.connection.executemany(f'INSERT INTO {table} VALUES ({placeholders})', rows)
+
+    def query(self, table, username=None, session=None, mode=None, since=None):
+        """(column names, rows) of a table, narrowed down through its indexes"""
+        conditions, values = [], []
+        for column, value in (('username', username), ('session', session), ('mode', mode)):
+            if value is not None:
+                conditions.append(f'{column} = ?')
+                values.append(value)
+        if since is not None:
+            conditions.append('time >= ?')
+            values.append(since)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ''
+        cursor = self.connection.execute(f'SELECT * FROM {table}{where} ORDER BY time', values)
+        return self.columns(table), cursor.fetchall()
+
+    def import_csvs(self, folder='Data'):
+        """Copy the CSV logs in, including their sealed segments and summaries; returns rows imported per table.
+
+        Old rows have no player, session or mode, so those columns stay NULL,
+        and their time is the modification time of the file they came from.
+        The imports table keeps how many rows of each log have been copied,
+        counted from the log's first row as numbered in the segment
+        manifest, so running the import again only adds rows written since.
+        """
+        manifest = load_manifest(os.path.join(folder, SEGMENT_FOLDER))
+        imported = {}
+        for table, filename in CSV_SOURCES.items():
+            path = os.path.join(folder, filename)
+            entry = manifest.get(filename) or {'rows': 0, 'segments': [], 'summary': None}
+            done_row = self.connection.execute('SELECT rows FROM imports WHERE file = ?', (path,)).fetchone()
+            done = done_row[0] if done_row else 0
+            width = len(EVENT_COLUMNS[table])
+            rows = []
+
+            def add(values, stamp):
+                rows.append((None, None, None, stamp) + tuple((list(values) + [None] * width)[:width]))
+
+            summary = entry['summary']
+            if summary and summary['last_row'] >= done:
+                # The summary also folds in any rows imported before it was compacted
+                summary_file = os.path.join(folder, SEGMENT_FOLDER, summary['file'])
+                for values in expand_summary(summary_file, CSV_HEADERS[table], self.imported_groups(table)):
+                    add(values, os.path.getmtime(summary_file))
+                done = summary['last_row'] + 1
+            for segment in entry['segments']:
+                if segment['last_row'] < done:
+                    continue
+                segment_file = os.path.join(folder, SEGMENT_FOLDER, segment['file'])
+                with gzip.open(segment_file, 'rt', newline='') as f:
+                    reader = csv.reader(f)
+                    next(reader, None)  # Header
+                    for number, values in enumerate((row for row in reader if row), segment['first_row']):
+                        if number >= done:
+                            add(values, os.path.getmtime(segment_file))
+                done = segment['last_row'] + 1
+            if os.path.exists(path):
+                with open(path, newline='') as f:
+                    reader = csv.reader(f)
+                    next(reader, None)  # Header
+                    for number, values in enumerate((row for row in reader if row), entry['rows']):
+                        if number >= done:
+                            add(values, os.path.getmtime(path))
+                            done = number + 1
+            if not rows and done_row and done == done_row[0]:
+                continue
+
+            with self.connection:
+                self.insert({table: rows})
+                self.connection.execute('INSERT OR REPLACE INTO imports VALUES (?, ?)', (path, done))
+            imported[table] = len(rows)
+        return imported
+
+    def imported_groups(self, table):
+        """Rows imported from a compactable log so far, as {key values: [count, sum, ...]} like its summary"""
+        keys, sums = COMPACTION[CSV_SOURCES[table]]
+        header = CSV_HEADERS[table]
+        names = [name for name, _ in EVENT_COLUMNS[table]]
+        key_columns = [names[header.index(k)] for k in keys]
+        sum_columns = [names[header.index(s)] for s in sums]
+        selected = ', '.join(key_columns + ['COUNT(*)'] + [f'TOTAL({c})' for c in sum_columns])
+        # Imported rows are the ones no session wrote
+        cursor = self.connection.execute(
+            f"SELECT {selected} FROM {table} WHERE session IS NULL GROUP BY {', '.join(key_columns)}")
+        groups = {}
+        for row in cursor:
+            key = tuple(group_value(v) for v in row[:len(keys)])
+            totals = groups.setdefault(key, [0] + [0.0] * len(sums))
+            for n, v in enumerate(row[len(keys):]):
+                totals[n] += v
+        return groups
+
+    def close(self):
+        self.connection.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the telemetry database")
+    parser.add_argument('--db', default=DEFAULT_PATH)
+    parser.add_argument('--import-csv', action='store_true', help="import the CSV logs recorded so far")
+    parser.add_argument('--folder', default='Data', help="folder holding the CSV logs")
+    args = parser.parse_args()
+
+    store = TelemetryStore(args.db)
+    if args.import_csv:
+        for table, count in store.import_csvs(args.folder).items():
+            print(f"{table}: imported {count} rows")
+    for table in EVENT_COLUMNS:
+        count = store.connection.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+        print(f"{table}: {count} rows")
+    store.close()
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from dungeongen import FLOOR, WALL, assign_roles, generate_layout, portal_tiles
+from walkmap import distance_field
+
+
+def layout_of(width, height, seed=0):
+    layout = np.full((height, width), WALL, dtype=np.uint8)
+    rooms = generate_layout(layout, np.random.default_rng(seed))
+    return layout, rooms
+
+
+def test_every_floor_tile_is_connected():
+    layout, rooms = layout_of(80, 60)
+    assert len(rooms) > 1
+    distance = distance_field(layout == FLOOR, [rooms[0].center])
+    assert (distance[layout == FLOOR] >= 0).all()
+
+
+def test_rooms_stay_inside_the_outer_wall():
+    layout, rooms = layout_of(60, 40, seed=3)
+    assert (layout[0] == WALL).all() and (layout[-1] == WALL).all()
+    assert (layout[:, 0] == WALL).all() and (layout[:, -1] == WALL).all()
+    for room in rooms:
+        assert (layout[room.y:room.y + room.h, room.x:room.x + room.w] == FLOOR).all()
+
+
+def test_same_seed_same_layout():
+    first, _ = layout_of(50, 50, seed=7)
+    second, _ = layout_of(50, 50, seed=7)
+    assert (first == second).all()
+
+
+@pytest.mark.parametrize('width, height', [(4, 4), (5, 9), (11, 11), (6, 4)])
+def test_map_too_small_to_split_is_one_room(width, height):
+    layout, rooms = layout_of(width, height)
+    assert len(rooms) == 1
+    room = rooms[0]
+    assert (room.x, room.y, room.w, room.h) == (1, 1, width - 2, height - 2)
+    assert (layout[1:-1, 1:-1] == FLOOR).all()
+
+
+def test_map_without_room_for_a_floor_is_refused():
+    with pytest.raises(ValueError):
+        layout_of(3, 10)
+
+
+def test_roles_put_the_exit_in_the_deepest_room():
+    _, rooms = layout_of(80, 60, seed=2)
+    entrance, exit_room = assign_roles(rooms, np.random.default_rng(2))
+    assert entrance.role == 'entrance' and exit_room.role == 'exit'
+    assert exit_room.depth == max(room.depth for room in rooms) > 0
+    assert portal_tiles(entrance, exit_room) == (entrance.center, exit_room.center)
+
+
+def test_single_room_gets_portals_in_opposite_corners():
+    _, rooms = layout_of(8, 8)
+    entrance, exit_room = assign_roles(rooms, np.random.default_rng(0))
+    assert entrance is exit_room
+    start, end = portal_tiles(entrance, exit_room)
+    assert start == (1, 1) and end == (6, 6)
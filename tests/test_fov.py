@@ -0,0 +1,35 @@
+import numpy as np
+
+from fov import field_of_view
+
+
+def test_open_floor_is_lit_within_the_radius():
+    opaque = np.zeros((21, 21), dtype=bool)
+    visible = field_of_view(opaque, 10, 10, 6)
+    ys, xs = np.mgrid[:21, :21]
+    inside = (xs - 10) ** 2 + (ys - 10) ** 2 < 36
+    assert (visible == inside).all()
+
+
+def test_a_wall_hides_what_is_behind_it_but_is_seen():
+    opaque = np.zeros((11, 11), dtype=bool)
+    opaque[:, 6] = True  # A wall from top to bottom
+    visible = field_of_view(opaque, 3, 5, 10)
+    assert visible[5, 6]
+    assert not visible[:, 7:].any()
+    assert visible[5, :6].all()
+
+
+def test_corridor_corner_blocks_the_view():
+    opaque = np.ones((7, 7), dtype=bool)
+    opaque[1, 1:6] = False  # Corridor along the top
+    opaque[1:6, 5] = False  # Turning down the right side
+    visible = field_of_view(opaque, 1, 1, 10)
+    assert visible[1, 1:6].all()
+    assert not visible[3:6, 5].any()
+
+
+def test_origin_outside_the_map_sees_nothing():
+    opaque = np.zeros((5, 5), dtype=bool)
+    assert not field_of_view(opaque, -1, 2, 5).any()
+    assert not field_of_view(opaque, 2, 5, 5).any()
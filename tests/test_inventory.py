@@ -0,0 +1,123 @@
+import random
+
+import pytest
+
+from bunny import Inventory, merge_amounts
+
+
+def check_consistent(inventory):
+    """The slot arrays, name index, free slots and total all agree"""
+    used = {slot for slot, name in enumerate(inventory.slot_names) if name is not None}
+    assert {inventory.slot_of[name]: name for name in inventory.slot_of} == \
+        {slot: inventory.slot_names[slot] for slot in used}
+    assert inventory.free_set == set(range(inventory.capacity)) - used
+    assert inventory.total == sum(inventory.slot_counts) <= inventory.capacity
+
+
+def test_new_items_fill_the_lowest_free_slot():
+    inventory = Inventory(10)
+    for name in ('carrot', 'stone', 'wood'):
+        inventory.set_count(name, 1)
+    inventory.set_count('carrot', 0)
+    inventory.set_count('stone', 0)
+    inventory.set_count('diamond', 2)
+    assert inventory.slot_of['diamond'] == 0
+    inventory.set_count('pickaxe', 1)
+    assert inventory.slot_of['pickaxe'] == 1
+    check_consistent(inventory)
+
+
+def test_set_count_refuses_to_go_over_capacity():
+    inventory = Inventory(5)
+    assert inventory.set_count('stone', 4)
+    assert not inventory.set_count('wood', 2)
+    assert 'wood' not in inventory and inventory.total == 4
+    assert inventory.set_count('stone', 5) and inventory.is_full()
+    check_consistent(inventory)
+
+
+def test_random_changes_match_a_plain_dict():
+    rng = random.Random(4)
+    inventory = Inventory(20)
+    expected = {}
+    names = ['carrot', 'stone', 'wood', 'diamond', 'pickaxe', 'carrot_seed', 'potato_seed']
+    for _ in range(5000):
+        if rng.random() < 0.1:
+            inventory.swap_slots(rng.randrange(20), rng.randrange(20))
+        else:
+            name, count = rng.choice(names), rng.randrange(0, 8)
+            others = sum(amount for other, amount in expected.items() if other != name)
+            assert inventory.set_count(name, count) == (others + count <= 20)
+            if others + count <= 20:
+                expected[name] = count
+                if not count:
+                    del expected[name]
+        assert inventory.as_dict() == expected
+    check_consistent(inventory)
+
+
+def test_load_counts_returns_what_does_not_fit():
+    inventory = Inventory(20)
+    inventory.full_view = True
+    leftover = inventory.load_counts({'carrot': 15, 'stone': 8, 'wood': 3})
+    assert inventory.as_dict() == {'carrot': 15, 'stone': 5}
+    assert leftover == [('stone', 3), ('wood', 3)]
+    assert inventory.full_view  # Loading replaces the items only
+    check_consistent(inventory)
+
+
+def test_clear_empties_every_slot():
+    inventory = Inventory(6)
+    inventory.set_count('stone', 3)
+    inventory.clear()
+    assert inventory.as_dict() == {} and inventory.total == 0
+    check_consistent(inventory)
+
+
+@pytest.mark.parametrize('empty_by', ['running out', 'moving'])
+def test_hotbar_position_is_cleared_when_its_slot_empties(empty_by):
+    inventory = Inventory(20)
+    for name in ('carrot', 'stone', 'wood', 'diamond', 'pickaxe', 'carrot_seed', 'potato_seed'):
+        inventory.set_count(name, 1)
+    assert inventory.hotbar_slots == [0, 1, 2, 3, 4, 5]
+    if empty_by == 'running out':
+        inventory.set_count('stone', 0)
+    else:
+        inventory.swap_slots(1, 10)
+    assert inventory.hotbar_slots[1] is None
+    inventory.hotbar_slots[1] = inventory.slot_of['potato_seed']
+    inventory.set_count('turnip_seed', 1)
+    assert inventory.hotbar_item(1) == 'potato_seed'
+
+
+def test_merge_amounts_adds_up_repeats_and_drops_non_positive():
+    assert merge_amounts([('stone', 2), ('wood', 0), ('stone', 3), ('carrot', -1)]) == {'stone': 5}
+    assert list(merge_amounts({'wood': 1, 'carrot': 2})) == ['wood', 'carrot']
+
+
+def test_add_items_hands_out_free_space_in_order():
+    inventory = Inventory(10)
+    inventory.set_count('stone', 4)
+    leftover = inventory.add_items([('wood', 3), ('carrot', 5), ('not_an_item', 2), ('wood', 1)])
+    assert inventory.as_dict() == {'stone': 4, 'wood': 4, 'carrot': 2}
+    assert sorted(leftover) == [('carrot', 3), ('not_an_item', 2)]
+
+
+def test_add_items_all_or_nothing():
+    inventory = Inventory(5)
+    leftover = inventory.add_items({'wood': 3, 'stone': 3}, all_or_nothing=True)
+    assert inventory.as_dict() == {} and sorted(leftover) == [('stone', 3), ('wood', 3)]
+    assert inventory.add_items({'wood': 3, 'stone': 2}, all_or_nothing=True) == []
+    assert inventory.is_full()
+
+
+def test_remove_items_is_all_or_nothing_by_default():
+    inventory = Inventory(20)
+    inventory.add_items({'wood': 3, 'stone': 2})
+    assert inventory.remove_items([('wood', 2), ('stone', 5)]) == [('wood', 2), ('stone', 5)]
+    assert inventory.as_dict() == {'wood': 3, 'stone': 2}
+    assert inventory.remove_items([('wood', 3), ('stone', 1)]) == []
+    assert inventory.as_dict() == {'stone': 1} and 'wood' not in inventory
+    assert inventory.remove_items({'stone': 4}, all_or_nothing=False) == [('stone', 3)]
+    assert inventory.total == 0
+    check_consistent(inventory)
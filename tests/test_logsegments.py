@@ -0,0 +1,91 @@
+import csv
+import gzip
+import os
+from collections import Counter
+
+from logsegments import LogRotator, compact, load_manifest, seal, segment_folder, segment_paths, summary_path
+
+
+def append(path, rows, header=('Hit',)):
+    new = not os.path.exists(path)
+    with open(path, 'a', newline='') as f:
+        writer = csv.writer(f)
+        if new:
+            writer.writerow(header)
+        writer.writerows(rows)
+
+
+def read_rows(path, opener=open):
+    with opener(path, 'rt', newline='') as f:
+        return list(csv.reader(f))
+
+
+def hit_counts(path):
+    """Rows per Hit value over the summary, the sealed segments and the live file"""
+    counts = Counter()
+    summary = summary_path(path)
+    if summary:
+        for row in read_rows(summary)[1:]:
+            counts[row[0]] += int(row[1])
+    for segment in segment_paths(path):
+        counts.update(row[0] for row in read_rows(segment, gzip.open)[1:])
+    counts.update(row[0] for row in read_rows(path)[1:])
+    return counts
+
+
+def test_seal_numbers_rows_and_restarts_the_live_file(tmp_path):
+    path = str(tmp_path / 'combat_accuracy.csv')
+    append(path, [[1], [0], [1]])
+    manifest = {}
+    first = seal(path, manifest)
+    append(path, [[0], [0]])
+    second = seal(path, manifest)
+    assert (first['first_row'], first['last_row']) == (0, 2)
+    assert (second['first_row'], second['last_row']) == (3, 4)
+    assert read_rows(path) == [['Hit']]
+    assert read_rows(segment_paths(path)[1], gzip.open) == [['Hit'], ['0'], ['0']]
+    assert seal(path, manifest) is None  # Nothing new to seal
+    assert load_manifest(segment_folder(path))['combat_accuracy.csv']['rows'] == 5
+
+
+def test_compaction_keeps_every_count_and_sum(tmp_path):
+    path = str(tmp_path / 'maze_log.csv')
+    header = ('time_taken(s)', 'Success_status', 'Maze_seed', 'Difficulty')
+    manifest = {}
+    append(path, [[10.5, 'win', 1, 'easy'], [20, 'lose', 2, 'hard']], header)
+    seal(path, manifest)
+    append(path, [[4.5, 'win', 3, 'easy']], header)
+    seal(path, manifest)
+    append(path, [[1, 'win', 4, 'hard']], header)
+    seal(path, manifest)
+
+    assert compact(path, manifest, keep=1) == 3
+    assert len(segment_paths(path)) == 1
+    summary = {tuple(row[:2]): (int(row[2]), float(row[3])) for row in read_rows(summary_path(path))[1:]}
+    assert summary == {('win', 'easy'): (2, 15.0), ('lose', 'hard'): (1, 20.0)}
+    # Folding into an existing summary adds to it, and old files are removed
+    assert compact(path, manifest) == 1
+    summary = {tuple(row[:2]): int(row[2]) for row in read_rows(summary_path(path))[1:]}
+    assert summary == {('win', 'easy'): 2, ('lose', 'hard'): 1, ('win', 'hard'): 1}
+    assert sorted(os.listdir(segment_folder(path))) == ['manifest.json', os.path.basename(summary_path(path))]
+
+
+def test_rotator_bounds_the_segments_without_losing_rows(tmp_path):
+    path = str(tmp_path / 'combat_accuracy.csv')
+    rotator = LogRotator(max_bytes=40, keep_segments=2)
+    written = Counter()
+    for batch in range(30):
+        rows = [[(batch + i) % 2] for i in range(batch % 5 + 1)]
+        append(path, rows)
+        written.update(str(row[0]) for row in rows)
+        rotator.check(path)
+        assert len(segment_paths(path)) <= 2
+    assert summary_path(path) is not None
+    assert hit_counts(path) == written
+
+
+def test_rotator_ignores_logs_it_cannot_compact(tmp_path):
+    path = str(tmp_path / 'Crop.csv')
+    append(path, [[1, 'Spring', 'carrot', 2]] * 50, ('Week', 'Season', 'Crop', 'Amount'))
+    assert LogRotator(max_bytes=1).check(path) is None
+    assert not os.path.exists(segment_folder(path))
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from mazecatalog import MazeCatalog, maze_metrics
+from mazegen import generate_grid, new_seed, spanning_tree
+from walkmap import distance_field
+
+
+def open_pairs(grid):
+    """Adjacent pairs of path tiles, i.e. edges of the maze graph"""
+    path = grid == 0
+    return int(np.count_nonzero(path[:, :-1] & path[:, 1:]) + np.count_nonzero(path[:-1] & path[1:]))
+
+
+@pytest.mark.parametrize('rows, cols', [(21, 21), (31, 17), (50, 50), (3, 3)])
+def test_perfect_maze_is_a_spanning_tree(rows, cols):
+    grid = generate_grid(rows, cols, seed=1, loops=0)
+    path = grid == 0
+    # Connected, and one edge fewer than tiles means no loops
+    assert (distance_field(path, [(1, 1)])[path] >= 0).all()
+    assert open_pairs(grid) == np.count_nonzero(path) - 1
+    assert (grid[0] == 1).all() and (grid[:, 0] == 1).all()
+
+
+def test_spanning_tree_has_one_edge_per_merge():
+    tree = spanning_tree(7, 9, np.random.default_rng(0))
+    assert len(tree) == 7 * 9 - 1 and len(np.unique(tree)) == len(tree)
+
+
+def test_seed_reproduces_the_grid():
+    seed = new_seed()
+    assert isinstance(seed, int) and 0 <= seed < 2 ** 32
+    assert (generate_grid(25, 25, seed) == generate_grid(25, 25, seed)).all()
+    assert not (generate_grid(25, 25, 1) == generate_grid(25, 25, 2)).all()
+
+
+def test_metrics_of_a_corridor():
+    grid = np.ones((3, 7), dtype=np.uint8)
+    grid[1, 1:6] = 0
+    metrics = maze_metrics(grid)
+    assert (metrics['exit_x'], metrics['exit_y']) == (5, 1)
+    assert metrics['solution_length'] == 4
+    assert metrics['dead_ends'] == 2
+    assert metrics['difficulty'] == 6
+
+
+def test_catalogue_round_trip_and_seeded_picks(tmp_path):
+    catalog = MazeCatalog(str(tmp_path))
+    catalog.build(6, 21, 21, workers=1)
+    assert sorted(entry['tier'] for entry in catalog.entries) == ['easy'] * 2 + ['hard'] * 2 + ['normal'] * 2
+    entry = catalog.pick('hard', np.random.default_rng(3))
+    assert entry == catalog.pick('hard', np.random.default_rng(3))
+    grid, exit_pos = catalog.load(entry)
+    assert (grid == generate_grid(21, 21, int(entry['seed']))).all()
+    assert exit_pos == (int(entry['exit_x']), int(entry['exit_y']))
+    assert catalog.pick('impossible') is None
@@ -0,0 +1,61 @@
+import pytest
+
+from positiontrace import PositionTrace, douglas_peucker, simplify_runs
+
+
+def record_path(trace, samples):
+    for when, (x, y, mode) in enumerate(samples):
+        trace.record(x, y, mode, float(when))
+
+
+def test_flush_turns_ticks_into_runs_per_tile():
+    trace = PositionTrace()
+    record_path(trace, [(1, 1, 'farm')] * 3 + [(2.4, 1, 'farm')] * 2 + [(2, 1, 'maze')])
+    # The latest run is held back while the bunny may still be on it
+    assert trace.flush() == [[0.0, 'farm', 1, 1, 3.0], [3.0, 'farm', 2, 1, 2.0]]
+    assert trace.flush(final=True) == [[5.0, 'maze', 2, 1, 0.0]]
+    assert trace.flush(final=True) == []
+
+
+def test_a_run_spanning_flushes_is_reported_once():
+    trace = PositionTrace()
+    record_path(trace, [(1, 1, 'farm')] * 4)
+    assert trace.flush() == []
+    trace.record(1, 1, 'farm', 4.0)
+    trace.record(3, 1, 'farm', 5.0)
+    assert trace.flush() == [[0.0, 'farm', 1, 1, 5.0]]
+    trace.record(3, 1, 'farm', 7.5)
+    assert trace.flush(final=True) == [[5.0, 'farm', 3, 1, 2.5]]
+
+
+def test_final_flush_without_new_samples_keeps_the_open_run_length():
+    trace = PositionTrace()
+    record_path(trace, [(1, 1, 'farm')] * 3)
+    trace.flush()
+    assert trace.flush(final=True) == [[0.0, 'farm', 1, 1, 2.0]]
+
+
+def test_ring_buffer_overwrites_the_oldest_samples():
+    trace = PositionTrace(capacity=4)
+    record_path(trace, [(x, 0, 'farm') for x in range(6)])
+    assert trace.overwritten == 2
+    rows = trace.flush(final=True)
+    assert [row[2] for row in rows] == [2, 3, 4, 5]
+
+
+def test_douglas_peucker_keeps_only_the_corners():
+    points = [(0, 0), (1, 0), (2, 0), (3, 0), (3, 1), (3, 2), (3, 3)]
+    assert douglas_peucker(points, 0.5) == [0, 3, 6]
+    assert douglas_peucker(points, 0) == [0, 3, 6]
+    assert douglas_peucker(points[:2], 1) == [0, 1]
+    # A loop back to the start is measured from the start point
+    assert douglas_peucker([(0, 0), (2, 0), (0, 0)], 1) == [0, 1, 2]
+
+
+@pytest.mark.parametrize('epsilon', [0.5, 2.0])
+def test_simplified_runs_keep_the_total_time_per_mode(epsilon):
+    runs = [[t, 'farm', t, 0, 1.0] for t in range(5)] + [[5, 'maze', 0, y, 2.0] for y in range(4)]
+    simplified = simplify_runs(runs, epsilon)
+    assert [run[2:4] for run in simplified if run[1] == 'farm'] == [[0, 0], [4, 0]]
+    for mode in ('farm', 'maze'):
+        assert sum(run[4] for run in simplified if run[1] == mode) == sum(run[4] for run in runs if run[1] == mode)
@@ -0,0 +1,51 @@
+from registry import EntityRegistry
+
+
+class Thing:
+    def __init__(self, name):
+        self.name = name
+
+
+def test_handles_resolve_until_removed():
+    registry = EntityRegistry()
+    a, b = Thing('a'), Thing('b')
+    handle = registry.add(a, 'enemy')
+    registry.add(b, 'loot')
+    assert registry.get(handle) is a and a.handle == handle
+    assert registry.remove(a)
+    assert registry.get(handle) is None
+    assert not registry.remove(a)
+    assert len(registry) == 1 and list(registry) == [b]
+
+
+def test_reused_slot_does_not_revive_a_stale_handle():
+    registry = EntityRegistry()
+    old = Thing('old')
+    stale = registry.add(old, 'enemy')
+    registry.remove(old)
+    new = Thing('new')
+    fresh = registry.add(new, 'enemy')
+    assert fresh.slot == stale.slot and fresh.generation == stale.generation + 1
+    assert registry.get(stale) is None and registry.get(fresh) is new
+    assert not registry.contains(old)
+
+
+def test_removal_keeps_the_dense_lists_packed():
+    registry = EntityRegistry()
+    things = [Thing(i) for i in range(6)]
+    handles = [registry.add(thing, 'enemy') for thing in things]
+    for thing in things[::2]:
+        registry.remove(thing)
+    assert sorted(t.name for t in registry.of_kind('enemy')) == [1, 3, 5]
+    for thing, handle in zip(things[1::2], handles[1::2]):
+        assert registry.get(handle) is thing
+    assert registry.of_kind('portal') == []
+
+
+def test_iterating_tolerates_removal():
+    registry = EntityRegistry()
+    for i in range(5):
+        registry.add(Thing(i), 'enemy')
+    for thing in registry:
+        registry.remove(thing)
+    assert len(registry) == 0
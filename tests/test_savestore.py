@@ -0,0 +1,81 @@
+import json
+import os
+import threading
+
+import pytest
+
+from savestore import (LEGACY_PATH, SAVE_FOLDER, locked, migrate_legacy, read_save, save_exists, save_path,
+                       write_json, write_save)
+
+
+@pytest.fixture
+def scratch(tmp_path, monkeypatch):
+    """Run in an empty folder, so Data/saves and Data/save_game.json are scratch files"""
+    monkeypatch.chdir(tmp_path)
+    os.makedirs('Data')
+
+
+def test_save_path_quotes_any_name(tmp_path):
+    assert os.path.basename(save_path('a/b c', str(tmp_path))) == 'a%2Fb%20c.json'
+    assert save_path('..', str(tmp_path)) != save_path('', str(tmp_path))
+
+
+def test_round_trip(scratch):
+    data = {'Day': 3, 'Inventory': {'carrot': 2}, 'Mail': [['stone', 1]]}
+    assert read_save('ann') is None and not save_exists('ann')
+    write_save('ann', data)
+    assert save_exists('ann') and read_save('ann') == data
+    write_save('ann', {'Day': 4})
+    assert read_save('ann') == {'Day': 4}
+    assert sorted(os.listdir(SAVE_FOLDER)) == ['.lock', '.migrated', 'ann.json']
+
+
+def test_failed_write_keeps_the_old_save(tmp_path):
+    path = str(tmp_path / 'ann.json')
+    write_json(path, {'Day': 1})
+    with pytest.raises(TypeError):
+        write_json(path, {'Day': object()})
+    with open(path) as f:
+        assert json.load(f) == {'Day': 1}
+    assert os.listdir(tmp_path) == ['ann.json']
+
+
+def test_migration_copies_once_and_leaves_the_shared_file(scratch):
+    shared = {'ann': {'Day': 2}, 'bob': {'Day': 5}}
+    with open(LEGACY_PATH, 'w') as f:
+        json.dump(shared, f)
+    os.makedirs(SAVE_FOLDER)
+    write_json(save_path('bob'), {'Day': 9})  # Already has a save of their own
+
+    assert migrate_legacy() == 1
+    assert migrate_legacy() is None
+    with open(LEGACY_PATH) as f:
+        assert json.load(f) == shared
+    assert read_save('ann') == {'Day': 2} and read_save('bob') == {'Day': 9}
+
+    # Saves written after the migration are never overwritten by the shared file
+    write_save('ann', {'Day': 3})
+    assert read_save('ann') == {'Day': 3}
+
+
+def test_lock_times_out_while_another_holder_has_it(tmp_path):
+    folder = str(tmp_path)
+    held, release = threading.Event(), threading.Event()
+
+    def hold():
+        with locked(folder):
+            held.set()
+            release.wait(5)
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    held.wait(5)
+    try:
+        with pytest.raises(TimeoutError):
+            with locked(folder, timeout=0.2):
+                pass
+    finally:
+        release.set()
+        holder.join()
+    with locked(folder, timeout=1):
+        pass
@@ -0,0 +1,35 @@
+import random
+
+import pygame
+
+from spatialgrid import SpatialGrid
+
+
+class Box:
+    def __init__(self, x, y, size=32):
+        self.rect = pygame.Rect(x, y, size, size)
+
+
+def test_query_never_misses_an_overlapping_object():
+    rng = random.Random(1)
+    grid = SpatialGrid(64)
+    boxes = [Box(rng.randrange(-200, 1000), rng.randrange(-200, 1000), rng.randrange(1, 65)) for _ in range(300)]
+    for box in boxes:
+        grid.insert(box)
+    for _ in range(200):
+        area = pygame.Rect(rng.randrange(-200, 1000), rng.randrange(-200, 1000), 64, 64)
+        expected = {id(box) for box in boxes if area.colliderect(box.rect)}
+        assert {id(box) for box in grid.colliding(area)} == expected
+
+
+def test_move_and_remove_keep_buckets_tidy():
+    grid = SpatialGrid(64)
+    box = Box(10, 10)
+    grid.insert(box)
+    box.rect.topleft = (300, 300)
+    grid.move(box)
+    assert grid.colliding(pygame.Rect(0, 0, 50, 50)) == []
+    assert grid.colliding(pygame.Rect(290, 290, 20, 20)) == [box]
+    grid.remove(box)
+    grid.remove(box)
+    assert not grid.buckets and not grid.cells
@@ -0,0 +1,81 @@
+import csv
+import os
+from collections import Counter
+
+from logsegments import LogRotator, compact, seal, summary_path
+from telemetrydb import TelemetryStore
+
+
+def write_log(folder, name, header, rows, mode='w'):
+    path = os.path.join(folder, name)
+    with open(path, mode, newline='') as f:
+        writer = csv.writer(f)
+        if mode == 'w':
+            writer.writerow(header)
+        writer.writerows(rows)
+    return path
+
+
+def test_query_narrows_by_player_session_mode_and_time(tmp_path):
+    store = TelemetryStore(str(tmp_path / 'telemetry.db'))
+    store.insert({'attacks': [('ann', 's1', 'dungeon', 1.0, 1), ('ann', 's1', 'farm', 2.0, 0),
+                              ('bob', 's2', 'dungeon', 3.0, 1)],
+                  'sales': [('ann', 's1', 'farm', 4.0, 'carrot', 2, 30)]})
+    columns, rows = store.query('attacks', username='ann')
+    assert columns[:4] == ['username', 'session', 'mode', 'time'] and len(rows) == 2
+    assert [row[3] for row in store.query('attacks', mode='dungeon')[1]] == [1.0, 3.0]
+    assert store.query('attacks', username='ann', since=1.5)[1] == [('ann', 's1', 'farm', 2.0, 0)]
+    assert store.query('sales', session='s1')[1][0][4:] == ('carrot', 2, 30)
+    store.close()
+
+
+def test_import_only_adds_rows_written_since_the_last_import(tmp_path):
+    folder = str(tmp_path)
+    write_log(folder, 'combat_accuracy.csv', ['Hit'], [[1], [0], [1]])
+    write_log(folder, 'Crop.csv', ['Week', 'Season', 'Crop', 'Amount'], [[1, 'Spring', 'carrot', 2]])
+    store = TelemetryStore(os.path.join(folder, 'telemetry.db'))
+    imported = store.import_csvs(folder)
+    assert imported['attacks'] == 3 and imported['harvests'] == 1
+    assert store.import_csvs(folder) == {}
+
+    write_log(folder, 'combat_accuracy.csv', None, [[0]], mode='a')
+    assert store.import_csvs(folder) == {'attacks': 1}
+    rows = store.query('attacks')[1]
+    assert sorted(row[4] for row in rows) == [0, 0, 1, 1]
+    assert all(row[:3] == (None, None, None) for row in rows)
+    store.close()
+
+
+def test_reimport_through_rotation_and_compaction_counts_every_row_once(tmp_path):
+    folder = str(tmp_path)
+    path = os.path.join(folder, 'combat_accuracy.csv')
+    rotator = LogRotator(max_bytes=30, keep_segments=1)
+    store = TelemetryStore(os.path.join(folder, 'telemetry.db'))
+    written = Counter()
+    for batch in range(25):
+        rows = [[(batch * 3 + i) % 2] for i in range(batch % 4 + 1)]
+        write_log(folder, 'combat_accuracy.csv', ['Hit'], rows, mode='a' if os.path.exists(path) else 'w')
+        written.update(row[0] for row in rows)
+        rotator.check(path)
+        if batch % 6 == 5:  # Import now and then, so some rows are compacted after being imported
+            store.import_csvs(folder)
+    store.import_csvs(folder)
+    assert summary_path(path) is not None
+    counts = store.connection.execute('SELECT hit, COUNT(*) FROM attacks GROUP BY hit').fetchall()
+    assert dict(counts) == dict(written)
+    assert store.import_csvs(folder) == {}
+    store.close()
+
+
+def test_summary_rows_come_back_with_their_average(tmp_path):
+    folder = str(tmp_path)
+    path = write_log(folder, 'maze_log.csv', ['time_taken(s)', 'Success_status', 'Maze_seed', 'Difficulty'],
+                     [[10, 'win', 1, 'easy'], [20, 'win', 2, 'easy'], [5, 'lose', 3, '']])
+    manifest = {}
+    seal(path, manifest)
+    compact(path, manifest)
+    store = TelemetryStore(os.path.join(folder, 'telemetry.db'))
+    assert store.import_csvs(folder)['maze_runs'] == 3
+    rows = store.connection.execute('SELECT time_taken, result, seed, difficulty FROM maze_runs').fetchall()
+    assert sorted(rows, key=str) == sorted([(15.0, 'win', None, 'easy')] * 2 + [(5.0, 'lose', None, '')], key=str)
+    store.close()
@@ -0,0 +1,135 @@
+import numpy as np
+
+from walkmap import STEPS, CellIndex, WalkMap, distance_field, flow_field
+
+
+def test_bytes_and_array_view_share_memory():
+    walkmap = WalkMap(4, 3)
+    walkmap.set_walkable(2, 1, True)
+    assert walkmap.cells[1, 2]
+    walkmap.cells[0, 3] = True
+    assert walkmap.is_walkable(3, 0)
+
+
+def test_outside_the_map_is_not_walkable():
+    walkmap = WalkMap(3, 3, walkable=True)
+    assert walkmap.is_walkable(0, 0) and walkmap.is_walkable(2, 2)
+    for x, y in ((-1, 0), (0, -1), (3, 0), (0, 3)):
+        assert not walkmap.is_walkable(x, y)
+
+
+def test_from_array_keeps_rows_as_y():
+    walkable = np.zeros((2, 5), dtype=bool)
+    walkable[1, 4] = True
+    walkmap = WalkMap.from_array(walkable)
+    assert (walkmap.width, walkmap.height) == (5, 2)
+    assert walkmap.is_walkable(4, 1) and not walkmap.is_walkable(1, 4)
+
+
+def test_listeners_only_hear_real_changes():
+    walkmap = WalkMap(3, 3)
+    changes = []
+    walkmap.add_listener(lambda x, y, walkable: changes.append((x, y, walkable)))
+    walkmap.set_walkable(1, 1, True)
+    walkmap.set_walkable(1, 1, True)
+    walkmap.set_walkable(1, 1, False)
+    walkmap.set_walkable(0, 0, False)
+    assert changes == [(1, 1, True), (1, 1, False)]
+
+
+def bfs(walkable, sources):
+    """Plain queue BFS to check the vectorised one against"""
+    height, width = walkable.shape
+    distance = np.full((height, width), -1)
+    queue = [source for source in sources if walkable[source[1], source[0]]]
+    for x, y in queue:
+        distance[y, x] = 0
+    for x, y in queue:
+        for dx, dy in ((0, -1), (1, 0), (0, 1), (-1, 0)):
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < width and 0 <= ny < height and walkable[ny, nx] and distance[ny, nx] < 0:
+                distance[ny, nx] = distance[y, x] + 1
+                queue.append((nx, ny))
+    return distance
+
+
+def test_distance_field_matches_a_plain_bfs():
+    rng = np.random.default_rng(5)
+    walkable = rng.random((23, 31)) < 0.7
+    sources = [(0, 0), (30, 22), (15, 11)]
+    assert (distance_field(walkable, sources) == bfs(walkable, sources)).all()
+
+
+def test_distance_field_marks_walls_and_cut_off_tiles_unreachable():
+    walkable = np.ones((3, 5), dtype=bool)
+    walkable[:, 2] = False
+    distance = distance_field(walkable, [(0, 0)])
+    assert distance[0, 1] == 1 and distance[2, 1] == 3
+    assert (distance[:, 2:] == -1).all()
+
+
+def test_distance_field_stops_at_max_steps_and_ignores_bad_sources():
+    walkable = np.ones((1, 10), dtype=bool)
+    distance = distance_field(walkable, [(0, 0), (-1, 0), (99, 0)], max_steps=3)
+    assert distance.tolist() == [[0, 1, 2, 3, -1, -1, -1, -1, -1, -1]]
+    assert (distance_field(walkable, []) == -1).all()
+
+
+def test_cell_index_add_discard_and_membership():
+    index = CellIndex([(0, 0), (1, 0), (2, 0)])
+    index.add((1, 0))
+    assert len(index) == 3
+    index.discard((0, 0))
+    index.discard((5, 5))
+    assert len(index) == 2 and (0, 0) not in index and (2, 0) in index
+    # The moved cell's position must still be right for the next removal
+    index.discard((2, 0))
+    assert index.cells == [(1, 0)] and index.positions == {(1, 0): 0}
+
+
+def test_cell_index_samples_every_cell_uniformly():
+    cells = [(x, 0) for x in range(4)]
+    index = CellIndex(cells)
+    rng = np.random.default_rng(0)
+    counts = {cell: 0 for cell in cells}
+    for _ in range(4000):
+        counts[index.sample(rng)] += 1
+    assert all(900 < count < 1100 for count in counts.values())
+    assert CellIndex().sample(rng) is None
+
+
+def test_cell_index_from_walkmap():
+    walkmap = WalkMap(3, 2)
+    walkmap.set_walkable(2, 1, True)
+    walkmap.set_walkable(0, 0, True)
+    assert sorted(CellIndex.from_walkmap(walkmap).cells) == [(0, 0), (2, 1)]
+
+
+def test_following_the_flow_field_walks_a_shortest_path():
+    rng = np.random.default_rng(8)
+    walkable = rng.random((20, 20)) < 0.75
+    walkable[10, 10] = True
+    distance = distance_field(walkable, [(10, 10)])
+    flow = flow_field(distance)
+    for y, x in np.argwhere(distance > 0):
+        length, steps = distance[y, x], 0
+        while distance[y, x] > 0:
+            dx, dy = STEPS[flow[y, x]]
+            x, y = x + dx, y + dy
+            assert walkable[y, x]
+            steps += 1
+        assert (x, y) == (10, 10) and steps == length
+
+
+def test_flow_field_has_no_step_off_the_field():
+    walkable = np.ones((3, 3), dtype=bool)
+    walkable[1, 1] = False
+    walkable[2, 2] = False
+    distance = distance_field(walkable, [(0, 0)])
+    flow = flow_field(distance)
+    assert flow[0, 0] == -1  # The source
+    assert flow[1, 1] == -1 and flow[2, 2] == -1  # Walls
+    reached = distance > 0
+    for y, x in np.argwhere(reached):
+        dx, dy = STEPS[flow[y, x]]
+        assert distance[y + dy, x + dx] == distance[y, x] - 1
@@ -0,0 +1,145 @@
+import numpy as np
+
+
+class WalkMap:
+    """Packed walkability bitmap shared by every system that asks "can I stand here?".
+
+    One byte per tile (1 = walkable) is kept in a flat bytearray so single tile
+    checks stay cheap, and ``cells`` is a NumPy bool view over the same memory
+    for vectorized pathfinding and collision code.
+    """
+
+    def __init__(self, width, height, walkable=False):
+        self.width = width
+        self.height = height
+        self.data = bytearray([1 if walkable else 0]) * (width * height)
+        self.cells = np.frombuffer(self.data, dtype=np.bool_).reshape(height, width)
+        self.listeners = []  # Called as listener(x, y, walkable) when a tile changes
+
+    @classmethod
+    def from_array(cls, walkable):
+        """Build a map from a 2D array-like of truthy (walkable) values"""
+        walkable = np.asarray(walkable, dtype=bool)
+        height, width = walkable.shape
+        walkmap = cls(width, height)
+        walkmap.cells[:] = walkable
+        return walkmap
+
+    def is_walkable(self, x, y):
+        """Check if the tile at (x, y) is inside the map and walkable."""
+        return 0 <= x < self.width and 0 <= y < self.height and self.data[y * self.width + x] == 1
+
+    def set_walkable(self, x, y, walkable):
+        """Update a single tile and notify listeners if it actually changed."""
+        index = y * self.width + x
+        value = 1 if walkable else 0
+        if self.data[index] != value:
+            self.data[index] = value
+            for listener in self.listeners:
+                listener(x, y, walkable)
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def distance_field(self, sources, max_steps=None):
+        """Step distance from the nearest of ``sources`` to every tile, -1 where unreachable."""
+        return distance_field(self.cells, sources, max_steps)
+
+
+# (dx, dy) of the four neighbours, in the order flow_field indexes them
+STEPS = ((0, -1), (1, 0), (0, 1), (-1, 0))
+
+
+def distance_field(walkable, sources, max_steps=None):
+    """Breadth-first step distances over a 2D bool array of walkable tiles.
+
+    Each BFS level is expanded as one NumPy array of flat tile indices, so the
+    cost per level is a few array operations on the frontier rather than a
+    Python loop over every tile. ``sources`` are (x, y) tiles at distance 0;
+    unreachable and unwalkable tiles, and tiles more than ``max_steps`` away,
+    come back as -1.
+    """
+    height, width = walkable.shape
+    stride = width + 2
+    # A border of solid tiles means neighbour indices never leave the array
+    passable = np.zeros((height + 2, stride), dtype=bool)
+    passable[1:-1, 1:-1] = walkable
+    passable = passable.ravel()
+    distance = np.full(passable.size, -1, dtype=np.int32)
+
+    frontier = np.array([(y + 1) * stride + x + 1 for x, y in sources
+                         if 0 <= x < width and 0 <= y < height], dtype=np.int64)
+    frontier = np.unique(frontier[passable[frontier]])
+    distance[frontier] = 0
+    offsets = np.array([-stride, 1, stride, -1])
+    steps = 0
+    while frontier.size and (max_steps is None or steps < max_steps):
+        steps += 1
+        neighbours = (frontier[:, None] + offsets).ravel()
+        neighbours = neighbours[passable[neighbours]]
+        neighbours = np.unique(neighbours[distance[neighbours] < 0])
+        distance[neighbours] = steps
+        frontier = neighbours
+    return distance.reshape(height + 2, stride)[1:-1, 1:-1]
+
+
+def flow_field(distance):
+    """For every tile, the index into STEPS of its downhill neighbour in a distance field.
+
+    Following the steps from any reached tile walks a shortest path to the
+    field's sources. Sources, unreached tiles and walls get -1.
+    """
+    height, width = distance.shape
+    padded = np.full((height + 2, width + 2), np.iinfo(np.int32).max, dtype=np.int32)
+    padded[1:-1, 1:-1] = np.where(distance < 0, np.iinfo(np.int32).max, distance)
+    neighbours = np.stack([padded[:-2, 1:-1], padded[1:-1, 2:], padded[2:, 1:-1], padded[1:-1, :-2]])
+    best = neighbours.argmin(axis=0).astype(np.int8)
+    lowest = np.take_along_axis(neighbours, best[None].astype(np.intp), axis=0)[0]
+    best[(distance <= 0) | (lowest >= distance)] = -1
+    return best
+
+
+class CellIndex:
+    """A set of (x, y) cells with O(1) add, discard and uniform random sampling.
+
+    Cells live in a dense list with a dict of their positions; removing one
+    moves the last cell into its slot, so nothing ever has to be rescanned.
+    """
+
+    def __init__(self, cells=()):
+        self.cells = []
+        self.positions = {}
+        for cell in cells:
+            self.add(cell)
+
+    @classmethod
+    def from_walkmap(cls, walkmap):
+        """Index every walkable tile of a WalkMap"""
+        ys, xs = np.nonzero(walkmap.cells)
+        return cls(zip(xs.tolist(), ys.tolist()))
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, cell):
+        return cell in self.positions
+
+    def add(self, cell):
+        if cell not in self.positions:
+            self.positions[cell] = len(self.cells)
+            self.cells.append(cell)
+
+    def discard(self, cell):
+        index = self.positions.pop(cell, None)
+        if index is None:
+            return
+        last = self.cells.pop()
+        if index < len(self.cells):
+            self.cells[index] = last
+            self.positions[last] = index
+
+    def sample(self, rng):
+        """A uniformly random cell, or None if the index is empty"""
+        if not self.cells:
+            return None
+        return self.cells[int(rng.integers(len(self.cells)))]
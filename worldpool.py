@@ -0,0 +1,80 @@
+import threading
+import time
+from collections import deque
+
+
+class WorldPool:
+    """A few ready-made worlds of each kind, built ahead of time on a background thread.
+
+    ``factories`` maps a kind (e.g. 'maze') to a callable that builds a fresh
+    world. ``pop`` hands out a prebuilt world instantly and wakes the worker
+    to build a replacement; if the pool has run dry it builds one on the spot.
+    A factory that fails is retried later, backing off up to ``max_backoff``
+    seconds, while the other kinds keep being built.
+    """
+
+    def __init__(self, factories, size=2, max_backoff=60.0):
+        self.factories = factories
+        self.size = size  # Worlds to keep ready per kind
+        self.ready = {kind: deque() for kind in factories}
+        self.lock = threading.Lock()
+        self.wanted = threading.Event()
+        self.running = False
+        self.worker = None
+        self.max_backoff = max_backoff
+        self.failures = {}  # Kind -> factory failures in a row
+        self.retry_at = {}  # Kind -> monotonic time its factory may be tried again
+
+    def start(self):
+        """Start filling the pool in the background"""
+        if self.worker is None:
+            self.running = True
+            self.worker = threading.Thread(target=self.run, name="WorldPool", daemon=True)
+            self.worker.start()
+
+    def stop(self):
+        self.running = False
+        self.wanted.set()
+
+    def pop(self, kind):
+        """Take a prebuilt world of the given kind, building one now if none is ready"""
+        with self.lock:
+            world = self.ready[kind].popleft() if self.ready[kind] else None
+        self.wanted.set()
+        if world is None:
+            world = self.factories[kind]()
+        return world
+
+    def next_needed(self):
+        """A kind to build now, or None and how long until a backed-off kind may be retried"""
+        now = time.monotonic()
+        wait = None
+        with self.lock:
+            for kind, worlds in self.ready.items():
+                if len(worlds) < self.size:
+                    retry_at = self.retry_at.get(kind, 0)
+                    if retry_at <= now:
+                        return kind, None
+                    wait = retry_at - now if wait is None else min(wait, retry_at - now)
+        return None, wait
+
+    def run(self):
+        while self.running:
+            kind, wait = self.next_needed()
+            if kind is None:
+                self.wanted.wait(wait)
+                self.wanted.clear()
+                continue
+            try:
+                world = self.factories[kind]()
+            except Exception as e:
+                failures = self.failures.get(kind, 0) + 1
+                delay = min(2 ** (failures - 1), self.max_backoff)
+                self.failures[kind] = failures
+                self.retry_at[kind] = time.monotonic() + delay
+                print(f"Error pre-generating {kind} (attempt {failures}), retrying in {delay}s: {e!r}")
+                continue
+            self.failures.pop(kind, None)
+            self.retry_at.pop(kind, None)
+            with self.lock:
+                self.ready[kind].append(world)